@@ -1,41 +1,35 @@
 import asyncio
-import json
-import sys
 
-try:
-    import websockets
-except ImportError:
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "websockets"])
-    import websockets
+from mcp_readiness import Readiness
+from scene_snapshot import SceneSnapshotCache, print_diff
+from unity_mcp_client import UnityMCPClient
 
-class UnityMCPClient:
-    def __init__(self, uri="ws://localhost:8090/McpUnity"):
-        self.uri = uri
-        self.ws = None
-        self.request_id = 0
-    
-    async def connect(self):
-        self.ws = await websockets.connect(self.uri, close_timeout=5, max_size=1024*1024, ping_interval=None)
-        print("Connected to Unity MCP")
-    
-    async def close(self):
-        if self.ws:
-            await self.ws.close()
-    
-    async def call(self, method, params=None):
-        self.request_id += 1
-        request = {
-            "id": str(self.request_id),
-            "method": method,
-            "params": params or {}
-        }
-        await self.ws.send(json.dumps(request))
-        response = await asyncio.wait_for(self.ws.recv(), timeout=30)
-        return json.loads(response)
+async def analyze_scene(client, cache, probes, scene_path):
+    """씬 스냅샷 갱신 (씬 파일이 그대로면 에디터 조회 생략) 후 요약 출력"""
+    snapshot, diff = await cache.refresh(client, scene_path, probes)
+    stats = cache.last_stats
+    if stats["source"] == "cache":
+        print("    Scene file unchanged - using cached snapshot")
+    else:
+        print(f"    Live query: {stats['fetched_roots']} root subtrees fetched, {stats['reused_roots']} reused")
+    
+    scene = snapshot.get("scene_info", {})
+    print(f"    Scene: {scene.get('name')}")
+    print(f"    Root Objects: {scene.get('rootCount')}")
+    
+    root = snapshot["nodes"].get("/")
+    if root:
+        print("\n    Root Objects:")
+        for name in root["children"]:
+            print(f"      - {name}")
+    
+    print(f"\n    Hierarchy: {len(snapshot['nodes']) - 1} objects")
+    print_diff(diff)
 
 async def analyze_all_screens():
     client = UnityMCPClient()
+    probes = Readiness()
+    cache = SceneSnapshotCache()
     await client.connect()
     
     print("\n" + "="*70)
@@ -49,27 +43,7 @@ async def analyze_all_screens():
     print("[1] MAIN MENU SCREEN ANALYSIS")
     print("="*70)
     
-    result = await client.call("load_scene", {
-        "scenePath": "Assets/Scenes/MainMenu.unity",
-        "loadMode": "Single"
-    })
-    print(f"    Scene Loaded: {result.get('result', {}).get('success', False)}")
-    await asyncio.sleep(0.5)
-    
-    # 씬 정보
-    result = await client.call("get_scene_info")
-    if "result" in result:
-        scene = result["result"].get("activeScene", {})
-        print(f"    Scene: {scene.get('name')}")
-        print(f"    Root Objects: {scene.get('rootCount')}")
-    
-    # 루트 오브젝트 분석
-    result = await client.call("get_game_object", {"objectPath": "/"})
-    if "result" in result and "children" in result["result"]:
-        print("\n    Root Objects:")
-        for child in result["result"]["children"]:
-            name = child.get("name", "unknown")
-            print(f"      - {name}")
+    await analyze_scene(client, cache, probes, "Assets/Scenes/MainMenu.unity")
     
     # ============================================
     # 2. SONG SELECT 분석
@@ -78,25 +52,7 @@ async def analyze_all_screens():
     print("[2] SONG SELECT SCREEN ANALYSIS")
     print("="*70)
     
-    result = await client.call("load_scene", {
-        "scenePath": "Assets/Scenes/SongSelect.unity",
-        "loadMode": "Single"
-    })
-    print(f"    Scene Loaded: {result.get('result', {}).get('success', False)}")
-    await asyncio.sleep(0.5)
-    
-    result = await client.call("get_scene_info")
-    if "result" in result:
-        scene = result["result"].get("activeScene", {})
-        print(f"    Scene: {scene.get('name')}")
-        print(f"    Root Objects: {scene.get('rootCount')}")
-    
-    result = await client.call("get_game_object", {"objectPath": "/"})
-    if "result" in result and "children" in result["result"]:
-        print("\n    Root Objects:")
-        for child in result["result"]["children"]:
-            name = child.get("name", "unknown")
-            print(f"      - {name}")
+    await analyze_scene(client, cache, probes, "Assets/Scenes/SongSelect.unity")
     
     # ============================================
     # 3. GAMEPLAY 분석
@@ -105,25 +61,7 @@ async def analyze_all_screens():
     print("[3] GAMEPLAY SCREEN ANALYSIS")
     print("="*70)
     
-    result = await client.call("load_scene", {
-        "scenePath": "Assets/Scenes/Gameplay.unity",
-        "loadMode": "Single"
-    })
-    print(f"    Scene Loaded: {result.get('result', {}).get('success', False)}")
-    await asyncio.sleep(0.5)
-    
-    result = await client.call("get_scene_info")
-    if "result" in result:
-        scene = result["result"].get("activeScene", {})
-        print(f"    Scene: {scene.get('name')}")
-        print(f"    Root Objects: {scene.get('rootCount')}")
-    
-    result = await client.call("get_game_object", {"objectPath": "/"})
-    if "result" in result and "children" in result["result"]:
-        print("\n    Root Objects:")
-        for child in result["result"]["children"]:
-            name = child.get("name", "unknown")
-            print(f"      - {name}")
+    await analyze_scene(client, cache, probes, "Assets/Scenes/Gameplay.unity")
     
     # ============================================
     # 4. 리소스 분석
@@ -185,6 +123,8 @@ async def analyze_all_screens():
     4. Update color palette
     """)
     
+    probes.print_summary()
+    client.metrics.print_summary()
     await client.close()
     
     print("\n" + "="*70)
@@ -0,0 +1,351 @@
+"""
+Chart Replay Simulator
+SongData 차트와 시간순 레인 입력을 받아 Play Mode 없이 게임 루프를 그대로 돌리고 GameResult를 만듦
+
+GameplayController / NoteSpawner / Note / JudgementSystem 의 동작을 옮김
+- LoadNotes: 시간순 정렬, 같은 시간+레인 중복 제거, 롱노트 구간 안의 같은 레인 노트 제거
+- 스폰: HitTime <= 현재 + lookAhead(3초)
+- 입력: Down -> ProcessNoteHit, Up -> ProcessNoteRelease, Scratch -> ProcessScratch
+  GetNearestNote: 레인에서 홀드 중인 노트 우선, 아니면 |t - HitTime| <= 350ms 중 가장 가까운 노트
+- 만료: 홀드 중이 아니고 HitTime(+Duration) + 0.5초를 지나면 RegisterMiss
+- 롱노트: 누르면 판정 + 홀드 시작, 떼면 목표 시간의 80% 이상일 때 끝 시간 기준 판정 (아니면 Miss),
+  홀드 중에는 0.1초마다 50점 보너스 (프레임 단위로 확인)
+- 곡 종료(Duration): 남은 활성/대기 노트 모두 Miss
+
+입력 시간은 정확한 타임스탬프로 판정하고, 만료/홀드 보너스는 fps 간격 프레임에서 확인한다.
+(Unity의 List.Sort는 안정 정렬이 아니므로 같은 시간 노트의 순서는 다를 수 있음)
+
+    song = load_song("My project/Assets/Resources/Songs/SimpleTest.asset")
+    replay = ChartReplay(song)
+    outcome = replay.run(autoplay_inputs(song["notes"]))
+    print(outcome["result"]["Score"], outcome["result"]["Rank"])
+
+    python chart_replay.py "My project/Assets/Resources/Songs/SimpleTest.asset" --inputs inputs.csv
+    python chart_replay.py --library --error-ms 30
+"""
+
+import argparse
+import csv
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+from judgement import MISS, JudgementConfig, JudgementSystem, f32
+from song_asset import LONG, SCRATCH, find_song_assets, load_song
+
+LANES = 4
+SCRATCH_LANES = (0, 3)
+LOOK_AHEAD = 3.0
+MAX_JUDGE_WINDOW = f32(0.350)
+EXPIRE_MARGIN = f32(0.5)
+OVERLAP_MARGIN = f32(0.05)
+HOLD_BONUS_TICK_INTERVAL = f32(0.1)
+HOLD_BONUS_PER_TICK = 50
+HOLD_SUCCESS_RATIO = f32(0.8)
+DEFAULT_FPS = 60
+
+DOWN, UP, SCRATCH_INPUT = "down", "up", "scratch"
+INPUT_KINDS = (DOWN, UP, SCRATCH_INPUT)
+
+
+def filter_notes(notes):
+    """NoteSpawner.LoadNotes 의 정렬 + 중복/겹침 제거. 남은 노트 목록 반환"""
+    seen = set()
+    long_end = [0.0] * LANES
+    kept = []
+    for note in sorted(notes, key=lambda n: f32(n[0])):
+        hit_time, lane, note_type, duration = f32(note[0]), note[1], note[2], f32(note[3])
+        key = int(f32(hit_time * 1000)) * 10 + lane
+        if key in seen:
+            continue
+        seen.add(key)
+        if 0 <= lane < LANES and note_type != LONG and long_end[lane] > f32(hit_time + OVERLAP_MARGIN):
+            continue
+        if note_type == LONG and 0 <= lane < LANES:
+            long_end[lane] = f32(hit_time + duration)
+        kept.append((hit_time, lane, note_type, duration))
+    return kept
+
+
+class _Note:
+    __slots__ = ("hit_time", "lane", "type", "duration", "holding", "hold_start", "last_tick")
+
+    def __init__(self, hit_time, lane, note_type, duration):
+        self.hit_time = hit_time
+        self.lane = lane
+        self.type = note_type
+        self.duration = duration
+        self.holding = False
+        self.hold_start = 0.0
+        self.last_tick = None
+
+    @property
+    def expire_after(self):
+        end = f32(self.hit_time + self.duration) if self.type == LONG else self.hit_time
+        return f32(end + EXPIRE_MARGIN)
+
+
+class ChartReplay:
+    def __init__(self, song, offset=0.0, config=None, fps=DEFAULT_FPS, end_time=None):
+        self.song = song
+        self.offset = offset
+        self.config = config or JudgementConfig()
+        self.dt = 1.0 / fps
+        self.end_time = end_time if end_time is not None else song["duration"]
+        self.notes = filter_notes(song["notes"])
+
+    def run(self, inputs):
+        """inputs: [(시간, 레인, "down"|"up"|"scratch")] -> {"result": GameResult, "stats": {...}}"""
+        self.judgement = JudgementSystem(len(self.song["notes"]), self.offset, self.config)
+        self.queue = 0
+        self.active = {}  # 레인 -> 스폰 순서대로 활성 노트
+        self.holding = []
+        self.stats = {"inputs": 0, "ignored_inputs": 0, "expired": 0, "flushed": 0, "hold_ticks": 0, "frames": 0}
+        self.frame = 0
+
+        for input_time, lane, kind in sorted(inputs, key=lambda e: e[0]):
+            if input_time >= self.end_time:
+                self.stats["ignored_inputs"] += 1
+                continue
+            # 입력보다 앞선 프레임의 코루틴(스폰/만료/홀드 보너스)을 먼저 처리
+            self._advance(input_time)
+            self._spawn(input_time)
+            self.stats["inputs"] += 1
+            t = f32(input_time)
+            if kind == DOWN:
+                self._note_hit(lane, t)
+            elif kind == UP:
+                self._note_release(lane, t)
+            elif kind == SCRATCH_INPUT:
+                self._scratch(lane, t)
+        self._advance(self.end_time)
+        self._flush()
+        return {"result": self.judgement.get_result(), "stats": dict(self.stats, notes=len(self.notes))}
+
+    # ------------------------------------------------------------------
+    # 프레임 (NoteSpawner.SpawnLoop, GameplayController.HoldBonusTickLoop)
+    # ------------------------------------------------------------------
+    def _frame_time(self, k):
+        return k * self.dt
+
+    def _next_frame(self, until):
+        """until 이전에 상태가 바뀔 수 있는 다음 프레임 (없으면 None)"""
+        candidates = []
+        if self.queue < len(self.notes):
+            candidates.append(self.notes[self.queue][0] - LOOK_AHEAD)
+        for lane_notes in self.active.values():
+            for note in lane_notes:
+                if not note.holding:
+                    candidates.append(note.expire_after)
+        for note in self.holding:
+            candidates.append(note.last_tick + HOLD_BONUS_TICK_INTERVAL)
+        if not candidates:
+            return None
+        # 한 프레임 일찍 잡아도 검사는 정확하므로 내림
+        k = max(self.frame, int(math.floor(min(candidates) / self.dt)))
+        return k if self._frame_time(k) < until else None
+
+    def _advance(self, until):
+        """until 보다 앞선 프레임까지 처리 (할 일이 없는 프레임은 건너뜀)"""
+        while True:
+            k = self._next_frame(until)
+            if k is None:
+                self.frame = max(self.frame, int(math.ceil(until / self.dt)))
+                return
+            t = self._frame_time(k)
+            self._spawn(t)
+            self._expire(f32(t))
+            self._hold_ticks(f32(t))
+            self.stats["frames"] += 1
+            self.frame = k + 1
+
+    def _spawn(self, t):
+        limit = t + LOOK_AHEAD
+        while self.queue < len(self.notes) and self.notes[self.queue][0] <= limit:
+            note = _Note(*self.notes[self.queue])
+            self.queue += 1
+            self.active.setdefault(note.lane, []).append(note)
+
+    def _expire(self, t):
+        for lane_notes in self.active.values():
+            for note in [n for n in lane_notes if not n.holding and t > n.expire_after]:
+                self.judgement.register_miss()
+                self.stats["expired"] += 1
+                lane_notes.remove(note)
+
+    def _hold_ticks(self, t):
+        for note in list(self.holding):
+            if not note.holding:
+                self.holding.remove(note)
+            elif f32(t - note.last_tick) >= HOLD_BONUS_TICK_INTERVAL:
+                self.judgement.add_bonus_score(HOLD_BONUS_PER_TICK)
+                self.stats["hold_ticks"] += 1
+                note.last_tick = t
+
+    def _flush(self):
+        """OnSongEnd -> FlushRemainingAsMiss"""
+        remaining = sum(len(lane_notes) for lane_notes in self.active.values()) + len(self.notes) - self.queue
+        for _ in range(remaining):
+            self.judgement.register_miss()
+        self.stats["flushed"] = remaining
+
+    # ------------------------------------------------------------------
+    # 입력 (GameplayController.ProcessNoteHit/Release/Scratch)
+    # ------------------------------------------------------------------
+    def _nearest(self, lane, t):
+        if not 0 <= lane < LANES:
+            return None
+        nearest, best = None, float("inf")
+        for note in self.active.get(lane, ()):
+            if note.holding:
+                return note
+            diff = abs(f32(t - note.hit_time))
+            if diff <= MAX_JUDGE_WINDOW and diff < best:
+                nearest, best = note, diff
+        return nearest
+
+    def _remove(self, note):
+        lane_notes = self.active.get(note.lane, [])
+        if note in lane_notes:
+            lane_notes.remove(note)
+        note.holding = False
+
+    def _start_hold(self, note, t):
+        note.holding = True
+        note.hold_start = t
+        note.last_tick = t
+        if note not in self.holding:
+            self.holding.append(note)
+
+    def _note_hit(self, lane, t):
+        note = self._nearest(lane, t)
+        if note is None:
+            return
+        if note.type == LONG:
+            self._start_hold(note, t)
+            self.judgement.judge(t, note.hit_time)
+            return
+        code, _ = self.judgement.judge(t, note.hit_time)
+        if code != MISS:
+            self._remove(note)
+
+    def _note_release(self, lane, t):
+        note = self._nearest(lane, t)
+        if note is None or not note.holding:
+            return
+        # Note.EndHold
+        note.holding = False
+        if note.duration <= 0 or f32(t - note.hold_start) >= f32(note.duration * HOLD_SUCCESS_RATIO):
+            self.judgement.judge(t, f32(note.hit_time + note.duration))
+        else:
+            self.judgement.register_miss()
+        self._remove(note)
+
+    def _scratch(self, lane, t):
+        if lane not in SCRATCH_LANES:
+            return
+        note = self._nearest(lane, t)
+        if note is None or note.type != SCRATCH:
+            return
+        code, _ = self.judgement.judge(t, note.hit_time)
+        if code != MISS:
+            self._remove(note)
+
+
+# ----------------------------------------------------------------------
+# 입력 스트림
+# ----------------------------------------------------------------------
+def load_inputs(path):
+    """CSV (time,lane,event) 또는 JSON ([[time, lane, event], ...] / [{"time", "lane", "event"}, ...])"""
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+        return [(float(r["time"]), int(r["lane"]), r["event"]) if isinstance(r, dict)
+                else (float(r[0]), int(r[1]), r[2]) for r in rows]
+    events = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.reader(f):
+            if not row or row[0].strip().lower() in ("time", "#"):
+                continue
+            kind = row[2].strip().lower()
+            if kind not in INPUT_KINDS:
+                raise ValueError(f"{path}: unknown input event {row[2]!r}")
+            events.append((float(row[0]), int(row[1]), kind))
+    return events
+
+
+def autoplay_inputs(notes, error_ms=0.0, seed=0, tap_ms=50.0):
+    """
+    차트대로 치는 입력 (error_ms > 0 이면 입력마다 정규분포 타이밍 오차)
+    탭은 tap_ms 뒤에 떼고, 롱노트는 끝 시간에 뗌, 스크래치 레인의 스크래치 노트는 Scratch 입력
+    (탭을 떼기 전에 같은 레인의 다음 노트를 누르는 빠른 연타는 Unity와 같이 앞 입력의 Up이 무시됨)
+    """
+    rng = random.Random(seed)
+    jitter = (lambda: rng.gauss(0.0, error_ms / 1000.0)) if error_ms > 0 else (lambda: 0.0)
+    events = []
+    for hit_time, lane, note_type, duration in filter_notes(notes):
+        press = hit_time + jitter()
+        if note_type == SCRATCH and lane in SCRATCH_LANES:
+            events.append((press, lane, SCRATCH_INPUT))
+            continue
+        events.append((press, lane, DOWN))
+        release = f32(hit_time + duration) + jitter() if note_type == LONG else press + tap_ms / 1000.0
+        events.append((max(release, press), lane, UP))
+    # 같은 시각이면 앞 롱노트를 먼저 뗌 (홀드 중인 레인을 누르면 홀드 노트가 다시 판정됨)
+    events.sort(key=lambda e: (e[0], e[2] != UP))
+    return events
+
+
+def replay_song(path, inputs=None, offset=0.0, fps=DEFAULT_FPS, error_ms=0.0, config=None):
+    song = load_song(path)
+    events = inputs if inputs is not None else autoplay_inputs(song["notes"], error_ms)
+    outcome = ChartReplay(song, offset, config, fps).run(events)
+    outcome["song"] = {"path": str(path), "title": song["title"], "bpm": song["bpm"], "duration": song["duration"]}
+    return outcome
+
+
+def print_outcome(outcome):
+    r, s = outcome["result"], outcome["stats"]
+    print(f"🎵 {outcome['song']['title']} ({Path(outcome['song']['path']).name}): "
+          f"{r['Score']} ({r['BaseScore']} + bonus {r['BonusScore']}), rank {r['Rank']}, "
+          f"accuracy {r['Accuracy']:.2f}%, max combo {r['MaxCombo']}")
+    print(f"    P {r['PerfectCount']} / G {r['GreatCount']} / Good {r['GoodCount']} / B {r['BadCount']} / "
+          f"M {r['MissCount']}  notes {s['notes']}/{r['TotalNotes']} after filtering, "
+          f"{s['inputs']} inputs, {s['hold_ticks']} hold ticks, {s['expired']} expired")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a SongData chart with a lane input stream")
+    parser.add_argument("assets", nargs="*", help="SongData .asset files")
+    parser.add_argument("--project", default="My project")
+    parser.add_argument("--library", action="store_true", help="replay every SongData asset in the project")
+    parser.add_argument("--inputs", help="input stream (CSV time,lane,event or JSON); default: autoplay")
+    parser.add_argument("--error-ms", type=float, default=0.0, help="autoplay timing jitter (stddev)")
+    parser.add_argument("--offset", type=float, default=0.0, help="judgement user offset (seconds)")
+    parser.add_argument("--fps", type=float, default=DEFAULT_FPS)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    assets = list(args.assets)
+    if args.library or not assets:
+        assets += [str(p) for p in find_song_assets(args.project)]
+    inputs = load_inputs(args.inputs) if args.inputs else None
+    config = JudgementConfig.from_project(args.project)
+
+    started = time.perf_counter()
+    outcomes = [replay_song(path, inputs, args.offset, args.fps, args.error_ms, config) for path in assets]
+    if args.json:
+        print(json.dumps(outcomes, indent=2, ensure_ascii=False))
+    else:
+        for outcome in outcomes:
+            print_outcome(outcome)
+        print(f"\n⏱️  {len(outcomes)} charts replayed in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+Incremental Check Cache
+검사 입력 파일의 내용 해시를 키로 검사 결과를 저장하고, 입력이 그대로면 재실행하지 않음
+
+각 검사는 입력을 선언한다.
+- "Assets/Scripts/Gameplay/NoteSpawner.cs"  파일 내용 해시
+- "Assets/Scripts"                          폴더 아래 모든 파일의 내용 해시
+- listing("Assets/Scenes")                  폴더 아래 경로 목록만 (파일 존재/개수 검사용)
+- setting("test_selection", ("full", None))  파일이 아닌 실행 설정 값 (JSON으로 직렬화 가능한 값)
+검사 함수가 있는 모듈과 그 모듈이 (간접적으로) 가져다 쓰는 저장소 안 모듈(judgement.py,
+chart_replay.py 등)의 소스도 키에 포함되므로 검사 로직이나 보조 모듈을 고치면 자동으로 다시 실행된다.
+
+캐시 적중 시 이전 실행에서 출력한 내용과 test_results에 추가한 항목을 그대로 재현한다.
+파일 해시는 ProjectIndex가 크기/mtime 기준으로 보관하므로 바뀐 파일만 다시 읽는다.
+
+    cache = CheckCache(index)
+    ok = cache.run("script_integrity", ["Assets/Scripts"], self.check_script_integrity, self.test_results)
+    cache.save()
+"""
+
+import hashlib
+import inspect
+import io
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from project_index import DEFAULT_CACHE_DIR
+
+CACHE_VERSION = 1
+
+
+def listing(rel):
+    """폴더 내용 대신 경로 목록만 입력으로 사용"""
+    return ("listing", rel)
+
+
+def setting(name, value):
+    """파일 대신 실행 설정 값을 입력으로 사용 (값이 바뀌면 다시 실행)"""
+    return ("setting", name, json.dumps(value, sort_keys=True))
+
+
+# ----------------------------------------------------------------------
+# 스레드별 출력 캡처 (sys.stdout을 스레드마다 다른 버퍼로 보냄)
+# ----------------------------------------------------------------------
+class _OutputRouter(io.TextIOBase):
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer if buffer is not None else self.default).write(text)
+
+    def flush(self):
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is None:
+            self.default.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.default, name)
+
+
+_router_lock = threading.Lock()
+
+
+def _router():
+    with _router_lock:
+        if not isinstance(sys.stdout, _OutputRouter):
+            sys.stdout = _OutputRouter(sys.stdout)
+        return sys.stdout
+
+
+@contextmanager
+def capture_output():
+    """현재 스레드의 print 출력을 StringIO로 모음 (다른 스레드 출력에는 영향 없음)"""
+    router = _router()
+    buffer = io.StringIO()
+    previous = getattr(router.local, "buffer", None)
+    router.local.buffer = buffer
+    try:
+        yield buffer
+    finally:
+        router.local.buffer = previous
+
+
+class ScopedResults(list):
+    """
+    test_results 용 리스트. scope() 안에서는 현재 스레드의 append/extend가
+    지정한 리스트로 들어가므로 병렬 검사끼리 결과 순서가 섞이지 않는다.
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._local = threading.local()
+
+    def _target(self):
+        return getattr(self._local, "target", None)
+
+    def append(self, item):
+        target = self._target()
+        if target is not None:
+            target.append(item)
+        else:
+            super().append(item)
+
+    def extend(self, items):
+        target = self._target()
+        if target is not None:
+            target.extend(items)
+        else:
+            super().extend(items)
+
+    @contextmanager
+    def scope(self, target):
+        previous = self._target()
+        self._local.target = target
+        try:
+            yield target
+        finally:
+            self._local.target = previous
+
+
+_module_hashes = {}
+_module_hashes_lock = threading.Lock()
+
+
+def _local_dependency(value, root):
+    """value가 root 폴더의 .py 모듈이거나 그 모듈에 정의된 객체면 그 모듈"""
+    if inspect.ismodule(value):
+        module = value
+    else:
+        try:
+            module = sys.modules.get(getattr(value, "__module__", None) or "")
+        except Exception:
+            return None
+    path = getattr(module, "__file__", None)
+    if not path or not path.endswith(".py") or Path(path).resolve().parent != root:
+        return None
+    return module
+
+
+def module_sources_hash(module):
+    """module과 그 모듈이 가져다 쓰는 같은 폴더의 모듈들(간접 포함) 소스 해시"""
+    with _module_hashes_lock:
+        if module.__name__ in _module_hashes:
+            return _module_hashes[module.__name__]
+        root = Path(module.__file__).resolve().parent
+        seen, stack = {}, [module]
+        while stack:
+            current = stack.pop()
+            if current.__name__ in seen:
+                continue
+            seen[current.__name__] = current
+            for value in list(vars(current).values()):
+                dependency = _local_dependency(value, root)
+                if dependency is not None and dependency.__name__ not in seen:
+                    stack.append(dependency)
+        h = hashlib.sha1()
+        for path in sorted({Path(m.__file__).resolve() for m in seen.values()}):
+            h.update(f"{path.name}\0".encode("utf-8") + path.read_bytes() + b"\0")
+        _module_hashes[module.__name__] = h.hexdigest()
+        return _module_hashes[module.__name__]
+
+
+def code_hash(fn):
+    """
+    검사 함수가 정의된 모듈 + 그 모듈이 쓰는 저장소 안 보조 모듈 전체 소스 해시
+    (함수가 부르는 다른 메서드나 judgement.py 같은 보조 모듈 변경도 반영)
+    """
+    name = getattr(fn, "__qualname__", repr(fn))
+    module = inspect.getmodule(fn)
+    try:
+        source = module_sources_hash(module)
+    except (OSError, TypeError, AttributeError):
+        source = repr(getattr(fn, "__code__", fn))
+    return hashlib.sha1(f"{name}\0{source}".encode("utf-8")).hexdigest()
+
+
+def _source_stem(fn):
+    try:
+        return Path(inspect.getfile(fn)).stem
+    except TypeError:
+        return ""
+
+
+class CheckCache:
+    def __init__(self, index, cache_dir=DEFAULT_CACHE_DIR, enabled=True):
+        self.index = index
+        self.cache_file = Path(cache_dir) / "check_results.json"
+        self.enabled = enabled
+        self.entries = {}
+        self.hits = []
+        self.misses = []
+        self._lock = threading.Lock()
+        if enabled:
+            self.load()
+
+    def load(self):
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION:
+            self.entries = data.get("checks", {})
+
+    def save(self):
+        if not self.enabled:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_file.with_suffix(".tmp")
+        with self._lock:
+            data = {"version": CACHE_VERSION, "checks": self.entries}
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.cache_file)
+        # 새로 계산한 파일 해시도 보관
+        self.index.save()
+
+    # ------------------------------------------------------------------
+    # 입력 해시
+    # ------------------------------------------------------------------
+    def _digest(self, spec):
+        if isinstance(spec, tuple) and spec[0] == "setting":
+            return hashlib.sha1(spec[2].encode("utf-8")).hexdigest()
+        if isinstance(spec, tuple) and spec[0] == "listing":
+            rel = spec[1]
+            if not self.index.exists(rel):
+                return "missing"
+            paths = self.index.files(rel) + sorted(
+                d for d in self.index.dirs if d.startswith(rel.strip("/") + "/"))
+            return hashlib.sha1("\n".join(paths).encode("utf-8")).hexdigest()
+        if self.index.is_dir(spec):
+            h = hashlib.sha1()
+            for rel in self.index.files(spec):
+                h.update(f"{rel}\0{self.index.sha1(rel)}\n".encode("utf-8"))
+            return h.hexdigest()
+        return self.index.sha1(spec) or "missing"
+
+    def key(self, name, inputs, fn):
+        h = hashlib.sha1(f"{CACHE_VERSION}\0{name}\0{code_hash(fn)}".encode("utf-8"))
+        for spec in inputs:
+            h.update(f"\0{spec}={self._digest(spec)}".encode("utf-8"))
+        return h.hexdigest()
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def run(self, name, inputs, fn, results=None, cache_failures=True):
+        """
+        입력이 이전 실행과 같으면 저장된 결과를 재현하고, 아니면 fn()을 실행해 저장
+        results: 검사가 항목을 추가하는 test_results 리스트 (추가분을 함께 저장/재현)
+        """
+        if not self.enabled:
+            return fn()
+
+        key = self.key(name, inputs, fn)
+        # 여러 테스트 스크립트가 같은 캐시 파일을 쓰므로 정의된 파일 이름으로 구분
+        slot = f"{_source_stem(fn)}:{name}"
+        entry = self.entries.get(slot)
+        if entry and entry["key"] == key:
+            self.hits.append(name)
+            sys.stdout.write(entry["output"])
+            if results is not None:
+                results.extend(entry["results"])
+            return entry["value"]
+
+        self.misses.append(name)
+        added = []
+        scope = results.scope(added) if isinstance(results, ScopedResults) else nullcontext()
+        start = len(results) if results is not None else 0
+        with capture_output() as output, scope:
+            value = fn()
+        if isinstance(results, ScopedResults):
+            results.extend(added)
+        elif results is not None:
+            added = results[start:]
+        text = output.getvalue()
+        sys.stdout.write(text)
+
+        if value or cache_failures:
+            try:
+                json.dumps([value, added])
+            except (TypeError, ValueError):
+                return value
+            with self._lock:
+                self.entries[slot] = {
+                    "key": key,
+                    "value": value,
+                    "results": added,
+                    "output": text,
+                    "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                }
+        return value
+
+    def print_summary(self):
+        if not self.enabled:
+            return
+        print(f"\n♻️  Check cache: {len(self.hits)} reused, {len(self.misses)} executed")
+        if self.misses and self.hits:
+            print(f"    re-run: {', '.join(self.misses)}")
@@ -1,41 +1,11 @@
 import asyncio
-import json
-import sys
 
-try:
-    import websockets
-except ImportError:
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "websockets"])
-    import websockets
-
-class UnityMCPClient:
-    def __init__(self, uri="ws://localhost:8090/McpUnity"):
-        self.uri = uri
-        self.ws = None
-        self.request_id = 0
-    
-    async def connect(self):
-        self.ws = await websockets.connect(self.uri, close_timeout=5, max_size=1024*1024, ping_interval=None)
-        print("Connected to Unity MCP")
-    
-    async def close(self):
-        if self.ws:
-            await self.ws.close()
-    
-    async def call(self, method, params=None):
-        self.request_id += 1
-        request = {
-            "id": str(self.request_id),
-            "method": method,
-            "params": params or {}
-        }
-        await self.ws.send(json.dumps(request))
-        response = await asyncio.wait_for(self.ws.recv(), timeout=30)
-        return json.loads(response)
+from mcp_readiness import Readiness, load_scene, play_mode_entered
+from mcp_session import MCPSession
 
 async def check_main_menu():
-    client = UnityMCPClient()
+    client = MCPSession()
+    probes = Readiness()
     await client.connect()
     
     print("\n" + "="*60)
@@ -44,14 +14,9 @@ async def check_main_menu():
     
     # 1. MainMenu 씬 로드
     print("\n[1] Loading MainMenu scene...")
-    result = await client.call("load_scene", {
-        "scenePath": "Assets/Scenes/MainMenu.unity",
-        "loadMode": "Single"
-    })
+    result = await load_scene(client, "Assets/Scenes/MainMenu.unity", probes)
     print(f"    Result: {result.get('result', {}).get('success', False)}")
     
-    await asyncio.sleep(1)
-    
     # 2. 씬 정보 확인
     print("\n[2] Scene info...")
     result = await client.call("get_scene_info")
@@ -62,6 +27,7 @@ async def check_main_menu():
     
     # 3. 플레이 모드 시작
     print("\n[3] Starting Play Mode to see MainMenu...")
+    mark = client.drops
     try:
         result = await client.call("execute_menu_item", {
             "menuPath": "Tools/A.I. BEAT/Start Play Mode"
@@ -73,6 +39,11 @@ async def check_main_menu():
         else:
             print(f"    Error: {e}")
     
+    try:
+        await probes.wait_until(play_mode_entered(client, mark), name="enter play mode")
+    except asyncio.TimeoutError as e:
+        print(f"    Warning: {e}")
+    
     # 4. 5초 대기
     print("\n[4] Watch Unity Game window for 5 seconds...")
     for i in range(5, 0, -1):
@@ -83,7 +54,6 @@ async def check_main_menu():
     # 5. 플레이 모드 중지
     print("\n[5] Stopping Play Mode...")
     try:
-        await client.connect()
         result = await client.call("execute_menu_item", {
             "menuPath": "Tools/A.I. BEAT/Stop Play Mode"
         })
@@ -91,6 +61,7 @@ async def check_main_menu():
     except Exception as e:
         print(f"    {e}")
     
+    probes.print_summary()
     await client.close()
     
     print("\n" + "="*60)
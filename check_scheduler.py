@@ -0,0 +1,212 @@
+"""
+Parallel Check Scheduler
+검사를 의존 관계가 있는 노드(DAG)로 선언하고 스레드 풀에서 병렬 실행
+
+- 의존 검사가 모두 끝난 노드부터 실행 (대부분 I/O 위주라 스레드로 충분)
+- 의존 검사가 예외를 내거나 False를 반환하면 해당 노드는 건너뜀
+- 각 검사의 출력은 스레드별로 모았다가 선언 순서대로 출력 (순차 실행과 같은 화면)
+- test_results 추가분도 선언 순서대로 합침
+- 검사별 실행 시간과 임계 경로(critical path)를 보고서에 기록
+
+    scheduler = CheckScheduler(max_workers=4)
+    scheduler.add("script_integrity", self.check_script_integrity)
+    scheduler.add("editor_tests", self.run_editor_tests, deps=["script_integrity"])
+    scheduler.run(self.test_results)
+    report["scheduler"] = scheduler.report()
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+
+from check_cache import ScopedResults, capture_output
+
+DEFAULT_WORKERS = 4
+# 검사 함수가 이 값을 반환하면 통과가 아니라 "skipped"로 기록
+SKIPPED = "skipped"
+
+
+class Check:
+    def __init__(self, name, fn, deps=()):
+        self.name = name
+        self.fn = fn
+        self.deps = list(deps)
+        self.status = "pending"   # passed / failed / error / skipped
+        self.value = None
+        self.error = None
+        self.output = ""
+        self.results = []
+        self.start = None
+        self.end = None
+
+    @property
+    def elapsed(self):
+        if self.start is None or self.end is None:
+            return 0.0
+        return self.end - self.start
+
+
+class CheckScheduler:
+    def __init__(self, max_workers=DEFAULT_WORKERS):
+        self.max_workers = max(1, int(max_workers))
+        self.checks = {}
+        self.wall_time = 0.0
+
+    def add(self, name, fn, deps=()):
+        if name in self.checks:
+            raise ValueError(f"Duplicate check: {name}")
+        self.checks[name] = Check(name, fn, deps)
+        return self.checks[name]
+
+    def _validate(self):
+        for check in self.checks.values():
+            for dep in check.deps:
+                if dep not in self.checks:
+                    raise ValueError(f"{check.name} depends on unknown check {dep}")
+        # 순환 의존 검사
+        visiting, done = set(), set()
+
+        def visit(name, path):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError("Dependency cycle: " + " -> ".join(path + [name]))
+            visiting.add(name)
+            for dep in self.checks[name].deps:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.checks:
+            visit(name, [])
+
+    def _execute(self, check, results, origin):
+        check.start = time.perf_counter() - origin
+        scope = results.scope(check.results) if isinstance(results, ScopedResults) else nullcontext()
+        status = "passed"
+        with capture_output() as output, scope:
+            try:
+                check.value = check.fn()
+                if check.value is False:
+                    status = "failed"
+                elif check.value is SKIPPED:
+                    status = "skipped"
+            except Exception as e:
+                check.error = f"{type(e).__name__}: {e}"
+                status = "error"
+                print(f"  ❌ {check.name} raised {check.error}")
+        check.output = output.getvalue()
+        check.end = time.perf_counter() - origin
+        # 상태는 마지막에 바꿈 (메인 스레드가 status로 출력 완료 여부를 판단)
+        check.status = status
+        return check
+
+    def run(self, results=None):
+        """
+        모든 검사 실행. results(ScopedResults)에 검사별 추가 항목을 선언 순서대로 합친다.
+        반환: {name: Check}
+        """
+        self._validate()
+        order = list(self.checks)
+        remaining = {name: set(check.deps) for name, check in self.checks.items()}
+        dependents = {name: [] for name in order}
+        for name, check in self.checks.items():
+            for dep in check.deps:
+                dependents[dep].append(name)
+
+        origin = time.perf_counter()
+        printed = 0
+
+        def flush():
+            nonlocal printed
+            while printed < len(order) and self.checks[order[printed]].status != "pending":
+                print(self.checks[order[printed]].output, end="")
+                printed += 1
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="check") as pool:
+            futures = {}
+
+            def release(name):
+                for child in dependents[name]:
+                    remaining[child].discard(name)
+                    if remaining[child]:
+                        continue
+                    check = self.checks[child]
+                    failed = [d for d in check.deps if self.checks[d].status != "passed"]
+                    if failed:
+                        check.status = "skipped"
+                        check.output = f"  ⏭️  {child} skipped (dependency failed: {', '.join(failed)})\n"
+                        release(child)
+                    else:
+                        futures[pool.submit(self._execute, check, results, origin)] = child
+
+            for name in order:
+                if not remaining[name]:
+                    futures[pool.submit(self._execute, self.checks[name], results, origin)] = name
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures.pop(future)
+                    future.result()
+                    release(name)
+                flush()
+        flush()
+
+        self.wall_time = time.perf_counter() - origin
+        if results is not None:
+            for name in order:
+                # ScopedResults.extend는 스레드 scope를 따르므로 list.extend로 직접 추가
+                list.extend(results, self.checks[name].results)
+        return self.checks
+
+    def critical_path(self):
+        """실행 시간 기준 가장 긴 의존 경로: (경로, 초)"""
+        finish, best_dep = {}, {}
+
+        def longest(name):
+            if name not in finish:
+                check = self.checks[name]
+                dep = max(check.deps, key=longest, default=None)
+                best_dep[name] = dep
+                finish[name] = check.elapsed + (finish[dep] if dep else 0.0)
+            return finish[name]
+
+        if not self.checks:
+            return [], 0.0
+        end = max(self.checks, key=longest)
+        path = []
+        while end is not None:
+            path.append(end)
+            end = best_dep[end]
+        return path[::-1], finish[path[0]]
+
+    def report(self):
+        path, length = self.critical_path()
+        total = sum(check.elapsed for check in self.checks.values())
+        return {
+            "workers": self.max_workers,
+            "wall_time_ms": round(self.wall_time * 1000, 1),
+            "check_time_ms": round(total * 1000, 1),
+            "speedup": round(total / self.wall_time, 2) if self.wall_time > 0 else None,
+            "critical_path": path,
+            "critical_path_ms": round(length * 1000, 1),
+            "checks": {
+                name: {
+                    "status": check.status,
+                    "deps": check.deps,
+                    "start_ms": round((check.start or 0.0) * 1000, 1),
+                    "elapsed_ms": round(check.elapsed * 1000, 1),
+                    **({"error": check.error} if check.error else {}),
+                }
+                for name, check in self.checks.items()
+            },
+        }
+
+    def print_summary(self):
+        data = self.report()
+        print(f"\n⏱️  Checks: {len(self.checks)} on {self.max_workers} workers, "
+              f"wall {data['wall_time_ms']:.0f} ms (sum {data['check_time_ms']:.0f} ms)")
+        for name, info in data["checks"].items():
+            print(f"    {name:<32}{info['elapsed_ms']:>9.1f} ms  {info['status']}")
+        print(f"    critical path: {' -> '.join(data['critical_path'])} ({data['critical_path_ms']:.0f} ms)")
@@ -0,0 +1,503 @@
+"""
+C# Symbol Index
+Assets/Scripts 아래 .cs 파일을 토큰 단위로 훑어 심볼 테이블 생성
+
+주석/문자열/문자 리터럴은 토크나이저 단계에서 제거되므로 주석 속 "[Test]"나
+문자열 속 ": MonoBehaviour"에 속지 않는다. 파일마다 추출하는 항목:
+- namespace, using
+- 타입 (class/struct/interface/enum/record): 이름, 상위 타입, 특성(attribute), 중첩 부모
+- 메서드/생성자 시그니처: 이름, 반환형, 한정자, 매개변수, 특성, 줄 번호,
+  메서드가 참조하는 식별자와 "Assets/..." 경로 문자열
+- 파일에서 사용한 식별자 집합 (참조 그래프용)
+
+바뀐 파일만 프로세스 풀에서 병렬로 파싱하고, 결과는 파일 내용 해시를 키로
+.test_cache/csharp_symbols.json 에 저장한다.
+
+    symbols = get_symbol_index("My project")
+    symbols.inherits("Core/GameManager.cs", "MonoBehaviour")
+    symbols.test_methods("Editor/AIBeatEditorTests.cs")
+"""
+
+import bisect
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from project_index import DEFAULT_CACHE_DIR, get_index
+
+SYMBOLS_VERSION = 2
+SCRIPTS_ROOT = "Assets/Scripts"
+# 이보다 적은 파일만 바뀌었으면 프로세스 풀 시작 비용이 더 크므로 직접 파싱
+PARALLEL_THRESHOLD = 16
+
+TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<pre>\#[^\n]*)
+  | (?P<string>\$?@"(?:[^"]|"")*"|@\$"(?:[^"]|"")*"|\$?"(?:[^"\\\n]|\\.)*")
+  | (?P<char>'(?:[^'\\\n]|\\.)+')
+  | (?P<ident>@?[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<op>=>|::|\?\?|[{}()\[\]<>;:,.=?!&|+\-*/%^~])
+""", re.VERBOSE | re.DOTALL)
+
+TYPE_KEYWORDS = frozenset({"class", "struct", "interface", "enum", "record"})
+MODIFIERS = frozenset({
+    "public", "private", "protected", "internal", "static", "abstract", "sealed", "virtual",
+    "override", "readonly", "extern", "unsafe", "new", "partial", "async", "const", "volatile",
+})
+NOT_METHOD_NAMES = frozenset({
+    "if", "for", "foreach", "while", "switch", "catch", "using", "lock", "return", "new",
+    "base", "this", "typeof", "sizeof", "nameof", "default", "when", "fixed",
+})
+KEYWORDS = TYPE_KEYWORDS | MODIFIERS | NOT_METHOD_NAMES | frozenset({
+    "namespace", "void", "int", "float", "double", "bool", "string", "object", "var", "null",
+    "true", "false", "get", "set", "out", "ref", "in", "is", "as", "else", "do", "break",
+    "continue", "throw", "try", "finally", "yield", "delegate", "event", "operator", "where",
+})
+ASSET_PATH_RE = re.compile(r"Assets/[^\"\\{}]+")
+TEST_ATTRIBUTES = frozenset({"Test", "TestCase", "UnityTest", "TestCaseSource"})
+
+
+def tokenize(text):
+    """[(kind, value, offset)] (공백/주석/전처리기/문자열 내용 제외)"""
+    tokens = []
+    for m in TOKEN_RE.finditer(text):
+        kind = m.lastgroup
+        if kind in ("ws", "comment", "pre"):
+            continue
+        value = m.group()
+        if kind in ("string", "char"):
+            value = kind  # 내용은 구조와 무관
+        elif kind == "ident":
+            value = value.lstrip("@")
+        tokens.append((kind, value, m.start()))
+    return tokens
+
+
+def _attribute_name(values):
+    """['System', '.', 'Serializable'] -> 'Serializable', 'TestCaseAttribute' -> 'TestCase'"""
+    names = [v for v in values if re.match(r"[A-Za-z_]", v)]
+    if not names:
+        return None
+    name = names[-1]
+    return name[:-len("Attribute")] if name.endswith("Attribute") and name != "Attribute" else name
+
+
+def _type_name(values):
+    """'IComparable<T>' / 'UnityEngine.MonoBehaviour' -> 마지막 이름만"""
+    depth = 0
+    name = None
+    for v in values:
+        if v == "<":
+            depth += 1
+        elif v == ">":
+            depth -= 1
+        elif depth == 0 and v not in (".", "::") and re.match(r"[A-Za-z_]", v):
+            name = v
+    return name
+
+
+def _split_top(values, sep=","):
+    parts, current, depth = [], [], 0
+    for v in values:
+        if v in ("<", "(", "["):
+            depth += 1
+        elif v in (">", ")", "]"):
+            depth -= 1
+        if v == sep and depth == 0:
+            parts.append(current)
+            current = []
+        else:
+            current.append(v)
+    if current:
+        parts.append(current)
+    return parts
+
+
+class _Parser:
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.lines = [m.start() for m in re.finditer("\n", text)]
+        self.pos = 0
+        self.namespaces = []
+        self.usings = []
+        self.types = []
+        self.references = set()
+
+    def line(self, offset):
+        return bisect.bisect_right(self.lines, offset) + 1
+
+    def skip_balanced(self, open_, close):
+        """현재 위치의 open_ 부터 짝이 맞는 close 다음까지 건너뛰고 그 사이 토큰 반환"""
+        depth = 0
+        start = self.pos
+        while self.pos < len(self.tokens):
+            v = self.tokens[self.pos][1]
+            self.pos += 1
+            if v == open_:
+                depth += 1
+            elif v == close:
+                depth -= 1
+                if depth == 0:
+                    return self.tokens[start + 1:self.pos - 1]
+        return self.tokens[start + 1:]
+
+    def skip_to_statement_end(self):
+        """필드 초기화식/식 본문(=>)을 ';'까지 건너뜀 (괄호 안의 ';'는 무시)"""
+        depth = 0
+        while self.pos < len(self.tokens):
+            v = self.tokens[self.pos][1]
+            self.pos += 1
+            if v in ("{", "(", "["):
+                depth += 1
+            elif v in ("}", ")", "]"):
+                depth -= 1
+                if depth < 0:
+                    self.pos -= 1
+                    return
+            elif v == ";" and depth == 0:
+                return
+
+    def parse(self):
+        for kind, value, _ in self.tokens:
+            if kind == "ident" and value not in KEYWORDS:
+                self.references.add(value)
+        self.parse_block(namespace="", parent=None, top=True)
+        return {
+            "namespaces": self.namespaces,
+            "usings": self.usings,
+            "types": self.types,
+            "references": sorted(self.references),
+        }
+
+    def parse_block(self, namespace, parent, top=False):
+        """namespace/타입 본문을 '}' 까지 파싱 (top이면 파일 끝까지)"""
+        pending = []
+        attributes = []
+        while self.pos < len(self.tokens):
+            kind, value, offset = self.tokens[self.pos]
+
+            if value == "}":
+                self.pos += 1
+                if not top:
+                    return
+                pending, attributes = [], []
+                continue
+
+            if value == "[" and not pending:
+                inner = self.skip_balanced("[", "]")
+                for part in _split_top([v for _, v, _ in inner]):
+                    if ":" in part[:2]:
+                        # [assembly: ...], [return: ...] 등 대상 지정
+                        part = part[part.index(":") + 1:]
+                    if "(" in part:
+                        part = part[:part.index("(")]
+                    name = _attribute_name(part)
+                    if name:
+                        attributes.append(name)
+                continue
+
+            if value == ";":
+                self.pos += 1
+                if pending and pending[0][1] == "using":
+                    self.usings.append("".join(v for _, v, _ in pending[1:]))
+                elif pending and pending[0][1] == "namespace":
+                    # file-scoped namespace
+                    namespace = "".join(v for _, v, _ in pending[1:])
+                    self.namespaces.append(namespace)
+                pending, attributes = [], []
+                continue
+
+            if value == "{":
+                values = [v for _, v, _ in pending]
+                if values and values[0] == "namespace":
+                    self.pos += 1
+                    name = "".join(values[1:])
+                    full = f"{namespace}.{name}" if namespace else name
+                    self.namespaces.append(full)
+                    self.parse_block(full, None)
+                elif TYPE_KEYWORDS & set(values):
+                    self.pos += 1
+                    self.parse_type(pending, attributes, namespace, parent)
+                else:
+                    # 속성 본문, 초기화 블록 등
+                    self.skip_balanced("{", "}")
+                pending, attributes = [], []
+                continue
+
+            if parent is not None and value in ("=", "=>") and pending:
+                self.pos += 1
+                self.skip_to_statement_end()
+                pending, attributes = [], []
+                continue
+
+            if parent is not None and value == "(" and pending and self.parse_method(pending, attributes, parent):
+                pending, attributes = [], []
+                continue
+
+            pending.append(self.tokens[self.pos])
+            self.pos += 1
+
+    def parse_type(self, pending, attributes, namespace, parent):
+        values = [v for _, v, _ in pending]
+        index = next(i for i, v in enumerate(values) if v in TYPE_KEYWORDS)
+        kind = values[index]
+        if kind == "record" and index + 1 < len(values) and values[index + 1] in ("class", "struct"):
+            index += 1
+        rest = values[index + 1:]
+        name = rest[0] if rest else "?"
+        bases = []
+        if ":" in rest:
+            base_tokens = rest[rest.index(":") + 1:]
+            if "where" in base_tokens:
+                base_tokens = base_tokens[:base_tokens.index("where")]
+            bases = [b for b in (_type_name(part) for part in _split_top(base_tokens)) if b]
+        qualified = f"{parent['qualified']}.{name}" if parent else name
+        entry = {
+            "name": name,
+            "qualified": qualified,
+            "kind": kind,
+            "namespace": namespace,
+            "bases": bases,
+            "attributes": attributes,
+            "modifiers": [v for v in values[:index] if v in MODIFIERS],
+            "line": self.line(pending[index][2]),
+            "methods": [],
+        }
+        self.types.append(entry)
+        if kind == "enum":
+            self.pos -= 1
+            self.skip_balanced("{", "}")
+            return
+        self.parse_block(namespace, entry)
+
+    def parse_method(self, pending, attributes, parent):
+        """'(' 위치에서 메서드/생성자 선언이면 기록 후 본문까지 건너뜀"""
+        values = [v for _, v, _ in pending]
+        name_index = len(values) - 1
+        if values[-1] == ">":
+            # 제네릭 메서드: Name<T>(
+            depth = 0
+            for i in range(len(values) - 1, -1, -1):
+                depth += values[i] == ">"
+                depth -= values[i] == "<"
+                if depth == 0:
+                    name_index = i - 1
+                    break
+        if name_index < 0:
+            return False
+        name = values[name_index]
+        if not re.match(r"[A-Za-z_]", name) or name in NOT_METHOD_NAMES or values[0] in ("delegate", "event"):
+            return False
+        head = values[:name_index]
+        modifiers = [v for v in head if v in MODIFIERS]
+        return_type = "".join(v for v in head if v not in MODIFIERS)
+        if not return_type and name != parent["name"]:
+            return False
+
+        open_offset = self.tokens[self.pos][2]
+        start = self.pos
+        self.skip_balanced("(", ")")
+        params = " ".join(self.text[open_offset + 1:self.tokens[self.pos - 1][2]].split())
+        self.skip_method_body()
+        body = self.tokens[start:self.pos]
+        parent["methods"].append({
+            "name": name,
+            "kind": "constructor" if not return_type else "method",
+            "returns": return_type or None,
+            "modifiers": modifiers,
+            "params": params,
+            "attributes": attributes,
+            "line": self.line(pending[name_index][2] if name_index < len(pending) else pending[-1][2]),
+            # 매개변수/본문에서 쓰는 식별자와 "Assets/..." 경로 문자열 (테스트 영향 분석용)
+            "references": sorted({v for k, v, _ in body if k == "ident" and v not in KEYWORDS}
+                                 | {v for v in head if re.match(r"[A-Za-z_]", v) and v not in KEYWORDS}),
+            "assets": sorted({path for k, _, offset in body if k == "string"
+                              for path in ASSET_PATH_RE.findall(TOKEN_RE.match(self.text, offset).group())}),
+        })
+        return True
+
+    def skip_method_body(self):
+        """본문 / 식 본문 / 선언만(;) / 생성자 초기화(: base(...)) / 제약 조건(where)"""
+        while self.pos < len(self.tokens):
+            v = self.tokens[self.pos][1]
+            if v == "{":
+                self.skip_balanced("{", "}")
+                return
+            if v == "=>":
+                self.pos += 1
+                self.skip_to_statement_end()
+                return
+            if v == ";":
+                self.pos += 1
+                return
+            if v == "}":
+                return
+            if v == "(":
+                self.skip_balanced("(", ")")
+                continue
+            self.pos += 1
+
+def parse_source(text):
+    return _Parser(text).parse()
+
+
+def parse_file(path):
+    with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
+        return parse_source(f.read())
+
+
+class SymbolIndex:
+    def __init__(self, project_index, root=SCRIPTS_ROOT, cache_dir=DEFAULT_CACHE_DIR):
+        self.index = project_index
+        self.root = root.strip("/")
+        self.cache_file = Path(cache_dir) / "csharp_symbols.json"
+        self.files = {}   # "Core/GameManager.cs" (root 기준) -> {"sha1", "symbols"}
+        self.last_stats = {}
+        self._types = None
+
+    def load(self):
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != SYMBOLS_VERSION:
+            return False
+        self.files = data.get("files", {})
+        return True
+
+    def save(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_file.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": SYMBOLS_VERSION, "files": self.files}, f, ensure_ascii=False)
+        os.replace(tmp, self.cache_file)
+        self.index.save()
+
+    def refresh(self, max_workers=None):
+        """내용 해시가 바뀐 .cs 파일만 다시 파싱"""
+        started = time.perf_counter()
+        current = {}
+        stale = []
+        for rel in self.index.files(self.root, ext=".cs"):
+            key = rel[len(self.root) + 1:]
+            digest = self.index.sha1(rel)
+            cached = self.files.get(key)
+            if cached and cached["sha1"] == digest:
+                current[key] = cached
+            else:
+                stale.append((key, digest, str(self.index.path(rel))))
+
+        if len(stale) >= PARALLEL_THRESHOLD and (max_workers is None or max_workers > 1):
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                parsed = list(pool.map(parse_file, [path for _, _, path in stale], chunksize=4))
+        else:
+            parsed = [parse_file(path) for _, _, path in stale]
+        for (key, digest, _), symbols in zip(stale, parsed):
+            current[key] = {"sha1": digest, "symbols": symbols}
+
+        self.files = current
+        self._types = None
+        self.last_stats = {
+            "files": len(current),
+            "parsed": len(stale),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        return self.last_stats
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _key(script):
+        script = str(script).replace("\\", "/").strip("/")
+        return script[len(SCRIPTS_ROOT) + 1:] if script.startswith(SCRIPTS_ROOT + "/") else script
+
+    def symbols(self, script):
+        entry = self.files.get(self._key(script))
+        return entry["symbols"] if entry else None
+
+    def types_by_name(self):
+        """{타입 이름: [(파일, 타입)]}"""
+        if self._types is None:
+            self._types = {}
+            for key, entry in self.files.items():
+                for t in entry["symbols"]["types"]:
+                    self._types.setdefault(t["name"], []).append((key, t))
+        return self._types
+
+    def declared_types(self, script):
+        symbols = self.symbols(script)
+        return symbols["types"] if symbols else []
+
+    def base_chain(self, type_entry, _seen=None):
+        """직접/간접 상위 타입 이름 집합 (프로젝트 안에 선언된 타입은 따라 올라감)"""
+        seen = _seen if _seen is not None else set()
+        for base in type_entry["bases"]:
+            if base in seen:
+                continue
+            seen.add(base)
+            for _, declared in self.types_by_name().get(base, []):
+                self.base_chain(declared, seen)
+        return seen
+
+    def inherits(self, script, base):
+        """파일에 base를 (간접) 상속하는 타입이 있는지"""
+        return any(base in self.base_chain(t) for t in self.declared_types(script))
+
+    def has_attribute(self, script, attribute):
+        return any(attribute in t["attributes"] for t in self.declared_types(script))
+
+    def declares(self, script, name, kind=None):
+        return any(t["name"] == name and (kind is None or t["kind"] == kind) for t in self.declared_types(script))
+
+    def matches(self, script, pattern):
+        """
+        구조 패턴 검사: "class Note" -> Note 클래스 선언,
+        그 외 이름 -> 선언된 타입, (간접) 상위 타입 또는 타입 특성
+        """
+        kind, _, name = pattern.rpartition(" ")
+        if kind:
+            return self.declares(script, name, kind)
+        return self.declares(script, name) or self.inherits(script, name) or self.has_attribute(script, name)
+
+    def methods(self, script):
+        return [m for t in self.declared_types(script) for m in t["methods"]]
+
+    def test_methods(self, script):
+        return [m for m in self.methods(script) if TEST_ATTRIBUTES & set(m["attributes"])]
+
+    def category_counts(self, script, categories):
+        """테스트 메서드 이름 접두어(Category_...)별 개수"""
+        names = [m["name"] for m in self.test_methods(script)]
+        return {c: sum(1 for n in names if n.startswith(c)) for c in categories}
+
+    def references(self, script):
+        symbols = self.symbols(script)
+        return set(symbols["references"]) if symbols else set()
+
+
+_symbol_indexes = {}
+
+
+def get_symbol_index(project_path="My project", cache_dir=DEFAULT_CACHE_DIR, max_workers=None):
+    """프로세스 안에서 공유하는 심볼 색인 (처음 호출 시 로드 + 증분 파싱 + 저장)"""
+    index = get_index(project_path, cache_dir)
+    key = (str(Path(project_path).resolve()), str(cache_dir))
+    symbols = _symbol_indexes.get(key)
+    if symbols is None:
+        symbols = _symbol_indexes[key] = SymbolIndex(index, cache_dir=cache_dir)
+        symbols.load()
+        symbols.refresh(max_workers)
+        if symbols.last_stats["parsed"]:
+            try:
+                symbols.save()
+            except OSError:
+                pass
+    return symbols
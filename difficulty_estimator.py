@@ -0,0 +1,262 @@
+"""
+Monte Carlo Difficulty Estimator
+차트마다 가상 플레이어 수천 명을 돌려 기대 정확도, 풀콤보 확률, 점수 분포를 추정
+
+- 플레이어: 타이밍 편향(bias), 흔들림(jitter), 노트를 놓칠 확률(miss)
+  · bias ~ N(bias_ms, bias_spread_ms), jitter = jitter_ms * exp(N(0, jitter_spread)), miss = miss_prob
+  · 노트마다 입력 = HitTime + bias + N(0, jitter), 확률 miss로 입력 없음
+- 판정: judgement.py 의 배열 판정 (JudgementSystem과 같은 창/점수/정확도)
+  · 노트는 chart_replay.filter_notes 로 정리한 뒤 판정 순서(시간순)로 나열
+  · 롱노트는 누를 때 + 뗄 때 두 번 판정 (80% 이상 홀드 시 끝 시간 기준, 아니면 Miss),
+    놓친 롱노트는 Miss 한 번, 홀드 보너스는 프레임 간격 틱 수로 계산
+  · 같은 레인 노트 사이의 입력 간섭은 무시 (한 판 정확히 보려면 chart_replay.py)
+- 차트 x 플레이어 묶음 단위로 프로세스 풀에 나눠 실행
+
+    python difficulty_estimator.py --players 5000
+    python difficulty_estimator.py --perfect-ms 45 --great-ms 90 --output estimate.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from chart_replay import DEFAULT_FPS, HOLD_BONUS_PER_TICK, HOLD_BONUS_TICK_INTERVAL, HOLD_SUCCESS_RATIO, filter_notes
+from judgement import BAD, MISS, SKIP, JudgementConfig, accuracy, combos, counts, judge, scores
+from song_asset import LONG, find_song_assets, load_song
+
+BATCH_SIZE = 500
+PERCENTILES = (5, 25, 50, 75, 95)
+RANKS = ("S+", "S", "A", "B", "C", "D")
+
+# 작업 프로세스마다 읽어 둔 차트
+_CHARTS = {}
+
+
+class PlayerModel:
+    def __init__(self, bias_ms=0.0, bias_spread_ms=10.0, jitter_ms=35.0, jitter_spread=0.3, miss_prob=0.02):
+        self.bias_ms = bias_ms
+        self.bias_spread_ms = bias_spread_ms
+        self.jitter_ms = jitter_ms
+        self.jitter_spread = jitter_spread
+        self.miss_prob = miss_prob
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+def judgement_slots(notes):
+    """판정 자리: (기준 시간, 노트 번호, 뗌 여부) 를 시간순으로. 롱노트는 누름/뗌 두 자리"""
+    slots = []
+    for i, (hit_time, _, note_type, duration) in enumerate(notes):
+        slots.append((hit_time, i, False))
+        if note_type == LONG:
+            slots.append((hit_time + duration, i, True))
+    slots.sort(key=lambda s: s[0])
+    return slots
+
+
+def _chart(path):
+    """작업 프로세스마다 한 번만 읽고 판정 자리 배열을 만들어 둠"""
+    chart = _CHARTS.get(path)
+    if chart is None:
+        song = load_song(path)
+        notes = filter_notes(song["notes"])
+        slots = judgement_slots(notes)
+        hit = np.array([n[0] for n in notes], dtype=np.float32)
+        duration = np.array([n[3] for n in notes], dtype=np.float32)
+        chart = _CHARTS[path] = {
+            "total_notes": len(song["notes"]),
+            "hit": hit,
+            "duration": duration,
+            "is_long": np.array([n[2] == LONG for n in notes]),
+            "slot_time": np.array([s[0] for s in slots], dtype=np.float32),
+            "slot_note": np.array([s[1] for s in slots], dtype=np.int64),
+            "slot_release": np.array([s[2] for s in slots]),
+        }
+    return chart
+
+
+def _hold_ticks(hold_s, fps):
+    """홀드 시간 동안의 보너스 틱 수 (프레임 단위 근사, 릴리즈 프레임 틱은 제외)"""
+    period = max(1, round(HOLD_BONUS_TICK_INTERVAL * fps)) / fps
+    return np.maximum(np.ceil(np.maximum(hold_s, 0.0) / period - 1e-6) - 1, 0).astype(np.int64)
+
+
+def simulate_batch(path, players, model, config, seed, fps=DEFAULT_FPS):
+    """플레이어 players명의 (점수, 정확도, 풀콤보, Miss 수) 배열"""
+    chart = _chart(path)
+    rng = np.random.default_rng(seed)
+    n_notes = len(chart["hit"])
+    bias = rng.normal(model.bias_ms, model.bias_spread_ms, (players, 1)) / 1000.0
+    jitter = model.jitter_ms * np.exp(rng.normal(0.0, model.jitter_spread, (players, 1))) / 1000.0
+    press = chart["hit"] + bias + rng.normal(0.0, 1.0, (players, n_notes)) * jitter
+    release = chart["hit"] + chart["duration"] + bias + rng.normal(0.0, 1.0, (players, n_notes)) * jitter
+    missed = rng.random((players, n_notes)) < model.miss_prob
+
+    # 누름 판정
+    press_input = np.where(missed, np.nan, press).astype(np.float32)
+    press_codes, _ = judge(press_input, chart["hit"], 0.0, config)
+    # 뗌 판정: 누르지 않았으면 판정 없음, 짧게 뗐으면 Miss
+    end_time = (chart["hit"] + chart["duration"]).astype(np.float32)
+    held = (release - press).astype(np.float32)
+    short = held < (chart["duration"] * np.float32(HOLD_SUCCESS_RATIO))
+    release_codes, _ = judge(release.astype(np.float32), end_time, 0.0, config)
+    release_codes = np.where(short, np.uint8(MISS), release_codes)
+    release_codes = np.where(missed, np.uint8(SKIP), release_codes)
+
+    slot_note = chart["slot_note"]
+    codes = np.where(chart["slot_release"], release_codes[:, slot_note], press_codes[:, slot_note]).astype(np.uint8)
+    combo = combos(codes)
+    base = scores(codes, combo, config).sum(axis=-1, dtype=np.int64)
+    hold = np.where(missed | ~chart["is_long"], 0.0, np.minimum(held, chart["duration"]))
+    bonus = _hold_ticks(hold, fps).sum(axis=-1) * HOLD_BONUS_PER_TICK
+    result_counts = counts(codes)
+    full_combo = (result_counts[:, BAD] + result_counts[:, MISS]) == 0
+    return {
+        "score": base + bonus,
+        "accuracy": accuracy(result_counts),
+        "full_combo": full_combo,
+        "misses": result_counts[:, MISS],
+    }
+
+
+def _worker(task):
+    chart_index, path, players, model, config, seed, fps = task
+    return chart_index, simulate_batch(path, players, model, config, seed, fps)
+
+
+def _rank_index(acc, misses):
+    conditions = [(acc >= 98) & (misses == 0), acc >= 95, acc >= 90, acc >= 80, acc >= 70]
+    return np.select(conditions, range(5), default=5)
+
+
+def summarize_chart(song, chart, batches):
+    score = np.concatenate([b["score"] for b in batches])
+    acc = np.concatenate([b["accuracy"] for b in batches])
+    full_combo = np.concatenate([b["full_combo"] for b in batches])
+    misses = np.concatenate([b["misses"] for b in batches])
+    rank_counts = np.bincount(_rank_index(acc, misses), minlength=len(RANKS))
+    duration = song["duration"] or (float(chart["hit"][-1]) if len(chart["hit"]) else 0.0)
+    return {
+        "path": song["path"],
+        "title": song["title"],
+        "difficulty": song["difficulty"],
+        "notes": int(len(chart["hit"])),
+        "notes_per_s": round(len(chart["hit"]) / duration, 2) if duration else None,
+        "players": int(len(score)),
+        "expected_accuracy": round(float(acc.mean()), 2),
+        "accuracy_p5": round(float(np.percentile(acc, 5)), 2),
+        "full_combo_probability": round(float(full_combo.mean()), 4),
+        "score_mean": round(float(score.mean())),
+        "score_percentiles": {f"p{p}": int(v) for p, v in zip(PERCENTILES, np.percentile(score, PERCENTILES))},
+        "ranks": {name: round(int(count) / len(score), 4) for name, count in zip(RANKS, rank_counts)},
+    }
+
+
+def estimate(paths, players=2000, model=None, config=None, max_workers=None, seed=0, fps=DEFAULT_FPS):
+    """차트별 추정 결과 목록 + 난이도별 평균"""
+    model = model or PlayerModel()
+    config = config or JudgementConfig()
+    tasks = []
+    for chart_index, path in enumerate(paths):
+        for batch, start in enumerate(range(0, players, BATCH_SIZE)):
+            size = min(BATCH_SIZE, players - start)
+            tasks.append((chart_index, str(path), size, model, config, [seed, chart_index, batch], fps))
+
+    batches = {i: [] for i in range(len(paths))}
+    workers = max_workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chart_index, data in pool.map(_worker, tasks, chunksize=max(1, len(tasks) // (workers * 4))):
+                batches[chart_index].append(data)
+    else:
+        for chart_index, data in map(_worker, tasks):
+            batches[chart_index].append(data)
+
+    charts = [summarize_chart(load_song(path), _chart(str(path)), batches[i]) for i, path in enumerate(paths)]
+    by_difficulty = {}
+    for chart in charts:
+        by_difficulty.setdefault(chart["difficulty"], []).append(chart)
+    difficulties = {
+        str(level): {
+            "charts": len(items),
+            "expected_accuracy": round(sum(c["expected_accuracy"] for c in items) / len(items), 2),
+            "full_combo_probability": round(sum(c["full_combo_probability"] for c in items) / len(items), 4),
+            "median_score": round(sum(c["score_percentiles"]["p50"] for c in items) / len(items)),
+        }
+        for level, items in sorted(by_difficulty.items())
+    }
+    return {"charts": charts, "difficulties": difficulties}
+
+
+def print_estimate(data):
+    for c in data["charts"]:
+        p = c["score_percentiles"]
+        print(f"🎵 {c['title']} (difficulty {c['difficulty']}, {c['notes']} notes, {c['notes_per_s']} notes/s)")
+        print(f"    accuracy {c['expected_accuracy']:.2f}% (p5 {c['accuracy_p5']:.2f}%), "
+              f"full combo {c['full_combo_probability'] * 100:.1f}%, "
+              f"score p5/p50/p95 {p['p5']}/{p['p50']}/{p['p95']}")
+        print("    ranks " + "  ".join(f"{name} {share * 100:.1f}%" for name, share in c["ranks"].items() if share))
+    if len(data["difficulties"]) > 1 or len(data["charts"]) > 1:
+        print("\n  Difficulty  charts  accuracy  full combo  median score")
+        for level, d in data["difficulties"].items():
+            print(f"  {level:>10}{d['charts']:>8}{d['expected_accuracy']:>9.2f}%{d['full_combo_probability'] * 100:>10.1f}%"
+                  f"{d['median_score']:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo accuracy/score estimate per chart")
+    parser.add_argument("assets", nargs="*", help="SongData .asset files (default: every chart in the project)")
+    parser.add_argument("--project", default="My project")
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fps", type=float, default=DEFAULT_FPS)
+    parser.add_argument("--bias-ms", type=float, default=0.0)
+    parser.add_argument("--bias-spread-ms", type=float, default=10.0)
+    parser.add_argument("--jitter-ms", type=float, default=35.0)
+    parser.add_argument("--jitter-spread", type=float, default=0.3)
+    parser.add_argument("--miss-prob", type=float, default=0.02)
+    for name in ("perfect", "great", "good", "bad"):
+        parser.add_argument(f"--{name}-ms", type=float, default=None, help=f"override {name}Window")
+    parser.add_argument("--output", help="write the estimate as JSON")
+    args = parser.parse_args()
+
+    if np is None:
+        print("❌ NumPy is required for the Monte Carlo estimator (pip install numpy)")
+        return 1
+
+    config = JudgementConfig.from_project(args.project)
+    windows = [getattr(args, f"{name}_ms") for name in ("perfect", "great", "good", "bad")]
+    if any(w is not None for w in windows):
+        config = JudgementConfig(*[w / 1000.0 if w is not None else current
+                                   for w, current in zip(windows, config.windows)],
+                                 config.base_score, config.max_combo_bonus, config.combo_for_max_bonus)
+    model = PlayerModel(args.bias_ms, args.bias_spread_ms, args.jitter_ms, args.jitter_spread, args.miss_prob)
+    paths = args.assets or [str(p) for p in find_song_assets(args.project)]
+
+    started = time.perf_counter()
+    data = estimate(paths, args.players, model, config, args.workers, args.seed, args.fps)
+    elapsed = time.perf_counter() - started
+    data.update({"players": args.players, "model": model.to_dict(), "judgement": config.to_dict(),
+                 "elapsed_s": round(elapsed, 2)})
+    print(f"🎲 {args.players} players x {len(paths)} charts, windows {config.to_dict()['windows_ms']} ms")
+    print_estimate(data)
+    print(f"\n⏱️  {args.players * len(paths)} plays in {elapsed:.2f}s")
+    if args.output:
+        Path(args.output).write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"💾 Estimate saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
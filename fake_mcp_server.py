@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Fake Unity MCP Server
+Unity Editor 없이 MCP 클라이언트를 테스트/벤치마크하기 위한 로컬 WebSocket 서버
+
+ws://localhost:8090/McpUnity 와 같은 {id, method, params} -> {id, result|error} 프로토콜을 쓰며
+load_scene / get_scene_info / get_game_object / execute_menu_item / recompile_scripts 를
+스크립트된 씬 트리로 응답한다. 지연, 응답 누락, 순서 뒤바뀜, 플레이 모드 진입 시
+4001 close + 도메인 리로드(재연결 거부)를 주입할 수 있다.
+
+    python fake_mcp_server.py --port 8090 --latency-ms 2 --jitter-ms 1 --reload-delay 1.5
+
+    async with FakeUnityMCPServer(port=0) as server:
+        client = UnityMCPClient(server.url)
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from http import HTTPStatus
+
+from unity_mcp_client import json_dumps, json_loads, websockets
+
+PLAY_MODE_CLOSE_CODE = 4001
+
+START_PLAY_MODE = "Tools/A.I. BEAT/Start Play Mode"
+STOP_PLAY_MODE = "Tools/A.I. BEAT/Stop Play Mode"
+
+
+def node(name, *children, active=True, components=("Transform",)):
+    return {
+        "name": name,
+        "activeSelf": active,
+        "components": list(components),
+        "children": list(children),
+    }
+
+
+def synthetic_tree(count, fanout=10, prefix="Obj"):
+    """count개 오브젝트로 된 fanout진 트리(숲)의 루트 오브젝트 목록 (너비 우선으로 채움)"""
+    nodes = [node(f"{prefix}{i}") for i in range(count)]
+    for i in range(fanout, count):
+        nodes[i // fanout - 1]["children"].append(nodes[i])
+    return nodes[:fanout]
+
+
+def default_scenes(gameplay_objects=0):
+    """스크립트에서 사용하는 세 씬의 기본 트리"""
+    ui = ("RectTransform", "Canvas", "CanvasScaler", "GraphicRaycaster")
+    gameplay = [
+        node("Main Camera", components=("Transform", "Camera", "AudioListener")),
+        node("GameManager", components=("Transform", "GameManager")),
+        node("AudioManager", components=("Transform", "AudioManager", "AudioSource")),
+        node("NoteSpawner", components=("Transform", "NoteSpawner")),
+        node("InputHandler", components=("Transform", "InputHandler")),
+        node("JudgementSystem", components=("Transform", "JudgementSystem")),
+        node("GameplayUI", components=("Transform", "GameplayUI")),
+        node("Canvas",
+             node("ScoreText"), node("ComboText"), node("JudgementText"),
+             components=ui),
+        node("EventSystem", components=("Transform", "EventSystem")),
+    ]
+    if gameplay_objects:
+        gameplay.append(node("Generated", *synthetic_tree(gameplay_objects)))
+    return {
+        "Assets/Scenes/MainMenu.unity": [
+            node("Main Camera", components=("Transform", "Camera")),
+            node("Canvas", node("Title"), node("PlayButton"), node("SettingsButton"), components=ui),
+            node("EventSystem"),
+        ],
+        "Assets/Scenes/SongSelect.unity": [
+            node("Main Camera", components=("Transform", "Camera")),
+            node("Canvas", node("SongList"), node("BackButton"), components=ui),
+            node("EventSystem"),
+        ],
+        "Assets/Scenes/Gameplay.unity": gameplay,
+    }
+
+
+def count_nodes(nodes):
+    return sum(1 + count_nodes(n["children"]) for n in nodes)
+
+
+class FakeUnityMCPServer:
+    def __init__(self, host="localhost", port=8090, path="/McpUnity", scenes=None,
+                 latency=0.0, jitter=0.0, drop_rate=0.0, reorder_window=0.0,
+                 reload_delay=1.0, inline_depth=0, seed=None):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.scenes = scenes if scenes is not None else default_scenes()
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.reorder_window = reorder_window
+        self.reload_delay = reload_delay
+        self.inline_depth = inline_depth
+        self.random = random.Random(seed)
+
+        self.active_scene = next(iter(self.scenes), "")
+        self.is_playing = False
+        self.reloading = False
+        self.requests = 0
+        self.dropped = 0
+        self.reloads = 0
+        self._server = None
+        self._connections = set()
+        self._tasks = set()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}{self.path}"
+
+    async def start(self):
+        self._server = await websockets.serve(
+            self._handle, self.host, self.port,
+            process_request=self._process_request,
+            max_size=None, ping_interval=None,
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _process_request(self, connection, request):
+        # 도메인 리로드 중에는 핸드셰이크 거부 (에디터가 아직 응답하지 않는 상태)
+        if self.reloading:
+            return connection.respond(HTTPStatus.SERVICE_UNAVAILABLE, "Domain reload in progress\n")
+        if request.path != self.path:
+            return connection.respond(HTTPStatus.NOT_FOUND, "Not Found\n")
+        return None
+
+    # ------------------------------------------------------------------
+    # 연결 처리
+    # ------------------------------------------------------------------
+    async def _handle(self, ws):
+        self._connections.add(ws)
+        try:
+            async for message in ws:
+                self.requests += 1
+                try:
+                    request = json_loads(message)
+                except ValueError:
+                    continue
+                if self.drop_rate and self.random.random() < self.drop_rate:
+                    self.dropped += 1
+                    continue
+                delay = self._delay()
+                if delay <= 0:
+                    await self._reply(ws, request)
+                else:
+                    self._spawn(self._reply(ws, request, delay))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._connections.discard(ws)
+
+    def _delay(self):
+        delay = self.latency
+        if self.jitter:
+            delay += self.random.uniform(0, self.jitter)
+        if self.reorder_window:
+            delay += self.random.uniform(0, self.reorder_window)
+        return delay
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _reply(self, ws, request, delay=0.0):
+        if delay > 0:
+            await asyncio.sleep(delay)
+        request_id = request.get("id")
+        method = request.get("method")
+        handler = self.METHODS.get(method)
+        if handler is None:
+            response = {"id": request_id, "error": {
+                "type": "unknown_method", "message": f"Unknown method: {method}"}}
+        else:
+            try:
+                response = {"id": request_id, "result": handler(self, request.get("params") or {})}
+            except LookupError as e:
+                response = {"id": request_id, "error": {"type": "not_found", "message": str(e)}}
+        reload_reason = response.get("result", {}).pop("_reload", None)
+        try:
+            await ws.send(json_dumps(response))
+        except websockets.ConnectionClosed:
+            pass
+        if reload_reason:
+            self._spawn(self._domain_reload(reload_reason))
+
+    async def _domain_reload(self, reason):
+        """플레이 모드 전환/재컴파일: 모든 연결을 4001로 끊고 reload_delay 동안 재연결 거부"""
+        self.reloads += 1
+        self.reloading = True
+        for ws in list(self._connections):
+            await ws.close(PLAY_MODE_CLOSE_CODE, reason)
+        await asyncio.sleep(self.reload_delay)
+        self.reloading = False
+
+    # ------------------------------------------------------------------
+    # 메서드 구현
+    # ------------------------------------------------------------------
+    def _roots(self):
+        return self.scenes.get(self.active_scene, [])
+
+    def _find(self, path):
+        if path in ("", "/"):
+            return {"name": "", "children": self._roots()}
+        current = self._roots()
+        found = None
+        for part in path.strip("/").split("/"):
+            found = next((n for n in current if n["name"] == part), None)
+            if found is None:
+                raise LookupError(f"GameObject not found: {path}")
+            current = found["children"]
+        return found
+
+    def _describe(self, obj, depth):
+        data = {k: v for k, v in obj.items() if k != "children"}
+        if depth > 0:
+            data["children"] = [self._describe(c, depth - 1) for c in obj["children"]]
+        else:
+            data["children"] = [{"name": c["name"], "activeSelf": c["activeSelf"]} for c in obj["children"]]
+        return data
+
+    def load_scene(self, params):
+        scene_path = params.get("scenePath", "")
+        if scene_path not in self.scenes:
+            raise LookupError(f"Scene not found: {scene_path}")
+        self.active_scene = scene_path
+        return {"success": True, "message": f"Loaded scene {scene_path}"}
+
+    def get_scene_info(self, params):
+        name = self.active_scene.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+        return {"activeScene": {
+            "name": name,
+            "path": self.active_scene,
+            "rootCount": len(self._roots()),
+            "isDirty": False,
+            "isLoaded": True,
+        }}
+
+    def get_game_object(self, params):
+        return self._describe(self._find(params.get("objectPath", "/")), self.inline_depth)
+
+    def execute_menu_item(self, params):
+        menu_path = params.get("menuPath", "")
+        result = {"success": True, "message": f"Executed {menu_path}"}
+        if menu_path == START_PLAY_MODE and not self.is_playing:
+            self.is_playing = True
+            result["_reload"] = "Play mode"
+        elif menu_path == STOP_PLAY_MODE and self.is_playing:
+            self.is_playing = False
+            result["_reload"] = "Edit mode"
+        return result
+
+    def recompile_scripts(self, params):
+        return {"success": True, "message": "Recompilation started", "_reload": "Recompile"}
+
+    METHODS = {
+        "load_scene": load_scene,
+        "get_scene_info": get_scene_info,
+        "get_game_object": get_game_object,
+        "execute_menu_item": execute_menu_item,
+        "recompile_scripts": recompile_scripts,
+    }
+
+
+def load_scenes_file(path):
+    """{scenePath: [root nodes]} 형태 JSON 파일 로드"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def serve_forever(args):
+    scenes = load_scenes_file(args.scenes) if args.scenes else default_scenes(args.objects)
+    server = FakeUnityMCPServer(
+        host=args.host, port=args.port, scenes=scenes,
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        drop_rate=args.drop_rate, reorder_window=args.reorder_ms / 1000,
+        reload_delay=args.reload_delay, inline_depth=args.inline_depth, seed=args.seed,
+    )
+    await server.start()
+    total = sum(count_nodes(roots) for roots in scenes.values())
+    print(f"Fake Unity MCP server listening on {server.url} ({len(scenes)} scenes, {total} objects)")
+    try:
+        await asyncio.Future()
+    finally:
+        await server.stop()
+        print(f"Served {server.requests} requests ({server.dropped} dropped, {server.reloads} reloads)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Unity MCP WebSocket server")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--scenes", help="JSON file: {scenePath: [root nodes]}")
+    parser.add_argument("--objects", type=int, default=0, help="extra generated objects in Gameplay")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--reorder-ms", type=float, default=0.0, help="random extra delay window (out-of-order replies)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="probability of never answering a request")
+    parser.add_argument("--reload-delay", type=float, default=1.0, help="seconds the editor refuses connections after 4001")
+    parser.add_argument("--inline-depth", type=int, default=0, help="child levels embedded in get_game_object")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Fake Unity Editor (batchmode -runTests)
+Unity가 설치되지 않은 환경에서 샤딩/결과 파싱/로그 감시를 시험하기 위한 가짜 실행 파일
+
+Unity와 같은 명령줄을 받아 -projectPath 의 AIBeatEditorTests.cs 에서 테스트 목록을 읽고,
+-testFilter 정규식에 맞는 테스트의 NUnit3 TestResults.xml 과 Editor 로그를 만든다.
+동작은 환경 변수로 조절한다.
+
+    FAKE_UNITY_TEST_MS        테스트 하나당 걸리는 시간 (기본 5)
+    FAKE_UNITY_STARTUP_MS     에디터 시작 시간 (기본 200)
+    FAKE_UNITY_IMPORT_MS      Library가 없을 때 에셋 임포트 시간 (기본 1000, Library 생성)
+    FAKE_UNITY_FAIL           실패시킬 테스트 이름 정규식
+    FAKE_UNITY_COMPILE_ERROR  설정하면 컴파일 오류를 로그에 쓰고 결과 없이 멈춤 (타임아웃 재현)
+    FAKE_UNITY_LOG_LINES      시작 단계에서 추가로 쓰는 로그 줄 수 (큰 로그 재현)
+
+    python fake_unity.py -projectPath "My project" -batchmode -runTests -testPlatform EditMode \\
+        -testResults /tmp/TestResults.xml -logFile /tmp/test_log.txt -testFilter "^.*NoteData_"
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+from csharp_index import parse_file
+
+EDITOR_TESTS = "Assets/Scripts/Editor/AIBeatEditorTests.cs"
+ASSEMBLY = "Assembly-CSharp-Editor.dll"
+
+
+def _env_ms(name, default):
+    return float(os.environ.get(name, default)) / 1000.0
+
+
+def _timestamp(t):
+    return datetime.fromtimestamp(t, timezone.utc).strftime("%Y-%m-%d %H:%M:%SZ")
+
+
+def discover_tests(project_path):
+    """[(fixture 전체 이름, 메서드 이름)]"""
+    path = Path(project_path) / EDITOR_TESTS
+    if not path.exists():
+        return []
+    symbols = parse_file(path)
+    tests = []
+    for t in symbols["types"]:
+        fixture = f"{t['namespace']}.{t['qualified']}" if t["namespace"] else t["qualified"]
+        for m in t["methods"]:
+            if {"Test", "TestCase", "UnityTest"} & set(m["attributes"]):
+                tests.append((fixture, m["name"]))
+    return tests
+
+
+def import_library(project, log):
+    """Library가 없으면 임포트 시간만큼 기다리고 ArtifactDB/ScriptAssemblies를 만듦"""
+    library = project / "Library"
+    if (library / "ArtifactDB").exists():
+        print("Library is up to date, skipping asset import", file=log)
+        return
+    print("Library folder is missing or stale, importing all assets", file=log)
+    time.sleep(_env_ms("FAKE_UNITY_IMPORT_MS", 1000))
+    (library / "ScriptAssemblies").mkdir(parents=True, exist_ok=True)
+    (library / "ArtifactDB").write_bytes(os.urandom(64 * 1024))
+    (library / "ScriptAssemblies" / "Assembly-CSharp.dll").write_bytes(b"MZ" + os.urandom(32 * 1024))
+    print("Asset import completed", file=log)
+
+
+def write_results(path, fixture_cases, start, end):
+    """NUnit3 형식 (Unity Test Framework가 쓰는 구조와 같은 중첩)"""
+    total = sum(len(cases) for cases in fixture_cases.values())
+    failed = sum(1 for cases in fixture_cases.values() for c in cases if c["result"] == "Failed")
+    result = "Failed" if failed else "Passed"
+    counts = f'total="{total}" passed="{total - failed}" failed="{failed}" inconclusive="0" skipped="0" asserts="0"'
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        f'<test-run id="2" testcasecount="{total}" result="{result}" {counts} engine-version="3.5.0.0" '
+        f'clr-version="4.0.30319.42000" start-time="{_timestamp(start)}" end-time="{_timestamp(end)}" '
+        f'duration="{end - start:.6f}">',
+        f'  <test-suite type="Assembly" id="1000" name="{ASSEMBLY}" fullname="{ASSEMBLY}" runstate="Runnable" '
+        f'testcasecount="{total}" result="{result}" {counts} duration="{end - start:.6f}">',
+    ]
+    case_id = 1001
+    for fixture, cases in fixture_cases.items():
+        fixture_failed = sum(1 for c in cases if c["result"] == "Failed")
+        lines.append(
+            f'    <test-suite type="TestFixture" id="{case_id}" name={quoteattr(fixture.rpartition(".")[2])} '
+            f'fullname={quoteattr(fixture)} classname={quoteattr(fixture)} runstate="Runnable" '
+            f'testcasecount="{len(cases)}" result="{"Failed" if fixture_failed else "Passed"}" '
+            f'total="{len(cases)}" passed="{len(cases) - fixture_failed}" failed="{fixture_failed}" '
+            f'inconclusive="0" skipped="0" asserts="0" duration="{sum(c["duration"] for c in cases):.6f}">')
+        case_id += 1
+        for case in cases:
+            lines.append(
+                f'      <test-case id="{case_id}" name={quoteattr(case["name"])} '
+                f'fullname={quoteattr(fixture + "." + case["name"])} methodname={quoteattr(case["name"])} '
+                f'classname={quoteattr(fixture)} runstate="Runnable" seed="12345" result="{case["result"]}" '
+                f'start-time="{_timestamp(case["start"])}" end-time="{_timestamp(case["start"] + case["duration"])}" '
+                f'duration="{case["duration"]:.6f}" asserts="0">')
+            if case["result"] == "Failed":
+                lines += [
+                    "        <failure>",
+                    f"          <message><![CDATA[{case['message']}]]></message>",
+                    f"          <stack-trace><![CDATA[at {escape(fixture)}.{case['name']} () [0x00000] in "
+                    f"{EDITOR_TESTS}:0]]></stack-trace>",
+                    "        </failure>",
+                ]
+            lines.append("      </test-case>")
+            case_id += 1
+        lines.append("    </test-suite>")
+    lines += ["  </test-suite>", "</test-run>", ""]
+    tmp = Path(str(path) + ".tmp")
+    tmp.write_text("\n".join(lines), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Unity batchmode test runner", allow_abbrev=False)
+    parser.add_argument("-projectPath", required=True)
+    parser.add_argument("-testResults", default="TestResults.xml")
+    parser.add_argument("-logFile", default=None)
+    parser.add_argument("-testFilter", default=None)
+    parser.add_argument("-testPlatform", default="EditMode")
+    args, _ = parser.parse_known_args()
+
+    project = Path(args.projectPath)
+    results_path = Path(args.testResults)
+    if not results_path.is_absolute():
+        results_path = project / results_path
+    log = open(args.logFile, "w", encoding="utf-8", buffering=1) if args.logFile else sys.stdout
+
+    start = time.time()
+    print(f"[Licensing::Module] Fake Unity for project {project}", file=log)
+    for i in range(int(os.environ.get("FAKE_UNITY_LOG_LINES", "0"))):
+        print(f"Refreshing native plugins compatible for Editor in {i % 97}.{i % 1000:03d} ms", file=log)
+    time.sleep(_env_ms("FAKE_UNITY_STARTUP_MS", 200))
+    import_library(project, log)
+
+    if os.environ.get("FAKE_UNITY_COMPILE_ERROR"):
+        print("Assets/Scripts/Gameplay/Note.cs(42,17): error CS1002: ; expected", file=log)
+        print("Scripts have compiler errors.", file=log)
+        # 실제 Unity처럼 결과 없이 오래 멈춰 있음
+        time.sleep(3600)
+        return 1
+
+    tests = discover_tests(project)
+    if args.testFilter:
+        pattern = re.compile(args.testFilter)
+        tests = [(f, m) for f, m in tests if pattern.search(f"{f}.{m}")]
+    fail = re.compile(os.environ["FAKE_UNITY_FAIL"]) if os.environ.get("FAKE_UNITY_FAIL") else None
+    per_test = _env_ms("FAKE_UNITY_TEST_MS", 5)
+
+    print(f"Running {len(tests)} {args.testPlatform} tests", file=log)
+    fixture_cases = {}
+    for i, (fixture, name) in enumerate(tests):
+        case_start = time.time()
+        # 이름 길이로 테스트마다 다른 (결정적인) 시간
+        time.sleep(per_test * (1 + len(name) % 5) / 3)
+        failed = bool(fail and fail.search(name))
+        fixture_cases.setdefault(fixture, []).append({
+            "name": name,
+            "result": "Failed" if failed else "Passed",
+            "start": case_start,
+            "duration": time.time() - case_start,
+            "message": f"Expected: True\n  But was:  False ({name})",
+        })
+        print(f"[{i + 1}/{len(tests)}] {fixture}.{name} {'Failed' if failed else 'Passed'}", file=log)
+
+    end = time.time()
+    write_results(results_path, fixture_cases, start, end)
+    print(f"Saving results to: {results_path}", file=log)
+    print("Exiting batchmode successfully now!", file=log)
+    if log is not sys.stdout:
+        log.close()
+    # Unity는 실패한 테스트가 있으면 종료 코드 2
+    return 2 if any(c["result"] == "Failed" for cases in fixture_cases.values() for c in cases) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
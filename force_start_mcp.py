@@ -4,39 +4,15 @@ Unity MCP Server 강제 시작 테스트
 Unity Editor가 실행 중일 때 MCP 서버를 시작하는 다양한 방법 테스트
 """
 
-import urllib.request
-import json
-import socket
-import time
+import asyncio
 import subprocess
 import sys
 
-def check_port(port=8090):
-    """포트 상태 확인"""
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    result = sock.connect_ex(('localhost', port))
-    sock.close()
-    return result == 0
+from mcp_discovery import DEFAULT_PORTS, best_endpoint, print_scan, save_cache, scan
 
-def test_mcp_endpoint():
-    """MCP 엔드포인트 테스트"""
-    endpoints = [
-        "http://localhost:8090/",
-        "http://localhost:8090/mcp",
-        "http://localhost:8090/status",
-        "http://127.0.0.1:8090/",
-    ]
-    
-    results = []
-    for url in endpoints:
-        try:
-            req = urllib.request.Request(url, timeout=2)
-            response = urllib.request.urlopen(req)
-            results.append((url, True, response.status))
-        except Exception as e:
-            results.append((url, False, str(e)))
-    
-    return results
+def discover_mcp():
+    """모든 후보 포트/경로를 병렬로 한 번 탐색 (결과는 이후 단계에서 재사용)"""
+    return asyncio.run(scan())
 
 def main():
     print("=" * 60)
@@ -44,22 +20,24 @@ def main():
     print("=" * 60)
     print()
     
+    found = discover_mcp()
+    endpoint = best_endpoint(found["results"])
+
     # 1. 현재 포트 상태 확인
-    print("[1] 포트 8090 상태 확인")
-    if check_port(8090):
-        print("    ✅ 포트 8090 OPEN - MCP 서버가 이미 실행 중!")
-    else:
-        print("    ❌ 포트 8090 CLOSED - MCP 서버 미실행")
+    print(f"[1] 포트 {', '.join(map(str, DEFAULT_PORTS))} 상태 확인")
+    for port in DEFAULT_PORTS:
+        if port in found["open_ports"]:
+            print(f"    ✅ 포트 {port} OPEN - MCP 서버가 이미 실행 중!")
+        else:
+            print(f"    ❌ 포트 {port} CLOSED - MCP 서버 미실행")
     print()
     
     # 2. MCP 엔드포인트 테스트
     print("[2] MCP 엔드포인트 테스트")
-    results = test_mcp_endpoint()
-    for url, success, info in results:
-        status = "✅" if success else "❌"
-        print(f"    {status} {url}")
-        if not success:
-            print(f"       에러: {info[:50]}")
+    if found["results"]:
+        print_scan({"closed_ports": [], "results": found["results"]})
+    else:
+        print("    열린 포트가 없어 엔드포인트 탐색 생략")
     print()
     
     # 3. Unity 프로세스 확인
@@ -81,8 +59,11 @@ def main():
     # 4. 결론
     print("=" * 60)
     print("결론:")
-    if check_port(8090):
-        print("✅ MCP 서버가 실행 중입니다!")
+    if endpoint is not None:
+        save_cache(endpoint)
+        print(f"✅ MCP 서버가 실행 중입니다! ({endpoint['url']})")
+    elif found["open_ports"]:
+        print(f"⚠️ 포트 {found['open_ports']}는 열려 있지만 MCP WebSocket 엔드포인트를 찾지 못했습니다.")
     else:
         print("❌ MCP 서버가 실행되지 않았습니다.")
         print()
@@ -0,0 +1,363 @@
+"""
+Judgement Engine (JudgementSystem.cs mirror)
+JudgementSystem.Judge / CalculateScore / CalculateAccuracy / CalculateRank 를 파이썬으로 옮긴 판정기
+
+- C#과 같은 결과를 내도록 float 연산은 모두 float32 (Unity의 float)로 계산
+  · adjusted = noteTime + userOffset, rawDiff = inputTime - adjusted, |rawDiff| <= window (경계 포함)
+  · 점수 = Mathf.RoundToInt(base * multiplier * (1 + min(1, combo / comboForMaxBonus) * maxComboBonus))
+    (RoundToInt는 짝수 반올림, 콤보는 이번 판정을 반영한 뒤의 값)
+- NumPy가 있으면 배열 단위로 판정 (마지막 축이 노트 순서, 앞쪽 축은 여러 플레이를 한 번에)
+  없으면 같은 규칙의 스칼라 구현으로 처리
+- 입력 시간이 NaN이면 노트를 놓친 것 (RegisterMiss: Miss, rawDiff 0)
+
+    config = JudgementConfig.from_project("My project")
+    run = judge_run(input_times, note_times, offset=0.0, config=config)
+    print(run["result"]["Score"], run["result"]["Accuracy"])
+
+    python judgement.py --bench 5000000
+"""
+
+import argparse
+import math
+import re
+import struct
+import sys
+import time
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+JUDGEMENT_SOURCE = "Assets/Scripts/Gameplay/JudgementSystem.cs"
+
+# JudgementResult enum 순서
+PERFECT, GREAT, GOOD, BAD, MISS = range(5)
+# 판정이 일어나지 않은 자리 (배열 판정에서 콤보/점수/개수에 영향 없음)
+SKIP = 255
+RESULT_NAMES = ("Perfect", "Great", "Good", "Bad", "Miss")
+# CalculateScore / CalculateAccuracy 의 상수
+SCORE_MULTIPLIERS = (1.0, 0.8, 0.5, 0.2, 0.0)
+ACCURACY_WEIGHTS = (100.0, 80.0, 50.0, 20.0)
+
+_FIELD_RE = re.compile(r"\b(?:float|int)\s+(\w+)\s*=\s*(-?\d+(?:\.\d*)?)f?\s*;")
+
+
+def f32(value):
+    """float32로 반올림 (C# float 한 번의 연산 결과와 같음)"""
+    return struct.unpack("f", struct.pack("f", value))[0]
+
+
+class JudgementConfig:
+    """JudgementSystem 의 SerializeField 기본값"""
+
+    FIELDS = ("perfectWindow", "greatWindow", "goodWindow", "badWindow",
+              "baseScorePerNote", "maxComboBonus", "comboForMaxBonus")
+
+    def __init__(self, perfectWindow=0.050, greatWindow=0.100, goodWindow=0.200, badWindow=0.350,
+                 baseScorePerNote=1000, maxComboBonus=0.5, comboForMaxBonus=100):
+        self.windows = tuple(f32(w) for w in (perfectWindow, greatWindow, goodWindow, badWindow))
+        self.base_score = int(baseScorePerNote)
+        self.max_combo_bonus = f32(maxComboBonus)
+        self.combo_for_max_bonus = int(comboForMaxBonus)
+
+    @classmethod
+    def from_source(cls, text):
+        values = {}
+        for name, value in _FIELD_RE.findall(text):
+            if name in cls.FIELDS:
+                values[name] = float(value)
+        return cls(**values)
+
+    @classmethod
+    def from_project(cls, project_path="My project"):
+        """JudgementSystem.cs 의 필드 초기값을 읽음 (파일이 없으면 기본값)"""
+        try:
+            text = (Path(project_path) / JUDGEMENT_SOURCE).read_text(encoding="utf-8")
+        except OSError:
+            return cls()
+        return cls.from_source(text)
+
+    def to_dict(self):
+        return {
+            "windows_ms": [round(w * 1000, 3) for w in self.windows],
+            "base_score": self.base_score,
+            "max_combo_bonus": self.max_combo_bonus,
+            "combo_for_max_bonus": self.combo_for_max_bonus,
+        }
+
+
+DEFAULT_CONFIG = JudgementConfig()
+
+
+# ----------------------------------------------------------------------
+# 스칼라 구현 (C# 코드와 한 줄씩 대응)
+# ----------------------------------------------------------------------
+def judge_one(input_time, note_time, offset=0.0, config=DEFAULT_CONFIG):
+    """(결과 코드, rawDiff). rawDiff 양수=late, 음수=early"""
+    if input_time is None or math.isnan(input_time):
+        return MISS, 0.0
+    adjusted = f32(f32(note_time) + f32(offset))
+    raw_diff = f32(f32(input_time) - adjusted)
+    diff = abs(raw_diff)
+    for code, window in enumerate(config.windows):
+        if diff <= window:
+            return code, raw_diff
+    return MISS, raw_diff
+
+
+def score_one(code, combo, config=DEFAULT_CONFIG):
+    """CalculateScore (combo는 이번 판정을 반영한 뒤의 콤보)"""
+    multiplier = f32(SCORE_MULTIPLIERS[code])
+    ratio = min(1.0, f32(combo / config.combo_for_max_bonus)) if config.combo_for_max_bonus > 0 else 0.0
+    bonus = f32(1.0 + f32(ratio * config.max_combo_bonus))
+    # Mathf.RoundToInt = Math.Round (짝수 반올림) == 파이썬 round
+    return round(f32(f32(config.base_score * multiplier) * bonus))
+
+
+def accuracy_from_counts(counts):
+    """CalculateAccuracy (counts: Perfect..Miss 개수)"""
+    total = sum(counts)
+    if total == 0:
+        return 100.0
+    weighted = 0.0
+    for count, weight in zip(counts, ACCURACY_WEIGHTS):
+        weighted = f32(weighted + f32(f32(count) * weight))
+    return f32(weighted / f32(total))
+
+
+def rank(accuracy, miss_count):
+    """CalculateRank"""
+    if accuracy >= 98 and miss_count == 0:
+        return "S+"
+    for threshold, name in ((95, "S"), (90, "A"), (80, "B"), (70, "C")):
+        if accuracy >= threshold:
+            return name
+    return "D"
+
+
+def game_result(counts, base_score, max_combo, total_notes, bonus_score=0):
+    """JudgementSystem.GetResult() 와 같은 GameResult 필드"""
+    accuracy = accuracy_from_counts(counts)
+    return {
+        "Score": base_score + bonus_score,
+        "BaseScore": base_score,
+        "BonusScore": bonus_score,
+        "MaxCombo": max_combo,
+        "Accuracy": accuracy,
+        "PerfectCount": counts[PERFECT],
+        "GreatCount": counts[GREAT],
+        "GoodCount": counts[GOOD],
+        "BadCount": counts[BAD],
+        "MissCount": counts[MISS],
+        "TotalNotes": total_notes,
+        "Rank": rank(accuracy, counts[MISS]),
+    }
+
+
+class JudgementSystem:
+    """JudgementSystem 컴포넌트 상태 (Judge/RegisterMiss/AddBonusScore/GetResult를 호출 순서대로)"""
+
+    def __init__(self, note_count, offset=0.0, config=DEFAULT_CONFIG):
+        self.total_notes = note_count
+        self.offset = offset
+        self.config = config
+        self.counts = [0] * 5
+        self.score = 0
+        self.bonus_score = 0
+        self.combo = 0
+        self.max_combo = 0
+
+    def _apply(self, code):
+        self.counts[code] += 1
+        if code <= GOOD:
+            self.combo += 1
+            self.max_combo = max(self.max_combo, self.combo)
+        else:
+            self.combo = 0
+
+    def judge(self, input_time, note_time):
+        code, raw_diff = judge_one(input_time, note_time, self.offset, self.config)
+        self._apply(code)
+        self.score += score_one(code, self.combo, self.config)
+        return code, raw_diff
+
+    def register_miss(self):
+        self._apply(MISS)
+
+    def add_bonus_score(self, amount):
+        self.bonus_score += amount
+
+    def get_result(self):
+        return game_result(self.counts, self.score, self.max_combo, self.total_notes, self.bonus_score)
+
+
+def _judge_run_scalar(input_times, note_times, offset, config):
+    codes, diffs, combos, scores = [], [], [], []
+    combo = max_combo = 0
+    for input_time, note_time in zip(input_times, note_times):
+        code, diff = judge_one(input_time, note_time, offset, config)
+        combo = combo + 1 if code <= GOOD else 0
+        max_combo = max(max_combo, combo)
+        codes.append(code)
+        diffs.append(diff)
+        combos.append(combo)
+        scores.append(score_one(code, combo, config))
+    counts = [codes.count(code) for code in range(5)]
+    return {
+        "codes": codes,
+        "diffs": diffs,
+        "combos": combos,
+        "scores": scores,
+        "result": game_result(counts, sum(scores), max_combo, len(codes)),
+    }
+
+
+# ----------------------------------------------------------------------
+# 벡터 구현 (NumPy)
+# ----------------------------------------------------------------------
+def judge(input_times, note_times, offset=0.0, config=DEFAULT_CONFIG):
+    """배열 판정. 반환: (결과 코드 uint8 배열, rawDiff float32 배열)"""
+    inputs = np.asarray(input_times, dtype=np.float32)
+    adjusted = np.asarray(note_times, dtype=np.float32) + np.float32(offset)
+    raw_diff = inputs - adjusted
+    missed = np.isnan(raw_diff)
+    diff = np.abs(raw_diff)
+    # 창을 넘는 개수 = 결과 코드 (경계 포함 비교이므로 diff > window)
+    codes = np.zeros(diff.shape, dtype=np.uint8)
+    for window in config.windows:
+        codes += diff > np.float32(window)
+    codes[missed] = MISS
+    raw_diff[missed] = 0.0
+    return codes, raw_diff
+
+
+def combos(codes):
+    """판정마다 갱신된 콤보 (Perfect~Good은 +1, Bad/Miss는 0으로, SKIP은 그대로). 마지막 축 기준"""
+    codes = np.asarray(codes)
+    hits = np.cumsum(codes <= GOOD, axis=-1, dtype=np.int32)
+    # 마지막 Bad/Miss 시점까지의 히트 수 (hits는 단조 증가이므로 누적 최대값)
+    broken = np.where((codes == BAD) | (codes == MISS), hits, np.int32(0))
+    np.maximum.accumulate(broken, axis=-1, out=broken)
+    return hits - broken
+
+
+def scores(codes, combo, config=DEFAULT_CONFIG):
+    """CalculateScore 벡터판 (노트마다 얻은 점수, int32)"""
+    multipliers = np.zeros(SKIP + 1, dtype=np.float32)
+    multipliers[:5] = SCORE_MULTIPLIERS
+    if config.combo_for_max_bonus > 0:
+        ratio = np.minimum(np.float32(1.0), combo.astype(np.float32) / np.float32(config.combo_for_max_bonus))
+    else:
+        ratio = np.zeros(combo.shape, dtype=np.float32)
+    bonus = np.float32(1.0) + ratio * np.float32(config.max_combo_bonus)
+    raw = (np.float32(config.base_score) * multipliers[codes]) * bonus
+    return np.rint(raw).astype(np.int32)
+
+
+def counts(codes):
+    """결과별 개수 (마지막 축 기준, shape (..., 5))"""
+    codes = np.asarray(codes)
+    return np.stack([(codes == code).sum(axis=-1) for code in range(5)], axis=-1)
+
+
+def accuracy(result_counts):
+    """CalculateAccuracy 벡터판 (float32, 같은 순서로 더함)"""
+    result_counts = np.asarray(result_counts)
+    weighted = np.zeros(result_counts.shape[:-1], dtype=np.float32)
+    for code, weight in enumerate(ACCURACY_WEIGHTS):
+        weighted = weighted + result_counts[..., code].astype(np.float32) * np.float32(weight)
+    total = result_counts.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        acc = weighted / total.astype(np.float32)
+    return np.where(total == 0, np.float32(100.0), acc).astype(np.float32)
+
+
+def judge_run(input_times, note_times, offset=0.0, config=DEFAULT_CONFIG):
+    """
+    한 번(또는 여러 번)의 플레이를 처음부터 끝까지 판정
+    반환: codes, diffs, combos, scores 배열 + result (GameResult 필드, 2차원이면 플레이별 배열)
+    """
+    if np is None:
+        return _judge_run_scalar(input_times, note_times, offset, config)
+    codes, diffs = judge(input_times, note_times, offset, config)
+    combo = combos(codes)
+    gained = scores(codes, combo, config)
+    result_counts = counts(codes)
+    base = gained.sum(axis=-1, dtype=np.int64)
+    max_combo = combo.max(axis=-1, initial=0)
+    if codes.ndim == 1:
+        result = game_result([int(c) for c in result_counts], int(base), int(max_combo), codes.shape[-1])
+    else:
+        acc = accuracy(result_counts)
+        result = {
+            "Score": base,
+            "BaseScore": base,
+            "MaxCombo": max_combo,
+            "Accuracy": acc,
+            "Counts": result_counts,
+            "TotalNotes": codes.shape[-1],
+        }
+    return {"codes": codes, "diffs": diffs, "combos": combo, "scores": gained, "result": result}
+
+
+# ----------------------------------------------------------------------
+# CLI: 스칼라 구현과 비교 + 처리량 측정
+# ----------------------------------------------------------------------
+def verify(samples=20000, seed=7, config=DEFAULT_CONFIG):
+    """무작위 입력(경계 근처 포함)에서 벡터판과 스칼라판이 같은지 확인. 불일치 개수 반환"""
+    rng = np.random.default_rng(seed)
+    notes = np.sort(rng.uniform(0, 180, samples)).astype(np.float32)
+    errors = rng.normal(0, 0.15, samples)
+    # 판정 창 경계에 정확히 걸친 입력
+    edges = np.array([w * s for w in config.windows for s in (-1, 1)])
+    errors[: samples // 10] = rng.choice(edges, samples // 10)
+    inputs = (notes + errors).astype(np.float32)
+    inputs[rng.random(samples) < 0.02] = np.nan
+    offset = 0.013
+    vector = judge_run(inputs, notes, offset, config)
+    scalar = _judge_run_scalar([float(x) for x in inputs], [float(x) for x in notes], offset, config)
+    mismatches = int((vector["codes"] != np.array(scalar["codes"])).sum()
+                     + (vector["scores"] != np.array(scalar["scores"])).sum()
+                     + (vector["combos"] != np.array(scalar["combos"])).sum())
+    if vector["result"] != scalar["result"]:
+        mismatches += 1
+    return mismatches
+
+
+def benchmark(hits, players=100, config=DEFAULT_CONFIG):
+    rng = np.random.default_rng(1)
+    per_player = max(1, hits // players)
+    notes = np.sort(rng.uniform(0, 180, per_player)).astype(np.float32)
+    inputs = (notes + rng.normal(0, 0.06, (players, per_player))).astype(np.float32)
+    started = time.perf_counter()
+    run = judge_run(inputs, notes, 0.0, config)
+    elapsed = time.perf_counter() - started
+    return {"hits": players * per_player, "elapsed_s": round(elapsed, 3),
+            "hits_per_s": round(players * per_player / elapsed), "mean_accuracy": float(run["result"]["Accuracy"].mean())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch judge that mirrors JudgementSystem.cs")
+    parser.add_argument("--project", default="My project")
+    parser.add_argument("--bench", type=int, default=0, metavar="HITS", help="measure throughput on HITS judgements")
+    parser.add_argument("--verify", type=int, default=20000, metavar="N", help="compare vector and scalar judges")
+    args = parser.parse_args()
+
+    config = JudgementConfig.from_project(args.project)
+    print(f"⚖️  Judgement windows: {config.to_dict()['windows_ms']} ms, base {config.base_score}, "
+          f"combo bonus {config.max_combo_bonus} at {config.combo_for_max_bonus}")
+    if np is None:
+        print("⚠️  NumPy not installed: using the scalar judge only")
+        return 0
+    mismatches = verify(args.verify, config=config)
+    print(f"  {'✅' if not mismatches else '❌'} vector vs scalar: {mismatches} mismatches in {args.verify} notes")
+    if args.bench:
+        data = benchmark(args.bench, config=config)
+        print(f"  ⏱️  {data['hits']} hits in {data['elapsed_s']}s ({data['hits_per_s']:,} hits/s)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+"""
+Unity Library Cache (warm start)
+"My project/Library" 를 내용 주소(content-addressed) 저장소에 스냅샷으로 보관하고,
+batchmode 실행 전에 복원해 에셋 임포트/도메인 로드를 처음부터 하지 않게 함
+
+- 키: Packages/manifest.json, packages-lock.json, ProjectSettings 전체, Unity 버전, OS
+- 저장소: .test_cache/library_store/objects/<sha1 앞 2자리>/<sha1> (스냅샷끼리 같은 파일 공유)
+          .test_cache/library_store/snapshots/<key>.json (파일 목록 + 처음(콜드) 실행 시간)
+- 복원은 복사 (Unity가 ArtifactDB 등을 제자리에서 고치므로 하드 링크하면 저장소가 깨짐)
+- Library에 .library_cache.json 표식을 남겨 어떤 키로 복원했는지 기록.
+  표식이 없는 Library(에디터에서 쓰던 것)는 덮어쓰지 않는다.
+
+    cache = LibraryCache("My project")
+    info = cache.restore()                 # 실행 전
+    ... batchmode ...
+    cache.after_run(info, run_s=elapsed)   # 콜드였다면 스냅샷, 웜이면 절약 시간 계산
+
+    python library_cache.py status
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from project_index import DEFAULT_CACHE_DIR, get_index
+
+STORE_VERSION = 1
+DEFAULT_STORE = DEFAULT_CACHE_DIR / "library_store"
+MARKER = ".library_cache.json"
+MAX_SNAPSHOTS = 3
+COPY_WORKERS = 8
+# 에디터가 켜져 있을 때만 의미 있는 잠금 파일 등
+SKIP_SUFFIXES = ("-lock", ".lock")
+
+
+def _file_sha1(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def unity_version(project_path, unity_path=None):
+    """ProjectVersion.txt의 에디터 버전 (실행 파일 경로에 버전이 있으면 그것을 우선)"""
+    if unity_path:
+        match = re.search(r"(\d{4}\.\d+\.\d+[abfp]\d+)", str(unity_path))
+        if match:
+            return match.group(1)
+    try:
+        text = (Path(project_path) / "ProjectSettings" / "ProjectVersion.txt").read_text(encoding="utf-8")
+    except OSError:
+        return "unknown"
+    match = re.search(r"m_EditorVersionWithRevision:\s*(.+)", text) or re.search(r"m_EditorVersion:\s*(.+)", text)
+    return match.group(1).strip() if match else "unknown"
+
+
+def _walk(root):
+    """root 아래 파일: {상대 경로: stat}"""
+    found = {}
+    stack = [("", Path(root))]
+    while stack:
+        rel_dir, path = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((rel, entry.path))
+                elif rel != MARKER and not entry.name.endswith(SKIP_SUFFIXES):
+                    found[rel] = entry.stat(follow_symlinks=False)
+    return found
+
+
+class LibraryCache:
+    def __init__(self, project_path="My project", unity_path=None, store=DEFAULT_STORE):
+        self.project_path = Path(project_path)
+        self.unity_path = unity_path
+        self.store = Path(store)
+        self.index = get_index(self.project_path)
+        self._key = None
+
+    # ------------------------------------------------------------------
+    # 키 / 저장소 경로
+    # ------------------------------------------------------------------
+    def key_inputs(self):
+        inputs = {
+            "unity": unity_version(self.project_path, self.unity_path),
+            "platform": platform.system(),
+        }
+        for rel in ["Packages/manifest.json", "Packages/packages-lock.json"] + self.index.files("ProjectSettings"):
+            inputs[rel] = self.index.sha1(rel) or "missing"
+        return inputs
+
+    def key(self):
+        if self._key is None:
+            data = json.dumps(self.key_inputs(), sort_keys=True)
+            self._key = hashlib.sha1(f"{STORE_VERSION}\0{data}".encode("utf-8")).hexdigest()
+        return self._key
+
+    def _object(self, sha1):
+        return self.store / "objects" / sha1[:2] / sha1
+
+    def _snapshot_file(self, key):
+        return self.store / "snapshots" / f"{key}.json"
+
+    def load_snapshot(self, key=None):
+        try:
+            with open(self._snapshot_file(key or self.key()), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_snapshot(self, key, data):
+        path = self._snapshot_file(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def read_marker(library):
+        try:
+            with open(Path(library) / MARKER, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_marker(self, library, key):
+        with open(Path(library) / MARKER, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")}, f)
+
+    # ------------------------------------------------------------------
+    # 스냅샷 / 복원
+    # ------------------------------------------------------------------
+    def snapshot(self, project=None, cold_run_s=None, mark=True):
+        """
+        project(기본: 원본 프로젝트)의 Library를 저장소에 스냅샷
+        같은 키의 이전 스냅샷에서 크기/mtime이 같은 파일은 해시를 다시 계산하지 않음
+        mark=False면 Library에 표식을 남기지 않음 (표식 없는 Library는 계속 restore()가 건드리지 않음)
+        """
+        started = time.perf_counter()
+        library = Path(project or self.project_path) / "Library"
+        key = self.key()
+        old_meta = self.load_snapshot(key) or {}
+        previous = old_meta.get("files", {})
+        files = {}
+        stored = 0
+
+        def add(item):
+            rel, st = item
+            old = previous.get(rel)
+            if old and old[1] == st.st_size and old[2] == st.st_mtime_ns:
+                sha1 = old[0]
+            else:
+                sha1 = _file_sha1(library / rel)
+            target = self._object(sha1)
+            added = 0
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp = target.with_name(f"{target.name}.{os.getpid()}.{id(item)}.tmp")
+                shutil.copy2(library / rel, tmp)
+                os.replace(tmp, target)
+                added = 1
+            return rel, [sha1, st.st_size, st.st_mtime_ns], added
+
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+            for rel, entry, added in pool.map(add, _walk(library).items()):
+                files[rel] = entry
+                stored += added
+
+        data = {
+            "version": STORE_VERSION,
+            "key": key,
+            "inputs": self.key_inputs(),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            # 콜드 실행 시간은 처음 기록한 값을 유지 (절약 시간 계산 기준)
+            "cold_run_s": old_meta.get("cold_run_s") or cold_run_s,
+            "files": files,
+            "bytes": sum(entry[1] for entry in files.values()),
+        }
+        self._save_snapshot(key, data)
+        if mark:
+            self._write_marker(library, key)
+        self.prune()
+        return {"files": len(files), "new_objects": stored, "bytes": data["bytes"],
+                "elapsed_s": round(time.perf_counter() - started, 2)}
+
+    def restore(self, project=None):
+        """
+        batchmode 전에 호출. 반환: {"status", "key", "restore_s", "cold_run_s"}
+        status: hit(복원함) / current(이미 같은 키) / miss(스냅샷 없음, 콜드)
+                / stale(다른 키의 Library, 스냅샷 없음) / unmanaged(표식 없는 Library, 그대로 둠)
+        """
+        started = time.perf_counter()
+        library = Path(project or self.project_path) / "Library"
+        key = self.key()
+        snapshot = self.load_snapshot(key)
+        info = {"key": key, "restore_s": 0.0,
+                "cold_run_s": snapshot.get("cold_run_s") if snapshot else None}
+
+        if library.exists():
+            marker = self.read_marker(library)
+            if marker is None:
+                info["status"] = "unmanaged"
+                return info
+            if marker.get("key") == key:
+                info["status"] = "current"
+                return info
+            if snapshot is None:
+                info["status"] = "stale"
+                return info
+        elif snapshot is None:
+            info["status"] = "miss"
+            return info
+
+        # 복원: 새 폴더에 만든 뒤 바꿔 끼움 (중간에 실패해도 반쯤 복원된 Library가 남지 않음)
+        staging = library.with_name("Library.restoring")
+        if staging.exists():
+            shutil.rmtree(staging)
+        staging.mkdir(parents=True)
+
+        def copy(item):
+            rel, (sha1, _, mtime_ns) = item
+            dst = staging / rel
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(self._object(sha1), dst)
+            # 다음 스냅샷에서 해시를 재사용할 수 있도록 mtime 보존
+            os.utime(dst, ns=(mtime_ns, mtime_ns))
+
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+            list(pool.map(copy, snapshot["files"].items()))
+        self._write_marker(staging, key)
+        if library.exists():
+            shutil.rmtree(library)
+        os.replace(staging, library)
+
+        info["status"] = "hit"
+        info["files"] = len(snapshot["files"])
+        info["restore_s"] = round(time.perf_counter() - started, 2)
+        return info
+
+    def after_run(self, info, run_s, project=None, succeeded=True):
+        """
+        batchmode 후 호출. 콜드/표식 없는 Library였고 성공했으면 스냅샷,
+        웜 스타트였으면 콜드 실행 대비 절약 시간을 info에 기록
+        """
+        info["run_s"] = round(run_s, 2)
+        if info["status"] in ("miss", "stale", "unmanaged"):
+            if not succeeded:
+                return info
+            if self.load_snapshot() is None:
+                cold = run_s if info["status"] == "miss" else None
+                # 표식 없는 Library(에디터에서 쓰던 것)는 스냅샷만 하고 관리 대상으로 바꾸지 않음
+                info["snapshot"] = self.snapshot(project, cold_run_s=cold, mark=info["status"] != "unmanaged")
+            elif info["status"] == "miss":
+                # 다른 샤드가 같은 키로 먼저 스냅샷함: 이 Library도 같은 키로 표시
+                self._write_marker(Path(project or self.project_path) / "Library", self.key())
+        elif info.get("cold_run_s") is not None:
+            info["saved_s"] = round(info["cold_run_s"] - (run_s + info["restore_s"]), 2)
+        return info
+
+    def prune(self, keep=MAX_SNAPSHOTS):
+        """오래된 스냅샷과 어느 스냅샷도 쓰지 않는 객체 삭제"""
+        snapshots = sorted((self.store / "snapshots").glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for path in snapshots[keep:]:
+            path.unlink()
+        used = set()
+        for path in snapshots[:keep]:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    used.update(entry[0] for entry in json.load(f)["files"].values())
+            except (OSError, ValueError, KeyError):
+                continue
+        removed = 0
+        for obj in (self.store / "objects").glob("*/*"):
+            if obj.name not in used:
+                obj.unlink()
+                removed += 1
+        return removed
+
+
+def print_warm_start(info):
+    status = info["status"]
+    if status == "hit":
+        line = f"♨️  Library warm start: restored {info.get('files', 0)} files in {info['restore_s']:.1f}s"
+    elif status == "current":
+        line = "♨️  Library warm start: Library already matches the cache key"
+    elif status == "miss":
+        line = "🧊 Library cold start: no snapshot for this manifest/ProjectSettings/Unity version"
+    elif status == "stale":
+        line = "🧊 Library is from another manifest/ProjectSettings/Unity version and no snapshot exists"
+    else:
+        line = "ℹ️  Library not managed by the cache (left as is)"
+    print(line)
+    if "saved_s" in info:
+        print(f"    run {info['run_s']:.1f}s + restore {info['restore_s']:.1f}s "
+              f"vs cold {info['cold_run_s']:.1f}s -> saved {info['saved_s']:.1f}s")
+    if "snapshot" in info:
+        snap = info["snapshot"]
+        print(f"    snapshot saved: {snap['files']} files, {snap['bytes'] / 1e6:.1f} MB "
+              f"({snap['new_objects']} new objects, {snap['elapsed_s']:.1f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot/restore the Unity Library folder")
+    parser.add_argument("command", choices=["status", "snapshot", "restore", "prune"])
+    parser.add_argument("--project", default="My project")
+    parser.add_argument("--unity", help="Unity executable (its path is used to read the editor version)")
+    parser.add_argument("--store", default=str(DEFAULT_STORE))
+    args = parser.parse_args()
+
+    cache = LibraryCache(args.project, args.unity, args.store)
+    if args.command == "status":
+        snapshot = cache.load_snapshot()
+        marker = cache.read_marker(cache.project_path / "Library")
+        print(f"key: {cache.key()} (Unity {unity_version(args.project, args.unity)})")
+        print(f"snapshot: {'%d files, %.1f MB' % (len(snapshot['files']), snapshot['bytes'] / 1e6) if snapshot else 'none'}")
+        print(f"Library marker: {marker['key'] if marker else 'none'}")
+    elif args.command == "snapshot":
+        # 표식 없는 Library는 스냅샷해도 표식 없이 둠
+        print(cache.snapshot(mark=cache.read_marker(cache.project_path / "Library") is not None))
+    elif args.command == "restore":
+        print_warm_start(cache.restore())
+    else:
+        print(f"removed {cache.prune()} unused objects")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Batched GameObject queries over Unity MCP
+여러 오브젝트 경로를 동시에 조회하고, 씬 계층 구조 전체를 병렬로 순회
+
+결과는 경로를 키로 하는 dict이며 값은 MCP 응답과 같은 형태
+({"result": {...}} 또는 {"error": ...})라 기존 `"result" in result` 검사를 그대로 쓸 수 있다.
+
+    objects = await get_game_objects(client, ["/GameManager", "/Canvas"])
+    tree = await walk_hierarchy(client, "/", max_concurrency=16)
+"""
+
+import asyncio
+
+DEFAULT_CONCURRENCY = 16
+
+
+def child_path(parent, name):
+    """'/' + 'Canvas' -> '/Canvas', '/Canvas' + 'Panel' -> '/Canvas/Panel'"""
+    return "/" + name if parent in ("", "/") else f"{parent.rstrip('/')}/{name}"
+
+
+async def get_game_object(client, path):
+    """단일 조회. 예외(타임아웃, 연결 끊김)도 {"error": ...} 형태로 반환"""
+    try:
+        response = await client.call("get_game_object", {"objectPath": path})
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    if "result" in response and not response["result"]:
+        return {"error": "not found"}
+    return response
+
+
+async def get_game_objects(client, paths, max_concurrency=DEFAULT_CONCURRENCY):
+    """경로 목록을 동시에 조회해 {path: response} 반환 (입력 순서 유지)"""
+    slots = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(path):
+        async with slots:
+            return await get_game_object(client, path)
+
+    paths = list(dict.fromkeys(paths))
+    responses = await asyncio.gather(*(fetch(path) for path in paths))
+    return dict(zip(paths, responses))
+
+
+async def walk_hierarchy(client, root="/", max_concurrency=DEFAULT_CONCURRENCY, max_depth=None):
+    """
+    root 아래 전체 계층을 동시 요청 수 제한 하에 순회해 {path: response} 반환
+
+    응답의 children 항목에 자식 목록("children")이 이미 포함돼 있으면 추가 요청 없이
+    그대로 펼치고, 없으면 해당 경로를 다시 조회한다.
+    """
+    results = {}
+    queue = asyncio.Queue()
+
+    def expand(path, obj, depth):
+        if max_depth is not None and depth >= max_depth:
+            return
+        for child in obj.get("children") or []:
+            name = child.get("name")
+            if not name:
+                continue
+            sub_path = child_path(path, name)
+            if sub_path in results:
+                # 같은 이름의 형제 오브젝트는 경로로 구분할 수 없어 첫 번째만 사용
+                continue
+            if "children" in child:
+                results[sub_path] = {"result": child}
+                expand(sub_path, child, depth + 1)
+            else:
+                results[sub_path] = None
+                queue.put_nowait((sub_path, depth + 1))
+
+    async def worker():
+        while True:
+            path, depth = await queue.get()
+            try:
+                response = await get_game_object(client, path)
+                results[path] = response
+                if "result" in response:
+                    expand(path, response["result"], depth)
+            except Exception as e:
+                # 워커가 죽으면 남은 항목을 아무도 꺼내지 않아 queue.join()이 끝나지 않음
+                results[path] = {"error": f"{type(e).__name__}: {e}"}
+            finally:
+                queue.task_done()
+
+    results[root] = None
+    queue.put_nowait((root, 0))
+    workers = [asyncio.create_task(worker()) for _ in range(max_concurrency)]
+    try:
+        await queue.join()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    return results
+
+
+def summarize(results, root="/"):
+    """조회 결과 요약: (찾은 수, 오류 {path: error}). 씬 루트 "/" 항목은 오브젝트가 아니므로 세지 않음"""
+    found = sum(1 for path, r in results.items() if path != root and r and "result" in r)
+    errors = {path: r.get("error") for path, r in results.items() if r and "error" in r}
+    return found, errors
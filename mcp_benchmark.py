@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Unity MCP Load Generator / Benchmark
+여러 UnityMCPClient 세션을 동시에 붙여 처리량, 지연 백분위, 오류율을 측정
+
+대상은 실제 에디터(--target) 또는 같은 프로세스에서 띄우는 가짜 서버(--fake).
+결과를 기준선(baseline)으로 저장하고 이후 실행에서 회귀를 표시한다.
+
+    python mcp_benchmark.py --fake --sessions 4 --duration 10 --mix poll
+    python mcp_benchmark.py --target ws://localhost:8090/McpUnity --sweep 1,2,4,8
+    python mcp_benchmark.py --fake --save-baseline
+    python mcp_benchmark.py --fake --baseline mcp_benchmark_baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from mcp_metrics import MCPMetrics
+from unity_mcp_client import DEFAULT_URI, UnityMCPClient
+
+DEFAULT_BASELINE = "mcp_benchmark_baseline.json"
+
+# 작업 종류별 비중
+# load_scene은 모든 세션이 공유하는 씬을 바꿔 이후 lookup이 not_found가 되므로 기본 구성에서는 뺌
+MIXES = {
+    "poll": {"scene_info": 1.0},
+    "audit": {"scene_info": 0.1, "lookup": 0.9},
+    "mixed": {"scene_info": 0.6, "lookup": 0.4},
+    "scene_switch": {"scene_info": 0.6, "lookup": 0.35, "load": 0.05},
+}
+
+SCENES = [
+    "Assets/Scenes/MainMenu.unity",
+    "Assets/Scenes/SongSelect.unity",
+    "Assets/Scenes/Gameplay.unity",
+]
+
+# 회귀 판정 기준 (기준선 대비)
+P95_REGRESSION = 0.20         # p95 20% 이상 증가
+THROUGHPUT_REGRESSION = 0.15  # 처리량 15% 이상 감소
+ERROR_RATE_REGRESSION = 0.01  # 오류율 1%p 이상 증가
+
+
+def parse_mix(text):
+    """'poll' 또는 'scene_info=6,lookup=3,load=1' -> {op: weight}"""
+    if text in MIXES:
+        return dict(MIXES[text])
+    mix = {}
+    for part in text.split(","):
+        op, _, weight = part.partition("=")
+        op = op.strip()
+        if op not in ("scene_info", "lookup", "load"):
+            raise ValueError(f"Unknown operation in mix: {op}")
+        mix[op] = float(weight or 1)
+    return mix
+
+
+class LoadGenerator:
+    def __init__(self, uri, sessions=1, concurrency=8, duration=10.0, mix=None,
+                 timeout=5.0, seed=None, home_scene=None):
+        self.uri = uri
+        self.sessions = sessions
+        self.concurrency = concurrency
+        self.duration = duration
+        self.mix = mix or dict(MIXES["mixed"])
+        self.timeout = timeout
+        self.random = random.Random(seed)
+        self.object_paths = ["/"]
+        self.home_scene = home_scene  # 측정 시작 전에 되돌릴 씬 (None이면 현재 씬을 기록)
+
+    async def _restore_scene(self, client):
+        """이전 단계의 load_scene으로 바뀐 씬을 처음 씬으로 되돌림"""
+        try:
+            if self.home_scene:
+                await client.call("load_scene", {"scenePath": self.home_scene, "loadMode": "Single"})
+            else:
+                response = await client.call("get_scene_info")
+                self.home_scene = response.get("result", {}).get("activeScene", {}).get("path")
+        except Exception:
+            pass
+
+    async def _discover(self, client):
+        """조회 대상 오브젝트 경로 수집 (루트 자식들)"""
+        try:
+            response = await client.call("get_game_object", {"objectPath": "/"})
+        except Exception:
+            return
+        children = response.get("result", {}).get("children") or []
+        paths = ["/" + c["name"] for c in children if c.get("name")]
+        if paths:
+            self.object_paths = paths
+
+    def _request(self, op):
+        if op == "scene_info":
+            return "get_scene_info", None
+        if op == "lookup":
+            return "get_game_object", {"objectPath": self.random.choice(self.object_paths)}
+        return "load_scene", {"scenePath": self.random.choice(SCENES), "loadMode": "Single"}
+
+    async def _worker(self, client, deadline, ops, weights):
+        loop = asyncio.get_running_loop()
+        while loop.time() < deadline:
+            op = self.random.choices(ops, weights)[0]
+            method, params = self._request(op)
+            try:
+                await client.call(method, params)
+            except (asyncio.TimeoutError, ConnectionError):
+                # 끊긴 뒤의 call은 await 없이 바로 실패하므로 계속 돌면 이벤트 루프를 막음
+                if not client.connected:
+                    return
+            except Exception:
+                # 연결이 끊긴 세션은 더 이상 부하를 줄 수 없음
+                if not client.connected:
+                    return
+
+    async def _session(self, metrics, deadline, connected, ready):
+        client = UnityMCPClient(self.uri, max_in_flight=self.concurrency,
+                                timeout=self.timeout, verbose=False, metrics=metrics)
+        try:
+            await client.connect()
+        finally:
+            connected.set()
+        try:
+            await ready.wait()
+            ops = list(self.mix)
+            weights = [self.mix[op] for op in ops]
+            await asyncio.gather(*(
+                self._worker(client, deadline(), ops, weights) for _ in range(self.concurrency)
+            ))
+        finally:
+            await client.close()
+
+    async def run(self):
+        probe = UnityMCPClient(self.uri, verbose=False, timeout=self.timeout)
+        await probe.connect()
+        await self._restore_scene(probe)
+        await self._discover(probe)
+        await probe.close()
+
+        per_session = [MCPMetrics() for _ in range(self.sessions)]
+        connected = [asyncio.Event() for _ in per_session]
+        ready = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        window = {}
+        tasks = [
+            asyncio.create_task(self._session(m, lambda: window["deadline"], c, ready))
+            for m, c in zip(per_session, connected)
+        ]
+        # 모든 세션 연결 후 동시에 시작 (연결 시간은 측정에서 제외)
+        await asyncio.gather(*(c.wait() for c in connected))
+        window["deadline"] = loop.time() + self.duration
+        for m in per_session:
+            m.started = time.perf_counter()
+        ready.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        metrics = MCPMetrics()
+        for m in per_session:
+            metrics.merge(m)
+        report = metrics.report()
+        total = report["total"]
+        failed = total["errors"] + total["timeouts"] + total["disconnects"]
+        report.update({
+            "target": self.uri,
+            "sessions": self.sessions,
+            "concurrency": self.concurrency,
+            "duration_s": self.duration,
+            "mix": self.mix,
+            "scene": self.home_scene,
+            "error_rate": round(failed / total["calls"], 4) if total["calls"] else 0.0,
+            "session_failures": [str(r) for r in results if isinstance(r, Exception)],
+        })
+        return report
+
+
+def print_report(report):
+    total = report["total"]
+    print(f"\n  Target: {report['target']}")
+    print(f"  Sessions: {report['sessions']} x {report['concurrency']} in flight, "
+          f"{report['elapsed_s']:.1f}s, mix {report['mix']}")
+    print(f"  Throughput: {report['throughput_rps']:.0f} req/s ({total['calls']} calls)")
+    if total.get("count"):
+        print(f"  Latency: p50 {total['p50_ms']} ms, p95 {total['p95_ms']} ms, "
+              f"p99 {total['p99_ms']} ms, max {total['max_ms']} ms")
+    print(f"  Errors: {report['error_rate'] * 100:.2f}% "
+          f"(errors {total['errors']}, timeouts {total['timeouts']}, disconnects {total['disconnects']})")
+    for method, stats in report["methods"].items():
+        print(f"    {method:<20}{stats['calls']:>8} calls  p50 {stats.get('p50_ms', '-')} ms"
+              f"  p95 {stats.get('p95_ms', '-')} ms  p99 {stats.get('p99_ms', '-')} ms")
+    for failure in report["session_failures"]:
+        print(f"  Session failed: {failure}")
+
+
+def compare_to_baseline(report, baseline):
+    """기준선 대비 회귀 목록 반환 (비어 있으면 통과)"""
+    regressions = []
+    base_total, total = baseline.get("total", {}), report["total"]
+    base_rps, rps = baseline.get("throughput_rps", 0), report["throughput_rps"]
+    if base_rps and rps < base_rps * (1 - THROUGHPUT_REGRESSION):
+        regressions.append(f"throughput {rps:.0f} req/s < baseline {base_rps:.0f} req/s")
+    base_p95, p95 = base_total.get("p95_ms"), total.get("p95_ms")
+    if base_p95 and p95 and p95 > base_p95 * (1 + P95_REGRESSION):
+        regressions.append(f"p95 {p95} ms > baseline {base_p95} ms")
+    if report["error_rate"] > baseline.get("error_rate", 0) + ERROR_RATE_REGRESSION:
+        regressions.append(f"error rate {report['error_rate']:.2%} > baseline {baseline.get('error_rate', 0):.2%}")
+    for method, stats in report["methods"].items():
+        base = baseline.get("methods", {}).get(method, {})
+        if base.get("p95_ms") and stats.get("p95_ms") and stats["p95_ms"] > base["p95_ms"] * (1 + P95_REGRESSION):
+            regressions.append(f"{method} p95 {stats['p95_ms']} ms > baseline {base['p95_ms']} ms")
+    return regressions
+
+
+async def run_benchmark(args):
+    server = None
+    uri = args.target
+    if args.fake:
+        from fake_mcp_server import FakeUnityMCPServer, default_scenes
+        server = FakeUnityMCPServer(
+            port=0, scenes=default_scenes(args.objects),
+            latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, seed=args.seed)
+        await server.start()
+        uri = server.url
+
+    try:
+        mix = parse_mix(args.mix)
+        reports = []
+        home_scene = None
+        for sessions in args.sweep or [args.sessions]:
+            # 단계마다 첫 단계의 씬에서 다시 시작 (load가 섞인 구성에서 lookup 대상이 어긋나지 않게)
+            generator = LoadGenerator(uri, sessions=sessions, concurrency=args.concurrency,
+                                      duration=args.duration, mix=mix, timeout=args.timeout,
+                                      seed=args.seed, home_scene=home_scene)
+            report = await generator.run()
+            home_scene = report["scene"]
+            print_report(report)
+            reports.append(report)
+        return reports
+    finally:
+        if server is not None:
+            await server.stop()
+
+
+def print_sweep(reports):
+    print("\n  Saturation sweep:")
+    print(f"    {'sessions':>8}{'req/s':>10}{'p95 ms':>10}{'err %':>8}")
+    previous = None
+    for report in reports:
+        rps = report["throughput_rps"]
+        note = ""
+        if previous and rps < previous * 1.10:
+            note = "  <- saturated (<10% gain)"
+        print(f"    {report['sessions']:>8}{rps:>10.0f}{report['total'].get('p95_ms', '-'):>10}"
+              f"{report['error_rate'] * 100:>8.2f}{note}")
+        previous = rps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unity MCP load generator / benchmark")
+    parser.add_argument("--target", default=DEFAULT_URI, help="MCP WebSocket URI")
+    parser.add_argument("--fake", action="store_true", help="benchmark an in-process fake server")
+    parser.add_argument("--sessions", type=int, default=1)
+    parser.add_argument("--sweep", type=lambda s: [int(x) for x in s.split(",")],
+                        help="comma-separated session counts, e.g. 1,2,4,8")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight per session")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--mix", default="mixed", help="poll | audit | mixed | scene_switch | scene_info=6,lookup=3,load=1")
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--objects", type=int, default=0, help="(fake) generated Gameplay objects")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="(fake) server latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="(fake) server jitter")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help="save the result as baseline")
+    parser.add_argument("--baseline", help="compare against this baseline and flag regressions")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Unity MCP Benchmark")
+    print("=" * 60)
+    try:
+        reports = asyncio.run(run_benchmark(args))
+    except (OSError, ConnectionError) as e:
+        print(f"❌ Could not connect to {args.target}: {e}")
+        return 2
+
+    if len(reports) > 1:
+        print_sweep(reports)
+    report = reports[-1]
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports if len(reports) > 1 else report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Report saved to: {args.output}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 Baseline saved to: {args.save_baseline}")
+
+    if args.baseline:
+        try:
+            baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read baseline: {e}")
+            return 2
+        for key in ("sessions", "concurrency", "mix"):
+            if baseline.get(key) != report[key]:
+                print(f"⚠️  Baseline {key} differs ({baseline.get(key)} vs {report[key]}); comparison may be misleading")
+        regressions = compare_to_baseline(report, baseline)
+        if regressions:
+            print("\n❌ Regressions vs baseline:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\n✅ No regressions vs baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Unity MCP Endpoint Discovery
+후보 포트/경로/프로토콜(HTTP, WS /McpUnity, /mcp ...)을 병렬로 짧게 탐색
+
+1) 모든 후보 포트에 TCP 연결을 동시에 시도 (닫힌 포트는 여기서 바로 제외)
+2) 열린 포트에 대해 WebSocket 핸드셰이크와 HTTP GET을 동시에 시도
+3) 처음 동작한 WebSocket 엔드포인트를 .mcp_cache/endpoint.json 에 저장
+
+에디터가 꺼져 있으면 connect_timeout(기본 0.5초) 안에 끝난다.
+UnityMCPClient는 URI를 지정하지 않으면 캐시된 엔드포인트로 바로 연결한다.
+
+    python mcp_discovery.py
+    endpoint = await discover()          # 캐시 확인 후 필요할 때만 전체 탐색
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from mcp_readiness import probe_port
+
+DEFAULT_HOST = "localhost"
+DEFAULT_PORTS = (8090, 8091, 8080)
+WS_PATHS = ("/McpUnity", "/mcp", "/", "/ws", "/socket", "/websocket")
+HTTP_PATHS = ("/", "/mcp", "/status", "/health", "/api/status", "/tools", "/resources")
+CACHE_FILE = Path(".mcp_cache") / "endpoint.json"
+FALLBACK_URI = "ws://localhost:8090/McpUnity"
+
+CONNECT_TIMEOUT = 0.5
+PROBE_TIMEOUT = 2.0
+
+
+def _result(url, protocol, ok, started, status=None, error=None, body=None):
+    return {
+        "url": url,
+        "protocol": protocol,
+        "ok": ok,
+        "status": status,
+        "error": error,
+        "body": body,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+async def probe_ws(url, timeout=PROBE_TIMEOUT):
+    """WebSocket 핸드셰이크만 확인 (요청은 보내지 않음)"""
+    from unity_mcp_client import websockets
+
+    started = time.perf_counter()
+    try:
+        ws = await asyncio.wait_for(websockets.connect(url, open_timeout=timeout), timeout)
+    except websockets.InvalidStatus as e:
+        return _result(url, "ws", False, started, status=e.response.status_code,
+                       error=f"HTTP {e.response.status_code}")
+    except (OSError, asyncio.TimeoutError, websockets.WebSocketException) as e:
+        return _result(url, "ws", False, started, error=f"{type(e).__name__}: {e}")
+    await ws.close()
+    return _result(url, "ws", True, started, status=101)
+
+
+def _http_get(url, timeout):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            body = response.read(512).decode("utf-8", errors="replace")
+            return _result(url, "http", True, started, status=response.status, body=body)
+    except urllib.error.HTTPError as e:
+        return _result(url, "http", False, started, status=e.code, error=f"HTTP {e.code}")
+    except Exception as e:
+        return _result(url, "http", False, started, error=f"{type(e).__name__}: {e}")
+
+
+async def probe_http(url, timeout=PROBE_TIMEOUT):
+    return await asyncio.to_thread(_http_get, url, timeout)
+
+
+async def scan(host=DEFAULT_HOST, ports=DEFAULT_PORTS, ws_paths=WS_PATHS, http_paths=HTTP_PATHS,
+               connect_timeout=CONNECT_TIMEOUT, probe_timeout=PROBE_TIMEOUT):
+    """
+    전체 탐색. {"open_ports": [...], "closed_ports": [...], "results": [...]} 반환
+    results는 후보 순서(포트 -> WS 경로 -> HTTP 경로)를 유지한다.
+    """
+    opened = await asyncio.gather(*(probe_port(host, port, connect_timeout) for port in ports))
+    open_ports = [port for port, ok in zip(ports, opened) if ok]
+
+    probes = []
+    for port in open_ports:
+        probes += [probe_ws(f"ws://{host}:{port}{path}", probe_timeout) for path in ws_paths]
+        probes += [probe_http(f"http://{host}:{port}{path}", probe_timeout) for path in http_paths]
+    results = await asyncio.gather(*probes)
+    return {
+        "open_ports": open_ports,
+        "closed_ports": [port for port in ports if port not in open_ports],
+        "results": list(results),
+    }
+
+
+def best_endpoint(results, protocol="ws"):
+    """후보 순서상 처음으로 동작한 엔드포인트 (없으면 None)"""
+    return next((r for r in results if r["ok"] and r["protocol"] == protocol), None)
+
+
+def load_cache(path=CACHE_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) and data.get("url") else None
+
+
+def save_cache(endpoint, path=CACHE_FILE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "url": endpoint["url"],
+        "protocol": endpoint["protocol"],
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def cached_ws_uri(default=FALLBACK_URI, path=CACHE_FILE):
+    """캐시된 WebSocket 엔드포인트 (탐색 없이 즉시 반환)"""
+    cached = load_cache(path)
+    if cached and cached.get("protocol") == "ws":
+        return cached["url"]
+    return default
+
+
+async def discover(use_cache=True, cache_path=CACHE_FILE, **scan_options):
+    """
+    동작하는 WebSocket 엔드포인트 반환 (없으면 None)
+    캐시된 엔드포인트가 아직 응답하면 전체 탐색을 생략한다.
+    """
+    if use_cache:
+        cached = load_cache(cache_path)
+        if cached and cached.get("protocol") == "ws":
+            result = await probe_ws(cached["url"], scan_options.get("probe_timeout", PROBE_TIMEOUT))
+            if result["ok"]:
+                return result
+    found = await scan(**scan_options)
+    endpoint = best_endpoint(found["results"])
+    if endpoint is not None:
+        save_cache(endpoint, cache_path)
+    return endpoint
+
+
+def print_scan(found, show_failures=True):
+    for port in found["closed_ports"]:
+        print(f"    ❌ port {port} CLOSED")
+    for r in found["results"]:
+        if r["ok"]:
+            print(f"    ✅ {r['url']} ({r['status']}, {r['elapsed_ms']} ms)")
+        elif show_failures:
+            print(f"    ❌ {r['url']} - {(r['error'] or '')[:60]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discover the Unity MCP endpoint")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--ports", type=lambda s: tuple(int(p) for p in s.split(",")), default=DEFAULT_PORTS)
+    parser.add_argument("--connect-timeout", type=float, default=CONNECT_TIMEOUT)
+    parser.add_argument("--probe-timeout", type=float, default=PROBE_TIMEOUT)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    found = asyncio.run(scan(args.host, args.ports, connect_timeout=args.connect_timeout,
+                             probe_timeout=args.probe_timeout))
+    print_scan(found)
+    endpoint = best_endpoint(found["results"])
+    print(f"\n    Scan took {time.perf_counter() - started:.2f}s")
+    if endpoint is None:
+        print("    ❌ No MCP WebSocket endpoint found")
+        return 1
+    save_cache(endpoint)
+    print(f"    💾 Cached {endpoint['url']} -> {CACHE_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+MCP Client Metrics
+메서드별 지연 시간 히스토그램(HDR 방식)과 처리량/오류 카운터
+
+UnityMCPClient가 모든 호출에 대해 전송~응답 시간, 요청/응답 크기, 타임아웃,
+재연결을 기록한다. 결과는 p50/p95/p99로 요약해 실행 기록(run_history)에 남기고,
+JSON 보고서(game_test_report.json, unity_test_report.json)의 "mcp_metrics" 항목으로 보여 준다.
+"""
+
+import time
+
+from run_history import RunHistory
+
+DEFAULT_REPORTS = ("game_test_report.json", "unity_test_report.json")
+
+
+class LatencyHistogram:
+    """
+    HDR 스타일 로그-선형 히스토그램 (마이크로초 단위 정수 기록)
+
+    2^sub_bucket_bits 미만 값은 정확히, 그 이상은 2의 거듭제곱 구간마다
+    2^(sub_bucket_bits-1)개 하위 구간으로 나눠 상대 오차 ~1/2^(sub_bucket_bits-1) 이내로 저장한다.
+    """
+
+    def __init__(self, sub_bucket_bits=7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.half_count + ((value >> shift) - self.half_count)
+
+    def _bucket_range(self, index):
+        """index -> (하한, 상한) 값"""
+        if index < self.sub_bucket_count:
+            return index, index
+        offset = index - self.sub_bucket_count
+        shift = offset // self.half_count + 1
+        mantissa = offset % self.half_count + self.half_count
+        low = mantissa << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, value):
+        value = max(0, int(value))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def record_seconds(self, seconds):
+        self.record(round(seconds * 1_000_000))
+
+    def merge(self, other):
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, p):
+        """p (0~100) 백분위 값. 구간 중간값을 반환하되 실제 min/max 범위로 제한"""
+        if not self.count:
+            return None
+        target = max(1, -(-self.count * p // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                low, high = self._bucket_range(index)
+                return min(max((low + high) // 2, self.min), self.max)
+        return self.max
+
+    def summary_ms(self):
+        if not self.count:
+            return {"count": 0}
+        ms = lambda us: round(us / 1000, 3)
+        return {
+            "count": self.count,
+            "min_ms": ms(self.min),
+            "mean_ms": ms(self.total / self.count),
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "p99_ms": ms(self.percentile(99)),
+            "max_ms": ms(self.max),
+        }
+
+
+class MethodStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.disconnects = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def merge(self, other):
+        self.latency.merge(other.latency)
+        self.calls += other.calls
+        self.errors += other.errors
+        self.timeouts += other.timeouts
+        self.disconnects += other.disconnects
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+
+    def to_dict(self):
+        data = self.latency.summary_ms()
+        data.update({
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "disconnects": self.disconnects,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+        })
+        return data
+
+
+class MCPMetrics:
+    def __init__(self):
+        self.methods = {}
+        self.reconnects = LatencyHistogram()
+        self.started = time.perf_counter()
+
+    def _stats(self, method):
+        stats = self.methods.get(method)
+        if stats is None:
+            stats = self.methods[method] = MethodStats()
+        return stats
+
+    def record_call(self, method, seconds, bytes_sent, bytes_received, error=False):
+        stats = self._stats(method)
+        stats.calls += 1
+        stats.latency.record_seconds(seconds)
+        stats.bytes_sent += bytes_sent
+        stats.bytes_received += bytes_received
+        if error:
+            stats.errors += 1
+
+    def record_timeout(self, method, bytes_sent=0):
+        stats = self._stats(method)
+        stats.calls += 1
+        stats.timeouts += 1
+        stats.bytes_sent += bytes_sent
+
+    def record_disconnect(self, method, bytes_sent=0):
+        stats = self._stats(method)
+        stats.calls += 1
+        stats.disconnects += 1
+        stats.bytes_sent += bytes_sent
+
+    def record_reconnect(self, seconds):
+        self.reconnects.record_seconds(seconds)
+
+    def merge(self, other):
+        for method, stats in other.methods.items():
+            self._stats(method).merge(stats)
+        self.reconnects.merge(other.reconnects)
+        self.started = min(self.started, other.started)
+
+    def total(self):
+        total = MethodStats()
+        for stats in self.methods.values():
+            total.merge(stats)
+        return total
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started
+        total = self.total()
+        return {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(total.calls / elapsed, 2) if elapsed > 0 else 0.0,
+            "total": total.to_dict(),
+            "methods": {method: stats.to_dict() for method, stats in sorted(self.methods.items())},
+            "reconnects": self.reconnects.summary_ms(),
+        }
+
+    def print_summary(self):
+        if not self.methods:
+            return
+        print(f"\n    {'Method':<24}{'calls':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'err':>6}{'t/o':>6}")
+        for method, stats in sorted(self.methods.items()):
+            s = stats.to_dict()
+            print(f"    {method:<24}{s['calls']:>7}{s.get('p50_ms', '-'):>10}{s.get('p95_ms', '-'):>10}"
+                  f"{s.get('p99_ms', '-'):>10}{s['errors']:>6}{s['timeouts']:>6}")
+        if self.reconnects.count:
+            r = self.reconnects.summary_ms()
+            print(f"    reconnects: {r['count']} (p50 {r['p50_ms']} ms, max {r['max_ms']} ms)")
+
+    def update_reports(self, paths=DEFAULT_REPORTS):
+        """지표를 실행 기록(run_history)에 MCP 실행으로 남기고 JSON 보고서 뷰를 다시 씀"""
+        with RunHistory() as history:
+            history.record_mcp(self.report())
+            for path in paths:
+                history.write_view(path)
@@ -0,0 +1,159 @@
+"""
+Readiness Probes for Unity MCP automation
+고정 asyncio.sleep / 카운트다운 대신 "조건이 참이 될 때까지" 폴링하는 대기 도구
+
+가벼운 조건(predicate)을 짧은 간격에서 시작해 점점 늘어나는 간격으로 확인하고,
+데드라인을 넘기면 TimeoutError를 올린다. 모든 대기는 실제 소요 시간과 함께 기록된다.
+
+    probes = Readiness()
+    await client.call("load_scene", {"scenePath": "Assets/Scenes/Gameplay.unity", "loadMode": "Single"})
+    await probes.wait_until(scene_active(client, "Gameplay"), name="load Gameplay")
+    probes.print_summary()
+"""
+
+import asyncio
+import inspect
+from pathlib import PurePosixPath
+
+PORT_CONNECT_TIMEOUT = 0.25
+
+
+class Readiness:
+    def __init__(self, initial_interval=0.05, max_interval=1.0, backoff=1.5):
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.records = []
+
+    async def wait_until(self, predicate, timeout=30.0, name=None):
+        """
+        predicate()가 참 값을 반환할 때까지 대기 후 그 값을 반환
+        predicate는 일반 함수/코루틴 함수 모두 가능하며, 예외는 "아직 아님"으로 처리
+        """
+        name = name or getattr(predicate, "__name__", "condition")
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + timeout
+        interval = self.initial_interval
+        polls = 0
+        last_error = None
+
+        while True:
+            polls += 1
+            try:
+                value = predicate()
+                if inspect.isawaitable(value):
+                    value = await asyncio.wait_for(value, timeout=max(0.01, deadline - loop.time()))
+            except Exception as e:
+                value, last_error = None, e
+            if value:
+                self._record(name, True, loop.time() - started, polls)
+                return value
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                elapsed = loop.time() - started
+                self._record(name, False, elapsed, polls)
+                detail = f" (last error: {last_error})" if last_error else ""
+                raise asyncio.TimeoutError(f"Timed out after {elapsed:.2f}s waiting for {name}{detail}")
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * self.backoff, self.max_interval)
+
+    def _record(self, name, ok, elapsed, polls):
+        self.records.append({
+            "name": name,
+            "ok": ok,
+            "elapsed": round(elapsed, 4),
+            "polls": polls,
+        })
+
+    @property
+    def total_wait(self):
+        return sum(r["elapsed"] for r in self.records)
+
+    def print_summary(self):
+        if not self.records:
+            return
+        print(f"\n    Waits: {len(self.records)}, total {self.total_wait:.2f}s")
+        for r in self.records:
+            status = "OK" if r["ok"] else "TIMEOUT"
+            print(f"      [{status}] {r['name']}: {r['elapsed']:.2f}s ({r['polls']} polls)")
+
+
+def scene_name_from_path(scene_path):
+    """'Assets/Scenes/Gameplay.unity' -> 'Gameplay'"""
+    return PurePosixPath(scene_path).stem
+
+
+def scene_active(client, scene_name):
+    """get_scene_info의 activeScene.name이 scene_name이 되면 참"""
+    async def predicate():
+        result = await client.call("get_scene_info")
+        scene = result.get("result", {}).get("activeScene", {})
+        return scene if scene.get("name") == scene_name else None
+    predicate.__name__ = f"scene {scene_name}"
+    return predicate
+
+
+async def probe_port(host, port, timeout=PORT_CONNECT_TIMEOUT):
+    """TCP 연결을 한 번 시도해 포트가 열려 있으면 True (mcp_discovery 포트 스캔도 이것을 씀)"""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+def port_open(host="localhost", port=8090, connect_timeout=PORT_CONNECT_TIMEOUT):
+    """TCP 포트가 연결을 받으면 참"""
+    async def predicate():
+        return await probe_port(host, port, connect_timeout)
+    predicate.__name__ = f"port {host}:{port}"
+    return predicate
+
+
+def session_ready(session):
+    """MCPSession이 연결되어 응답 가능하면 참"""
+    def predicate():
+        return session.ready and session.client.connected
+    predicate.__name__ = "MCP session ready"
+    return predicate
+
+
+def play_mode_entered(session, since):
+    """
+    플레이 모드 진입 확인: 진입 시 도메인 리로드로 연결이 한 번 끊기므로
+    since(진입 요청 전 session.drops) 이후 끊김이 있었고 다시 응답하면 참.
+    에디터가 get_scene_info에 isPlaying을 포함하면 그 값을 우선한다.
+    """
+    async def predicate():
+        if not (session.ready and session.client.connected):
+            return False
+        result = await session.call("get_scene_info")
+        info = result.get("result", {})
+        if "isPlaying" in info:
+            return bool(info["isPlaying"])
+        return session.drops > since
+    predicate.__name__ = "play mode entered"
+    return predicate
+
+
+async def load_scene(client, scene_path, probes, timeout=15.0):
+    """씬 로드 요청 후 활성 씬이 바뀔 때까지 대기. load_scene 응답을 반환"""
+    result = await client.call("load_scene", {
+        "scenePath": scene_path,
+        "loadMode": "Single"
+    })
+    if "error" in result:
+        return result
+    scene_name = scene_name_from_path(scene_path)
+    try:
+        await probes.wait_until(scene_active(client, scene_name), timeout=timeout, name=f"load {scene_name}")
+    except asyncio.TimeoutError as e:
+        print(f"    Warning: {e}")
+    return result
@@ -0,0 +1,203 @@
+"""
+Auto-reconnecting Unity MCP Session
+플레이 모드 진입/스크립트 재컴파일로 인한 도메인 리로드(4001 close)를 견디는 세션
+
+연결이 끊기면 지터가 있는 지수 백오프로 재연결하고, 끊긴 동안의 호출은
+대기시켰다가 에디터가 다시 응답하는 즉시 전송한다.
+
+    async with MCPSession() as session:
+        mark = session.drops
+        await session.call("recompile_scripts")
+        await session.wait_for_reload(since=mark)   # 고정 sleep 대신
+        await session.call("get_scene_info")
+"""
+
+import asyncio
+import random
+import time
+
+from unity_mcp_client import (
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_TIMEOUT,
+    UnityMCPClient,
+    websockets,
+)
+
+# 재전송해도 안전한 (상태를 바꾸지 않는) 메서드
+IDEMPOTENT_METHODS = frozenset({
+    "get_scene_info",
+    "get_game_object",
+})
+
+DISCONNECT_ERRORS = (ConnectionError, websockets.ConnectionClosed)
+CONNECT_ERRORS = (OSError, asyncio.TimeoutError, websockets.WebSocketException)
+
+
+class MCPSession:
+    def __init__(self, uri=None, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 timeout=DEFAULT_TIMEOUT, reconnect_timeout=60.0,
+                 backoff_base=0.1, backoff_max=2.0, probe_method="get_scene_info",
+                 replay_methods=IDEMPOTENT_METHODS, verbose=True, metrics=None):
+        self.client = UnityMCPClient(uri, max_in_flight=max_in_flight, timeout=timeout,
+                                     verbose=False, metrics=metrics)
+        self.reconnect_timeout = reconnect_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.probe_method = probe_method
+        self.replay_methods = frozenset(replay_methods)
+        self.verbose = verbose
+        self.drops = 0
+        self.reconnect_times = []
+        self._ready = asyncio.Event()
+        self._changed = asyncio.Event()
+        self._failure = None
+        self._closing = False
+        self._supervisor = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def metrics(self):
+        return self.client.metrics
+
+    @property
+    def ready(self):
+        return self._ready.is_set() and self._failure is None
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+    def _notify(self):
+        # 상태 변화 (끊김/재연결) 대기자 깨우기
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def connect(self):
+        """최초 연결 (실패 시 reconnect_timeout 동안 백오프로 재시도)"""
+        self._closing = False
+        self._failure = None
+        attempts = await self._connect_with_backoff()
+        self._log(f"Connected to Unity MCP ({attempts} attempt{'s' if attempts > 1 else ''})")
+        self._ready.set()
+        self._notify()
+        if self._supervisor is None or self._supervisor.done():
+            self._supervisor = asyncio.create_task(self._supervise())
+
+    async def close(self):
+        self._closing = True
+        supervisor, self._supervisor = self._supervisor, None
+        if supervisor is not None:
+            supervisor.cancel()
+            await asyncio.wait([supervisor])
+        await self.client.close()
+        self._failure = ConnectionError("Unity MCP session closed")
+        self._ready.set()
+        self._notify()
+
+    async def _connect_with_backoff(self):
+        """지터 지수 백오프로 연결 + 준비 상태 확인. 시도 횟수 반환"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.reconnect_timeout
+        delay = self.backoff_base
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                await self.client.connect()
+                if self.probe_method:
+                    probe_timeout = max(0.1, min(self.client.timeout, deadline - loop.time()))
+                    await self.client.call(self.probe_method, timeout=probe_timeout)
+                return attempts
+            except CONNECT_ERRORS + DISCONNECT_ERRORS as e:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise ConnectionError(
+                        f"Unity MCP not ready after {self.reconnect_timeout:.0f}s "
+                        f"({attempts} attempts): {e}") from e
+                # equal jitter: delay/2 ~ delay
+                await asyncio.sleep(min(remaining, delay / 2 + random.uniform(0, delay / 2)))
+                delay = min(delay * 2, self.backoff_max)
+
+    async def _supervise(self):
+        """연결 감시: 끊기면 즉시 재연결"""
+        while not self._closing:
+            error = await self.client.wait_closed()
+            if self._closing:
+                return
+            self._ready.clear()
+            self.drops += 1
+            self._notify()
+            self._log(f"Unity MCP connection lost ({error}), reconnecting...")
+
+            started = time.perf_counter()
+            try:
+                attempts = await self._connect_with_backoff()
+            except ConnectionError as e:
+                self._log(f"Reconnect failed: {e}")
+                self._failure = e
+                self._ready.set()
+                self._notify()
+                return
+            elapsed = time.perf_counter() - started
+            self.reconnect_times.append(elapsed)
+            self.client.metrics.record_reconnect(elapsed)
+            self._log(f"Reconnected to Unity MCP after {elapsed:.2f}s ({attempts} attempts)")
+            self._ready.set()
+            self._notify()
+
+    async def wait_ready(self, timeout=None):
+        """에디터가 응답 가능한 상태가 될 때까지 대기"""
+        await asyncio.wait_for(self._ready.wait(), timeout=timeout or self.reconnect_timeout)
+        if self._failure is not None:
+            raise self._failure
+
+    async def wait_for_reload(self, since=None, drop_timeout=5.0, timeout=None):
+        """
+        도메인 리로드(연결 끊김 -> 재연결)가 끝날 때까지 대기
+
+        since: 트리거 호출 전에 읽어 둔 self.drops 값 (이미 끊겼다면 바로 재연결 대기)
+        drop_timeout: 이 시간 안에 끊김이 없으면 리로드가 없었던 것으로 보고 False 반환
+        """
+        drops = self.drops if since is None else since
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + drop_timeout
+        while self.drops == drops and self.ready:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return False
+        await self.wait_ready(timeout)
+        return True
+
+    async def call(self, method, params=None, timeout=None):
+        """
+        연결이 끊긴 동안 호출하면 재연결 후 전송.
+        전송 중에 끊긴 경우 replay_methods에 속한 메서드만 재전송하고,
+        나머지(예: Start Play Mode 메뉴 실행)는 끊김 예외를 그대로 올린다.
+        """
+        while True:
+            await self.wait_ready()
+            if not self.client.connected:
+                # 감시 태스크가 아직 끊김을 처리하지 않음
+                await self._changed.wait()
+                continue
+            try:
+                return await self.client.call(method, params, timeout)
+            except DISCONNECT_ERRORS:
+                if self._closing or method not in self.replay_methods:
+                    raise
+
+    async def call_many(self, calls, return_exceptions=False):
+        return await asyncio.gather(
+            *(self.call(method, params) for method, params in calls),
+            return_exceptions=return_exceptions,
+        )
@@ -0,0 +1,339 @@
+"""
+Packed NoteData Chart (.notes)
+SongData 차트를 노트당 10바이트 레코드로 담는 메모리 맵 파일 형식
+
+- 레코드: HitTime float32, LaneIndex int8, Type uint8, Duration float32 (패딩 없음, 리틀 엔디언)
+  노트를 dict로 들고 있으면 노트당 200바이트 이상이라 라이브러리 전체 분석이 캐시에 들어가지 않음
+- 헤더: BPM, 박자 위상(phase offset), 곡 길이, 난이도, 구간(Section) 표, 나머지 메타데이터(JSON)
+- 레코드는 HitTime 순으로 정렬해 저장 → 시간 구간 조회는 이진 탐색
+- NumPy가 있으면 mmap 위의 구조화 배열(복사 없음), 없으면 struct로 필요한 레코드만 풀어 씀
+- .asset ↔ .notes 양방향 변환 (Unity YAML 레이아웃 그대로 씀)
+
+    python note_chart.py pack "My project/Assets/Resources/Songs/SimpleTest.asset"
+    python note_chart.py info SimpleTest.notes --window 10 20
+    python note_chart.py unpack SimpleTest.notes -o SimpleTest.asset
+
+    with open_notes("SimpleTest.notes") as chart:
+        chart.records["hit_time"]          # np.ndarray (float32, mmap 뷰)
+        chart.window(10.0, 20.0)           # 10s <= HitTime < 20s
+"""
+
+import argparse
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from bisect import bisect_left
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from song_asset import SONG_DATA_CLASS, find_song_assets, load_song, song_data_guid
+
+NOTES_MAGIC = b"AIBN"
+NOTES_VERSION = 1
+NOTES_EXT = ".notes"
+
+# magic, version, 구간 수, 노트 수, BPM, phase offset, 곡 길이, 난이도, 메타데이터 JSON 길이
+_HEADER = struct.Struct("<4sHHIfffiI")
+# 구간: 이름(UTF-8, 16바이트), StartTime, EndTime, DensityMultiplier
+_SECTION = struct.Struct("<16sfff")
+_NOTE = struct.Struct("<fbBf")
+NOTE_SIZE = _NOTE.size  # 10
+
+NOTE_DTYPE = np.dtype([("hit_time", "<f4"), ("lane", "i1"), ("type", "u1"), ("duration", "<f4")]) if np else None
+
+# 헤더 밖(메타데이터 JSON)에 두는 SongData 필드
+_META_KEYS = ("id", "title", "artist", "audiourl", "audioclip", "genre", "mood", "creatorid")
+
+
+def pack_note(hit_time, lane, note_type, duration):
+    return _NOTE.pack(hit_time, lane, note_type, duration)
+
+
+def unpack_note(data, offset=0):
+    return _NOTE.unpack_from(data, offset)
+
+
+def beat_phase(hit_times, bpm):
+    """노트 시각이 모이는 박자 격자의 위상 (0 <= phase < 60/BPM, 원형 평균)"""
+    if bpm <= 0 or not hit_times:
+        return 0.0
+    beat = 60.0 / bpm
+    x = sum(math.cos(2 * math.pi * t / beat) for t in hit_times)
+    y = sum(math.sin(2 * math.pi * t / beat) for t in hit_times)
+    if abs(x) < 1e-9 and abs(y) < 1e-9:
+        return 0.0
+    phase = (math.atan2(y, x) / (2 * math.pi)) % 1.0 * beat
+    return 0.0 if math.isclose(phase, beat, abs_tol=1e-6) else phase
+
+
+def _section_name(name):
+    encoded = name.encode("utf-8")[:16]
+    return encoded.decode("utf-8", "ignore").encode("utf-8")
+
+
+# ----------------------------------------------------------------------
+# 쓰기 / 읽기
+# ----------------------------------------------------------------------
+def write_notes(song, path, phase_offset=None):
+    """load_song() 형태의 dict를 .notes 파일로 저장 (노트는 HitTime 순으로 안정 정렬)"""
+    notes = sorted(song["notes"], key=lambda n: n[0])
+    sections = song.get("sections", [])
+    if len(sections) > 0xFFFF:
+        raise ValueError(f"too many sections: {len(sections)}")
+    if phase_offset is None:
+        phase_offset = beat_phase([n[0] for n in notes], song.get("bpm", 0.0))
+    meta = json.dumps({key: song.get(key, "") for key in _META_KEYS}, ensure_ascii=False).encode("utf-8")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(NOTES_MAGIC, NOTES_VERSION, len(sections), len(notes), song.get("bpm", 0.0),
+                             phase_offset, song.get("duration", 0.0), song.get("difficulty", 0), len(meta)))
+        for name, start, end, density in sections:
+            f.write(_SECTION.pack(_section_name(name), start, end, density))
+        f.write(meta)
+        f.write(b"".join(_NOTE.pack(*note) for note in notes))
+    os.replace(tmp, path)
+    return path
+
+
+class _HitTimes:
+    """bisect용: i번째 레코드의 HitTime만 읽는 시퀀스"""
+
+    def __init__(self, buffer, offset, count):
+        self.buffer, self.offset, self.count = buffer, offset, count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return struct.unpack_from("<f", self.buffer, self.offset + i * NOTE_SIZE)[0]
+
+
+class NoteChart:
+    """
+    mmap으로 연 .notes 파일
+    records: NumPy 구조화 배열 (NumPy 없으면 None), notes(): (hit_time, lane, type, duration) 튜플
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"{self.path}: not a .notes file")
+        (magic, version, section_count, self.count, self.bpm, self.phase_offset, self.duration,
+         self.difficulty, meta_len) = _HEADER.unpack_from(self._mmap)
+        if magic != NOTES_MAGIC or version != NOTES_VERSION:
+            raise ValueError(f"{self.path}: not a version {NOTES_VERSION} .notes file")
+        offset = _HEADER.size
+        self.sections = []
+        for _ in range(section_count):
+            name, start, end, density = _SECTION.unpack_from(self._mmap, offset)
+            self.sections.append((name.rstrip(b"\0").decode("utf-8", "replace"), start, end, density))
+            offset += _SECTION.size
+        self.meta = json.loads(self._mmap[offset:offset + meta_len].decode("utf-8"))
+        self._offset = offset + meta_len
+        if len(self._mmap) != self._offset + self.count * NOTE_SIZE:
+            raise ValueError(f"{self.path}: truncated ({len(self._mmap)} bytes)")
+        self.hit_times = _HitTimes(self._mmap, self._offset, self.count)
+        self.records = (np.frombuffer(self._mmap, dtype=NOTE_DTYPE, count=self.count, offset=self._offset)
+                        if np is not None else None)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.records = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # 밖에서 records 뷰를 아직 쓰는 중이면 GC가 닫음
+
+    def notes(self, start=0, stop=None):
+        """start..stop 번째 레코드를 튜플로 풀어 반환"""
+        stop = self.count if stop is None else min(stop, self.count)
+        begin, end = self._offset + start * NOTE_SIZE, self._offset + stop * NOTE_SIZE
+        return list(_NOTE.iter_unpack(memoryview(self._mmap)[begin:end]))
+
+    def index_range(self, start_time, end_time):
+        """start_time <= HitTime < end_time 인 레코드 범위 (이진 탐색)"""
+        if self.records is not None:
+            hit = self.records["hit_time"]
+            lo, hi = np.searchsorted(hit, [start_time, end_time], side="left")
+            return int(lo), int(hi)
+        return bisect_left(self.hit_times, start_time), bisect_left(self.hit_times, end_time)
+
+    def window(self, start_time, end_time):
+        """시간 구간의 노트 (NumPy면 복사 없는 레코드 뷰, 아니면 튜플 목록)"""
+        lo, hi = self.index_range(start_time, end_time)
+        return self.records[lo:hi] if self.records is not None else self.notes(lo, hi)
+
+    def song(self):
+        """load_song()과 같은 형태의 dict"""
+        song = {key: self.meta.get(key, "") for key in _META_KEYS}
+        song.update({"path": str(self.path), "bpm": self.bpm, "duration": self.duration,
+                     "difficulty": self.difficulty, "phase_offset": self.phase_offset,
+                     "sections": list(self.sections), "notes": self.notes()})
+        return song
+
+
+def open_notes(path):
+    return NoteChart(path)
+
+
+# ----------------------------------------------------------------------
+# .asset ↔ .notes
+# ----------------------------------------------------------------------
+def _f32_repr(value):
+    """float32 값을 되돌렸을 때 같은 값이 되는 가장 짧은 표기 (Unity 직렬화와 같은 "3.6", "30")"""
+    target = struct.unpack("<f", struct.pack("<f", value))[0]
+    for digits in range(1, 10):
+        text = f"{target:.{digits}g}"
+        if struct.unpack("<f", struct.pack("<f", float(text)))[0] == target:
+            break
+    else:
+        text = repr(target)
+    text = repr(float(text))  # "1e+02" → "100.0"
+    return text[:-2] if text.endswith(".0") else text
+
+
+def _yaml_str(value):
+    """Unity처럼 필요할 때만 따옴표 (비ASCII는 \\u 이스케이프)"""
+    value = str(value)
+    if value == "":
+        return ""
+    if value.isascii() and value.strip() == value and not any(c in value for c in ":#'\"{}[],&*!|>%@`\\") \
+            and value[0] not in "-?":
+        return value
+    return re.sub(r"\\u[0-9a-f]{4}", lambda m: m.group(0).upper().replace("\\U", "\\u"), json.dumps(value))
+
+
+def asset_text(song, name, guid):
+    """load_song() 형태의 dict → SongData .asset YAML"""
+    lines = [
+        "%YAML 1.1",
+        "%TAG !u! tag:unity3d.com,2011:",
+        "--- !u!114 &11400000",
+        "MonoBehaviour:",
+        "  m_ObjectHideFlags: 0",
+        "  m_CorrespondingSourceObject: {fileID: 0}",
+        "  m_PrefabInstance: {fileID: 0}",
+        "  m_PrefabAsset: {fileID: 0}",
+        "  m_GameObject: {fileID: 0}",
+        "  m_Enabled: 1",
+        "  m_EditorHideFlags: 0",
+        f"  m_Script: {{fileID: 11500000, guid: {guid}, type: 3}}",
+        f"  m_Name: {name}",
+        f"  m_EditorClassIdentifier: Assembly-CSharp:{SONG_DATA_CLASS}",
+        f"  Id: {_yaml_str(song.get('id', ''))}",
+        f"  Title: {_yaml_str(song.get('title', ''))}",
+        f"  Artist: {_yaml_str(song.get('artist', ''))}",
+        f"  BPM: {_f32_repr(song.get('bpm', 0.0))}",
+        f"  Duration: {_f32_repr(song.get('duration', 0.0))}",
+        f"  AudioUrl: {_yaml_str(song.get('audiourl', ''))}",
+        f"  AudioClip: {song.get('audioclip') or '{fileID: 0}'}",
+    ]
+    sections = song.get("sections", [])
+    lines.append("  Sections:" if sections else "  Sections: []")
+    for section_name, start, end, density in sections:
+        lines += [f"  - Name: {_yaml_str(section_name)}", f"    StartTime: {_f32_repr(start)}",
+                  f"    EndTime: {_f32_repr(end)}", f"    DensityMultiplier: {_f32_repr(density)}"]
+    notes = song.get("notes", [])
+    lines.append("  Notes:" if notes else "  Notes: []")
+    for hit_time, lane, note_type, duration in notes:
+        lines += [f"  - HitTime: {_f32_repr(hit_time)}", f"    LaneIndex: {lane}", f"    Type: {note_type}",
+                  f"    Duration: {_f32_repr(duration)}"]
+    lines += [
+        f"  Difficulty: {song.get('difficulty', 0)}",
+        f"  Genre: {_yaml_str(song.get('genre', ''))}",
+        f"  Mood: {_yaml_str(song.get('mood', ''))}",
+        f"  CreatorId: {_yaml_str(song.get('creatorid', ''))}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def pack_asset(asset_path, out_path=None):
+    """SongData .asset → .notes (기본: asset 옆에 같은 이름)"""
+    out_path = Path(out_path) if out_path else Path(asset_path).with_suffix(NOTES_EXT)
+    return write_notes(load_song(asset_path), out_path)
+
+
+def unpack_notes(notes_path, asset_path, project_path="My project"):
+    """.notes → SongData .asset (m_Script는 프로젝트의 SongData.cs guid, phase offset은 SongData에 없어 버림)"""
+    guid = song_data_guid(project_path)
+    if guid is None:
+        raise FileNotFoundError(f"SongData.cs.meta not found under {project_path}")
+    with open_notes(notes_path) as chart:
+        song = chart.song()
+    asset_path = Path(asset_path)
+    tmp = asset_path.with_suffix(asset_path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        f.write(asset_text(song, asset_path.stem, guid))
+    os.replace(tmp, asset_path)
+    return asset_path
+
+
+def print_info(chart, window=None):
+    print(f"🎵 {chart.meta.get('title', '')} ({chart.path.name}): {len(chart)} notes, "
+          f"{len(chart) * NOTE_SIZE} bytes of records, BPM {chart.bpm:g}, phase {chart.phase_offset * 1000:.1f}ms, "
+          f"difficulty {chart.difficulty}")
+    for name, start, end, density in chart.sections:
+        lo, hi = chart.index_range(start, end)
+        print(f"    {name or '-'}: {start:g}-{end:g}s x{density:g}, {hi - lo} notes")
+    if window:
+        lo, hi = chart.index_range(*window)
+        print(f"    window {window[0]:g}-{window[1]:g}s: notes {lo}..{hi} ({hi - lo})")
+        for hit_time, lane, note_type, duration in chart.notes(lo, hi):
+            print(f"      {hit_time:8.3f}s  lane {lane}  type {note_type}  duration {duration:g}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Packed memory-mapped NoteData charts (.notes)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    pack = sub.add_parser("pack", help="SongData .asset -> .notes")
+    pack.add_argument("assets", nargs="*", help="SongData .asset files (default: every SongData in the project)")
+    pack.add_argument("--project", default="My project")
+    pack.add_argument("-o", "--output-dir", help="write .notes files here instead of next to the assets")
+    unpack = sub.add_parser("unpack", help=".notes -> SongData .asset")
+    unpack.add_argument("notes")
+    unpack.add_argument("-o", "--output", required=True)
+    unpack.add_argument("--project", default="My project")
+    info = sub.add_parser("info", help="print header, sections and an optional time window")
+    info.add_argument("notes", nargs="+")
+    info.add_argument("--window", nargs=2, type=float, metavar=("START", "END"))
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        assets = args.assets or [str(p) for p in find_song_assets(args.project)]
+        for asset in assets:
+            out = Path(args.output_dir) / (Path(asset).stem + NOTES_EXT) if args.output_dir else None
+            path = pack_asset(asset, out)
+            print(f"📦 {asset} -> {path} ({path.stat().st_size} bytes)")
+    elif args.command == "unpack":
+        path = unpack_notes(args.notes, args.output, args.project)
+        print(f"📄 {args.notes} -> {path}")
+    else:
+        for notes in args.notes:
+            with open_notes(notes) as chart:
+                print_info(chart, args.window)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
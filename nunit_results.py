@@ -0,0 +1,162 @@
+"""
+NUnit TestResults.xml Streaming Parser
+Unity Test Framework가 만드는 NUnit3 결과를 iterparse로 한 번 훑어 테스트별 결과를 뽑음
+
+- 끝난 요소는 곧바로 부모에서 떼어내므로 결과 파일 크기와 상관없이 메모리 일정
+- 테스트별: 이름, 전체 이름, fixture, 결과, 시간, 실패 메시지
+- 요약: 결과별 개수, 총 시간, 카테고리(메서드 이름 접두어)별 시간, 가장 느린 테스트 N개
+
+    for case in iter_test_cases("My project/TestResults.xml"):
+        print(case["fullname"], case["outcome"], case["duration"])
+
+    python nunit_results.py "My project/TestResults.xml" --top 10
+"""
+
+import argparse
+import heapq
+import sys
+import xml.etree.ElementTree as ET
+
+# NUnit result -> test_results 상태
+OUTCOMES = {"Passed": "passed", "Failed": "failed", "Skipped": "skipped", "Inconclusive": "skipped"}
+MAX_MESSAGE = 2000
+
+
+def _outcome(result):
+    # "Failed(Child)" 같은 라벨 붙은 값도 처리
+    return OUTCOMES.get((result or "").split("(")[0].split(":")[0], "failed")
+
+
+def iter_test_cases(path, run_info=None):
+    """
+    test-case 하나씩 dict로 반환
+    run_info: dict를 주면 test-run 요소의 속성(total, duration 등)을 채워 줌
+    """
+    stack = []
+    fixtures = []
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag == "test-run" and run_info is not None:
+                run_info.update(elem.attrib)
+            elif elem.tag == "test-suite":
+                fixtures.append(elem.get("fullname") if elem.get("type") in ("TestFixture", "ParameterizedFixture")
+                                else (fixtures[-1] if fixtures else None))
+            continue
+
+        stack.pop()
+        if elem.tag == "test-case":
+            message = elem.findtext("failure/message") or elem.findtext("reason/message") or ""
+            yield {
+                "name": elem.get("name"),
+                "fullname": elem.get("fullname") or elem.get("name"),
+                "fixture": elem.get("classname") or (fixtures[-1] if fixtures else None),
+                "outcome": _outcome(elem.get("result")),
+                "result": elem.get("result"),
+                "duration": float(elem.get("duration") or 0.0),
+                "message": message.strip()[:MAX_MESSAGE],
+            }
+        elif elem.tag == "test-suite":
+            fixtures.pop()
+        else:
+            # failure/message 등 test-case 안쪽 요소는 test-case가 끝날 때 읽음
+            continue
+        if stack:
+            stack[-1].remove(elem)
+        elem.clear()
+
+
+def _category(case):
+    return (case["name"] or "").split("_", 1)[0].split("(", 1)[0]
+
+
+class ResultSummary:
+    """스트리밍으로 받은 테스트 결과 요약 (느린 테스트는 크기 top인 힙으로만 보관)"""
+
+    def __init__(self, top=10):
+        self.top = top
+        self.counts = {"passed": 0, "failed": 0, "skipped": 0}
+        self.total_duration = 0.0
+        self.categories = {}
+        self.failures = []
+        self._slowest = []
+        self._seq = 0
+
+    def add(self, case):
+        self.counts[case["outcome"]] = self.counts.get(case["outcome"], 0) + 1
+        self.total_duration += case["duration"]
+        category = self.categories.setdefault(_category(case), {"tests": 0, "duration": 0.0})
+        category["tests"] += 1
+        category["duration"] += case["duration"]
+        if case["outcome"] == "failed":
+            self.failures.append({"test": case["fullname"], "message": case["message"]})
+        self._seq += 1
+        item = (case["duration"], -self._seq, case["fullname"])
+        if len(self._slowest) < self.top:
+            heapq.heappush(self._slowest, item)
+        elif item > self._slowest[0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def slowest(self):
+        return [{"test": name, "duration_ms": round(duration * 1000, 1)}
+                for duration, _, name in sorted(self._slowest, reverse=True)]
+
+    def to_dict(self):
+        total = sum(self.counts.values())
+        return {
+            "total": total,
+            **self.counts,
+            "duration_s": round(self.total_duration, 3),
+            "slowest": self.slowest(),
+            "categories": {
+                name: {"tests": c["tests"], "duration_ms": round(c["duration"] * 1000, 1),
+                       "share": f"{c['duration'] / self.total_duration * 100:.1f}%" if self.total_duration else "0%"}
+                for name, c in sorted(self.categories.items(), key=lambda kv: -kv[1]["duration"])
+            },
+            "failures": self.failures,
+        }
+
+
+def summarize(path, top=10, on_case=None):
+    """결과 파일 한 번 훑기. on_case(case)가 있으면 테스트마다 호출"""
+    run_info = {}
+    summary = ResultSummary(top)
+    for case in iter_test_cases(path, run_info):
+        summary.add(case)
+        if on_case is not None:
+            on_case(case)
+    data = summary.to_dict()
+    data["run"] = {k: run_info[k] for k in ("result", "start-time", "end-time", "duration", "shards")
+                   if k in run_info}
+    return data
+
+
+def print_summary(data):
+    print(f"🧪 EditMode results: {data['total']} tests, {data['passed']} passed, "
+          f"{data['failed']} failed, {data['skipped']} skipped ({data['duration_s']:.2f}s in tests)")
+    for failure in data["failures"][:5]:
+        first_line = failure["message"].splitlines()[0] if failure["message"] else ""
+        print(f"  ❌ {failure['test']}: {first_line}")
+    if data["slowest"]:
+        print("  🐢 Slowest tests:")
+        for item in data["slowest"]:
+            print(f"    {item['duration_ms']:>9.1f} ms  {item['test']}")
+    if data["categories"]:
+        print("  ⏱️  Time by category:")
+        for name, c in list(data["categories"].items())[:8]:
+            print(f"    {name:<20}{c['duration_ms']:>9.1f} ms  {c['share']:>6}  ({c['tests']} tests)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a Unity NUnit TestResults.xml")
+    parser.add_argument("results", nargs="?", default="My project/TestResults.xml")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest tests to list")
+    args = parser.parse_args()
+
+    data = summarize(args.results, args.top)
+    print_summary(data)
+    return 1 if data["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,41 +1,11 @@
 import asyncio
-import json
-import sys
 
-try:
-    import websockets
-except ImportError:
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "websockets"])
-    import websockets
-
-class UnityMCPClient:
-    def __init__(self, uri="ws://localhost:8090/McpUnity"):
-        self.uri = uri
-        self.ws = None
-        self.request_id = 0
-    
-    async def connect(self):
-        self.ws = await websockets.connect(self.uri, close_timeout=5, max_size=1024*1024, ping_interval=None)
-        print("Connected to Unity MCP")
-    
-    async def close(self):
-        if self.ws:
-            await self.ws.close()
-    
-    async def call(self, method, params=None):
-        self.request_id += 1
-        request = {
-            "id": str(self.request_id),
-            "method": method,
-            "params": params or {}
-        }
-        await self.ws.send(json.dumps(request))
-        response = await asyncio.wait_for(self.ws.recv(), timeout=30)
-        return json.loads(response)
+from mcp_readiness import Readiness, load_scene, play_mode_entered
+from mcp_session import MCPSession
 
 async def play_game():
-    client = UnityMCPClient()
+    client = MCPSession()
+    probes = Readiness()
     await client.connect()
     
     print("\n" + "="*60)
@@ -44,14 +14,9 @@ async def play_game():
     
     # 1. Gameplay 씬 로드
     print("\n[1] Loading Gameplay scene...")
-    result = await client.call("load_scene", {
-        "scenePath": "Assets/Scenes/Gameplay.unity",
-        "loadMode": "Single"
-    })
+    result = await load_scene(client, "Assets/Scenes/Gameplay.unity", probes)
     print(f"    Result: {result.get('result', {}).get('success', False)}")
     
-    await asyncio.sleep(1)
-    
     # 2. 씬 정보 확인
     print("\n[2] Scene info before play...")
     result = await client.call("get_scene_info")
@@ -62,6 +27,7 @@ async def play_game():
     
     # 3. 커스텀 메뉴로 플레이 모드 시작
     print("\n[3] Starting Play Mode...")
+    mark = client.drops
     try:
         result = await client.call("execute_menu_item", {
             "menuPath": "Tools/A.I. BEAT/Start Play Mode"
@@ -73,6 +39,11 @@ async def play_game():
         else:
             print(f"    Error: {e}")
     
+    try:
+        await probes.wait_until(play_mode_entered(client, mark), name="enter play mode")
+    except asyncio.TimeoutError as e:
+        print(f"    Warning: {e}")
+    
     # 4. 플레이 모드 중... (Unity에서 게임 실행 중)
     print("\n[4] Game is running in Unity Editor!")
     print("    - Watch the Unity Game window")
@@ -83,23 +54,24 @@ async def play_game():
         await asyncio.sleep(1)
     print()
     
-    # 5. 재연결 후 플레이 모드 중지
-    print("\n[5] Reconnecting to stop play mode...")
+    # 5. 플레이 모드 중지 (세션이 재연결될 때까지 자동 대기)
+    print("\n[5] Stopping play mode...")
+    mark = client.drops
     try:
-        await client.connect()
         result = await client.call("execute_menu_item", {
             "menuPath": "Tools/A.I. BEAT/Stop Play Mode"
         })
         print(f"    Stop command sent: {result.get('result', {}).get('success', False)}")
     except Exception as e:
-        print(f"    Note: {e}")
-    
-    await asyncio.sleep(2)
+        if "4001" in str(e) or "Play mode" in str(e):
+            print("    Play Mode stopped! (Connection closed as expected)")
+        else:
+            print(f"    Note: {e}")
     
-    # 6. 최종 상태 확인
+    # 6. 최종 상태 확인 (도메인 리로드가 끝나는 즉시 진행)
     print("\n[6] Final state check...")
     try:
-        await client.connect()
+        await client.wait_for_reload(since=mark)
         result = await client.call("get_scene_info")
         if "result" in result:
             scene = result["result"].get("activeScene", {})
@@ -109,6 +81,8 @@ async def play_game():
     except Exception as e:
         print(f"    Could not reconnect: {e}")
     
+    probes.print_summary()
+    
     print("\n" + "="*60)
     print("Play Mode Test Complete!")
     print("="*60)
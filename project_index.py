@@ -0,0 +1,224 @@
+"""
+Unity Project File Index
+"My project" 폴더를 os.scandir로 한 번만 훑어 (경로, 크기, mtime, 확장자) 색인
+
+UnityGameTester 검사들은 디스크를 직접 rglob/exists/open 하지 않고 이 색인을 조회한다.
+- Library, Temp 등 에디터 캐시 폴더는 검사 대상이 아니므로 순회하지 않음
+- 색인은 .test_cache/project_index.json 에 저장되고, 다음 실행에서는 크기/mtime이
+  그대로인 파일의 해시 등 파생 정보를 재사용 (바뀐 파일만 다시 읽음)
+- 같은 프로세스 안의 검사들은 get_index()로 하나의 색인과 파일 내용 캐시를 공유
+
+    index = get_index("My project")
+    index.exists("Assets/Scripts/Core/GameManager.cs")
+    index.files("Assets/Scripts", ext=".cs")
+    index.read_text("Assets/Scripts/Data/SongData.cs")
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+INDEX_VERSION = 1
+DEFAULT_CACHE_DIR = Path(".test_cache")
+
+# 프로젝트 루트 바로 아래에서 건너뛰는 폴더 (에디터 생성물)
+SKIP_ROOT_DIRS = frozenset({"Library", "Temp", "Logs", "obj", "UserSettings", "Build", "Builds"})
+SKIP_DIRS = frozenset({".git", ".vs", ".idea"})
+
+
+def _ext(name):
+    return os.path.splitext(name)[1].lower()
+
+
+def _parent(rel):
+    return rel.rpartition("/")[0]
+
+
+class ProjectIndex:
+    def __init__(self, project_path="My project", cache_dir=DEFAULT_CACHE_DIR):
+        self.project_path = Path(project_path)
+        self.cache_file = Path(cache_dir) / "project_index.json"
+        self.entries = {}  # rel -> {"size", "mtime_ns", "ext", "sha1"(선택)}
+        self.dirs = set()
+        self.last_stats = {}
+        self._text = {}
+
+    # ------------------------------------------------------------------
+    # 색인 구축 / 저장
+    # ------------------------------------------------------------------
+    def load(self):
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION or data.get("project") != str(self.project_path.resolve()):
+            return False
+        self.entries = data["files"]
+        self.dirs = set(data["dirs"])
+        return True
+
+    def save(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_file.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "project": str(self.project_path.resolve()),
+                "files": self.entries,
+                "dirs": sorted(self.dirs),
+            }, f, ensure_ascii=False)
+        os.replace(tmp, self.cache_file)
+
+    def refresh(self):
+        """
+        프로젝트를 한 번 순회해 색인 갱신
+        크기/mtime이 같은 파일은 이전 항목(해시 포함)을 그대로 유지한다.
+        """
+        started = time.perf_counter()
+        previous = self.entries
+        files = {}
+        dirs = set()
+        stats = {"added": 0, "changed": 0, "unchanged": 0}
+
+        stack = [("", self.project_path)]
+        while stack:
+            rel_dir, path = stack.pop()
+            try:
+                it = os.scandir(path)
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name in SKIP_DIRS or (not rel_dir and entry.name in SKIP_ROOT_DIRS):
+                                continue
+                            dirs.add(rel)
+                            stack.append((rel, entry.path))
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    old = previous.get(rel)
+                    if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                        files[rel] = old
+                        stats["unchanged"] += 1
+                        continue
+                    files[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ext": _ext(entry.name)}
+                    stats["changed" if old else "added"] += 1
+                    self._text.pop(rel, None)
+
+        stats["removed"] = len(previous.keys() - files.keys())
+        for rel in previous.keys() - files.keys():
+            self._text.pop(rel, None)
+        self.entries = files
+        self.dirs = dirs
+        stats["files"] = len(files)
+        stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self.last_stats = stats
+        return stats
+
+    # ------------------------------------------------------------------
+    # 조회 (디스크 접근 없음)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _norm(rel):
+        return str(rel).replace("\\", "/").strip("/")
+
+    def path(self, rel):
+        return self.project_path / self._norm(rel)
+
+    def exists(self, rel):
+        rel = self._norm(rel)
+        return rel in self.entries or rel in self.dirs or rel == ""
+
+    def is_dir(self, rel):
+        rel = self._norm(rel)
+        return rel in self.dirs or rel == ""
+
+    def size(self, rel):
+        entry = self.entries.get(self._norm(rel))
+        return entry["size"] if entry else None
+
+    def mtime_ns(self, rel):
+        entry = self.entries.get(self._norm(rel))
+        return entry["mtime_ns"] if entry else None
+
+    def files(self, under="", ext=None, recursive=True):
+        """under 아래 파일 목록 (ext: ".cs" 또는 (".mp3", ".wav"))"""
+        under = self._norm(under)
+        prefix = under + "/" if under else ""
+        exts = (ext,) if isinstance(ext, str) else ext
+        result = []
+        for rel, entry in self.entries.items():
+            if not rel.startswith(prefix):
+                continue
+            if not recursive and _parent(rel) != under:
+                continue
+            if exts and entry["ext"] not in exts:
+                continue
+            result.append(rel)
+        return sorted(result)
+
+    def children(self, under="", ext=None):
+        """under 바로 아래 항목 (ext 지정 시 해당 확장자 파일만)"""
+        under = self._norm(under)
+        entries = self.files(under, ext=ext, recursive=False)
+        if ext is None:
+            entries += [d for d in self.dirs if _parent(d) == under]
+        return sorted(entries)
+
+    def count(self, under=""):
+        """under 아래 모든 파일/폴더 수 (Path.rglob("*")와 같은 기준)"""
+        under = self._norm(under)
+        prefix = under + "/" if under else ""
+        return (sum(1 for rel in self.entries if rel.startswith(prefix))
+                + sum(1 for rel in self.dirs if rel.startswith(prefix)))
+
+    # ------------------------------------------------------------------
+    # 내용 (한 번만 읽고 공유)
+    # ------------------------------------------------------------------
+    def read_text(self, rel, encoding="utf-8"):
+        rel = self._norm(rel)
+        if rel not in self._text:
+            with open(self.path(rel), "r", encoding=encoding) as f:
+                self._text[rel] = f.read()
+        return self._text[rel]
+
+    def sha1(self, rel):
+        """파일 내용 해시. 크기/mtime이 그대로면 저장된 값을 재사용"""
+        rel = self._norm(rel)
+        entry = self.entries.get(rel)
+        if entry is None:
+            return None
+        if "sha1" not in entry:
+            h = hashlib.sha1()
+            with open(self.path(rel), "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            entry["sha1"] = h.hexdigest()
+        return entry["sha1"]
+
+
+_indexes = {}
+
+
+def get_index(project_path="My project", cache_dir=DEFAULT_CACHE_DIR, refresh=False):
+    """프로세스 안에서 공유하는 색인 (처음 호출 시 로드 + 증분 갱신 + 저장)"""
+    key = (str(Path(project_path).resolve()), str(cache_dir))
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = ProjectIndex(project_path, cache_dir)
+        index.load()
+        refresh = True
+    if refresh:
+        index.refresh()
+        try:
+            index.save()
+        except OSError:
+            pass
+    return index
@@ -1,41 +1,12 @@
 import asyncio
 import json
-import sys
 
-try:
-    import websockets
-except ImportError:
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "websockets"])
-    import websockets
-
-class UnityMCPClient:
-    def __init__(self, uri="ws://localhost:8090/McpUnity"):
-        self.uri = uri
-        self.ws = None
-        self.request_id = 0
-    
-    async def connect(self):
-        self.ws = await websockets.connect(self.uri, close_timeout=5, max_size=1024*1024, ping_interval=None)
-        print("Connected to Unity MCP")
-    
-    async def close(self):
-        if self.ws:
-            await self.ws.close()
-    
-    async def call(self, method, params=None):
-        self.request_id += 1
-        request = {
-            "id": str(self.request_id),
-            "method": method,
-            "params": params or {}
-        }
-        await self.ws.send(json.dumps(request))
-        response = await asyncio.wait_for(self.ws.recv(), timeout=30)
-        return json.loads(response)
+from mcp_readiness import Readiness, load_scene, play_mode_entered
+from mcp_session import MCPSession
 
 async def test_with_recompile():
-    client = UnityMCPClient()
+    client = MCPSession()
+    probes = Readiness()
     await client.connect()
     
     print("\n" + "="*60)
@@ -44,32 +15,26 @@ async def test_with_recompile():
     
     # 1. 스크립트 재컴파일 트리거
     print("\n[1] Triggering script recompilation...")
-    result = await client.call("recompile_scripts", {})
-    print(f"    Result: {json.dumps(result, indent=2)[:200]}")
-    
-    # 2. 재컴파일 대기
-    print("\n[2] Waiting for recompilation (5 seconds)...")
-    for i in range(5, 0, -1):
-        print(f"    {i}...", end=" ", flush=True)
-        await asyncio.sleep(1)
-    print()
+    mark = client.drops
+    try:
+        result = await client.call("recompile_scripts", {})
+        print(f"    Result: {json.dumps(result, indent=2)[:200]}")
+    except Exception as e:
+        print(f"    Connection closed during recompile: {e}")
     
-    # 3. 재연결
-    print("\n[3] Reconnecting...")
-    await client.connect()
+    # 2~3. 재컴파일(도메인 리로드) 완료 및 재연결 대기
+    print("\n[2-3] Waiting for recompilation and reconnect...")
+    reloaded = await client.wait_for_reload(since=mark)
+    print(f"    {'Domain reloaded, reconnected' if reloaded else 'No reload detected'}")
     
     # 4. MainMenu 씬 로드
     print("\n[4] Loading MainMenu scene...")
-    result = await client.call("load_scene", {
-        "scenePath": "Assets/Scenes/MainMenu.unity",
-        "loadMode": "Single"
-    })
+    result = await load_scene(client, "Assets/Scenes/MainMenu.unity", probes)
     print(f"    Result: {result.get('result', {}).get('success', False)}")
     
-    await asyncio.sleep(1)
-    
     # 5. 플레이 모드 시작
     print("\n[5] Starting Play Mode...")
+    mark = client.drops
     try:
         result = await client.call("execute_menu_item", {
             "menuPath": "Tools/A.I. BEAT/Start Play Mode"
@@ -81,6 +46,11 @@ async def test_with_recompile():
         else:
             print(f"    Error: {e}")
     
+    try:
+        await probes.wait_until(play_mode_entered(client, mark), name="enter play mode")
+    except asyncio.TimeoutError as e:
+        print(f"    Warning: {e}")
+    
     # 6. 5초 대기
     print("\n[6] Watch Unity Game window - BIT.jpg should be visible!")
     for i in range(5, 0, -1):
@@ -91,7 +61,6 @@ async def test_with_recompile():
     # 7. 플레이 모드 중지
     print("\n[7] Stopping Play Mode...")
     try:
-        await client.connect()
         result = await client.call("execute_menu_item", {
             "menuPath": "Tools/A.I. BEAT/Stop Play Mode"
         })
@@ -99,6 +68,7 @@ async def test_with_recompile():
     except Exception as e:
         print(f"    {e}")
     
+    probes.print_summary()
     await client.close()
     
     print("\n" + "="*60)
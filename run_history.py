@@ -0,0 +1,409 @@
+"""
+Test Run History (SQLite)
+테스트 실행 결과를 덮어쓰지 않고 .test_cache/run_history.db 에 계속 쌓아 두는 저장소
+
+- runs:        실행 하나 (스위트, 시각, git 커밋/브랜치/dirty, 환경 정보, 요약, 보고서 JSON)
+- checks:      실행별 검사/테스트 상태와 시간 (kind = "check": 스케줄러 검사, "test": test_results 항목)
+- mcp_latency: 실행별 MCP 메서드 지연 시간 (p50/p95/p99), 호출/오류/타임아웃 수
+- 추가 전용: UPDATE/DELETE는 트리거로 막음
+- 실행 하나는 트랜잭션 하나, 행은 executemany로 한 번에 기록
+
+JSON 보고서(game_test_report.json, unity_test_report.json)는 저장소의 뷰로 다시 만든다.
+(해당 스위트의 마지막 실행 보고서 + 마지막 MCP 지표)
+
+    history = RunHistory()
+    history.record("test_unity_game", report)
+    history.write_view("unity_test_report.json")
+
+    python run_history.py flaky                 # 최근 실행에서 통과/실패가 오간 검사
+    python run_history.py trend script_integrity
+    python run_history.py first-fail editor_tests
+    python run_history.py export unity_test_report.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from project_index import DEFAULT_CACHE_DIR
+
+SCHEMA_VERSION = 1
+DEFAULT_DB = DEFAULT_CACHE_DIR / "run_history.db"
+MCP_SUITE = "mcp"
+# 보고서 파일 -> 그 파일을 쓰는 스위트 (뷰는 이 중 가장 최근 실행)
+REPORT_SUITES = {
+    "game_test_report.json": ("test_game_direct",),
+    "unity_test_report.json": ("test_unity_game", "test_game"),
+}
+# git 변경 여부 검사에서 제외 (실행이 스스로 다시 쓰는 파일)
+GENERATED_EXCLUDES = tuple(f":!*{name}" for name in REPORT_SUITES)
+PASSED = ("passed", "covered", "cached")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    suite       TEXT NOT NULL,
+    timestamp   TEXT NOT NULL,
+    created     REAL NOT NULL,
+    commit_sha  TEXT,
+    branch      TEXT,
+    dirty       INTEGER,
+    environment TEXT,
+    summary     TEXT,
+    report      TEXT
+);
+CREATE TABLE IF NOT EXISTS checks (
+    run_id      INTEGER NOT NULL REFERENCES runs(id),
+    kind        TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    status      TEXT,
+    duration_ms REAL
+);
+CREATE TABLE IF NOT EXISTS mcp_latency (
+    run_id      INTEGER NOT NULL REFERENCES runs(id),
+    method      TEXT NOT NULL,
+    calls       INTEGER,
+    errors      INTEGER,
+    timeouts    INTEGER,
+    p50_ms      REAL,
+    p95_ms      REAL,
+    p99_ms      REAL,
+    max_ms      REAL
+);
+CREATE INDEX IF NOT EXISTS runs_suite ON runs(suite, id);
+CREATE INDEX IF NOT EXISTS runs_commit ON runs(commit_sha);
+CREATE INDEX IF NOT EXISTS checks_name ON checks(name, run_id);
+CREATE INDEX IF NOT EXISTS checks_run ON checks(run_id);
+CREATE INDEX IF NOT EXISTS mcp_method ON mcp_latency(method, run_id);
+"""
+
+APPEND_ONLY = [
+    f"CREATE TRIGGER IF NOT EXISTS {table}_no_{op.lower()} BEFORE {op} ON {table} "
+    f"BEGIN SELECT RAISE(ABORT, 'run history is append-only'); END;"
+    for table in ("runs", "checks", "mcp_latency") for op in ("UPDATE", "DELETE")
+]
+
+
+def git_info(path="."):
+    """(커밋, 브랜치, 작업 트리 변경 여부). git을 쓸 수 없으면 (None, None, None)"""
+    def git(*args):
+        result = subprocess.run(["git", "-C", str(path), *args], capture_output=True, text=True, timeout=10)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+        return result.stdout.strip()
+
+    try:
+        commit = git("rev-parse", "HEAD")
+        branch = git("rev-parse", "--abbrev-ref", "HEAD")
+        # 실행마다 다시 쓰는 보고서 파일은 변경으로 치지 않음
+        dirty = bool(git("status", "--porcelain", "--untracked-files=no", "--", ".", *GENERATED_EXCLUDES))
+    except (OSError, RuntimeError, subprocess.TimeoutExpired):
+        return None, None, None
+    return commit, branch, dirty
+
+
+def environment(**extra):
+    env = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "host": platform.node(),
+        "cpu_count": os.cpu_count(),
+    }
+    env.update({k: v for k, v in extra.items() if v is not None})
+    return env
+
+
+def _check_rows(report):
+    """보고서에서 (kind, name, status, duration_ms) 행"""
+    rows = []
+    scheduler = report.get("scheduler") or {}
+    checks = scheduler.get("checks") or {}
+    for name, info in checks.items():
+        rows.append(("check", name, info.get("status"), info.get("elapsed_ms")))
+    for result in report.get("test_results") or report.get("details") or []:
+        # 스케줄러 검사가 test_results에도 같은 이름으로 남는 경우는 "check" 행만 둠
+        if isinstance(result, dict) and result.get("test") and result["test"] not in checks:
+            rows.append(("test", result["test"], result.get("status"), result.get("duration_ms")))
+    return rows
+
+
+def _mcp_rows(metrics):
+    rows = []
+    for method, stats in (metrics.get("methods") or {}).items():
+        rows.append((method, stats.get("calls"), stats.get("errors"), stats.get("timeouts"),
+                     stats.get("p50_ms"), stats.get("p95_ms"), stats.get("p99_ms"), stats.get("max_ms")))
+    return rows
+
+
+class RunHistory:
+    def __init__(self, path=DEFAULT_DB, repo="."):
+        self.path = Path(path)
+        self.repo = repo
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        # 여러 테스트 스크립트가 동시에 기록해도 읽기가 막히지 않게
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.executescript(SCHEMA)
+            for statement in APPEND_ONLY:
+                self.db.execute(statement)
+            self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def record(self, suite, report, **env):
+        """실행 하나를 기록하고 run id 반환 (테스트 보고서의 mcp_metrics는 MCP 실행에서만 기록)"""
+        commit, branch, dirty = git_info(self.repo)
+        body = {k: v for k, v in report.items() if k != "mcp_metrics" or suite == MCP_SUITE}
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO runs (suite, timestamp, created, commit_sha, branch, dirty, environment, summary, report)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (suite, report.get("timestamp") or time.strftime("%Y-%m-%d %H:%M:%S"), time.time(),
+                 commit, branch, None if dirty is None else int(dirty), json.dumps(environment(**env)),
+                 json.dumps(report.get("summary"), ensure_ascii=False),
+                 json.dumps(body, ensure_ascii=False)))
+            run_id = cursor.lastrowid
+            self.db.executemany(
+                "INSERT INTO checks (run_id, kind, name, status, duration_ms) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in _check_rows(report)])
+            if report.get("mcp_metrics") and suite == MCP_SUITE:
+                self._insert_mcp(run_id, report["mcp_metrics"])
+        return run_id
+
+    def record_mcp(self, metrics, **env):
+        """MCPMetrics.report() 결과를 MCP 실행으로 기록"""
+        return self.record(MCP_SUITE, {"timestamp": metrics.get("timestamp"), "mcp_metrics": metrics,
+                                       "summary": metrics.get("total")}, **env)
+
+    def _insert_mcp(self, run_id, metrics):
+        self.db.executemany(
+            "INSERT INTO mcp_latency (run_id, method, calls, errors, timeouts, p50_ms, p95_ms, p99_ms, max_ms)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(run_id, *row) for row in _mcp_rows(metrics)])
+
+    # ------------------------------------------------------------------
+    # 뷰
+    # ------------------------------------------------------------------
+    def latest_run(self, suites):
+        marks = ",".join("?" * len(suites))
+        return self.db.execute(f"SELECT * FROM runs WHERE suite IN ({marks}) ORDER BY id DESC LIMIT 1",
+                               tuple(suites)).fetchone()
+
+    def latest_mcp_metrics(self):
+        row = self.latest_run((MCP_SUITE,))
+        return json.loads(row["report"]).get("mcp_metrics") if row else None
+
+    def render(self, report_path):
+        """보고서 파일 이름에 해당하는 뷰 (마지막 실행 + 마지막 MCP 지표)"""
+        suites = REPORT_SUITES.get(Path(report_path).name, (Path(report_path).stem,))
+        row = self.latest_run(suites)
+        report = json.loads(row["report"]) if row else {"project": "A.I. BEAT"}
+        if row:
+            report["run"] = {"id": row["id"], "suite": row["suite"], "commit": row["commit_sha"],
+                             "branch": row["branch"], "dirty": bool(row["dirty"]) if row["dirty"] is not None else None}
+        metrics = self.latest_mcp_metrics()
+        if metrics:
+            report["mcp_metrics"] = metrics
+        return report
+
+    def write_view(self, report_path):
+        report = self.render(report_path)
+        tmp = Path(str(report_path) + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, report_path)
+        return report
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def flaky_checks(self, window=20, suite=None):
+        """
+        최근 window번 실행 안에서 통과와 실패가 모두 나온 검사/테스트
+        flips: 연속된 두 실행 사이 상태가 바뀐 횟수, same_commit: 같은 커밋(깨끗한 트리)에서 결과가 갈린 경우
+        """
+        rows = self.db.execute(
+            """
+            WITH recent AS (
+                SELECT id, commit_sha, dirty FROM runs
+                WHERE suite != ? AND (? IS NULL OR suite = ?)
+                ORDER BY id DESC LIMIT ?
+            ), statuses AS (
+                SELECT c.kind, c.name, r.id, r.commit_sha, r.dirty,
+                       CASE WHEN c.status IN ('passed', 'covered', 'cached') THEN 1 ELSE 0 END AS ok
+                FROM checks c JOIN recent r ON r.id = c.run_id
+                WHERE c.status != 'skipped'
+            ), flips AS (
+                SELECT kind, name, commit_sha, dirty, ok,
+                       ok != LAG(ok) OVER (PARTITION BY kind, name ORDER BY id) AS flipped
+                FROM statuses
+            )
+            SELECT kind, name, COUNT(*) AS runs, SUM(ok) AS passed, COUNT(*) - SUM(ok) AS failed,
+                   COALESCE(SUM(flipped), 0) AS flips,
+                   (SELECT COUNT(*) FROM (
+                        SELECT commit_sha FROM flips f2
+                        WHERE f2.kind = flips.kind AND f2.name = flips.name AND f2.dirty = 0 AND f2.commit_sha IS NOT NULL
+                        GROUP BY commit_sha HAVING MIN(ok) = 0 AND MAX(ok) = 1)) AS same_commit
+            FROM flips GROUP BY kind, name
+            HAVING SUM(ok) > 0 AND SUM(ok) < COUNT(*)
+            ORDER BY same_commit DESC, flips DESC, name
+            """, (MCP_SUITE, suite, suite, window)).fetchall()
+        return [dict(row) for row in rows]
+
+    def duration_trend(self, name, limit=20):
+        """검사/테스트 하나의 최근 시간 (오래된 순) + 앞/뒤 절반 중앙값 비교"""
+        rows = self.db.execute(
+            "SELECT r.id, r.timestamp, r.commit_sha, c.status, c.duration_ms FROM checks c "
+            "JOIN runs r ON r.id = c.run_id WHERE c.name = ? AND c.duration_ms IS NOT NULL "
+            "ORDER BY c.run_id DESC LIMIT ?", (name, limit)).fetchall()
+        points = [dict(row) for row in reversed(rows)]
+        durations = [p["duration_ms"] for p in points]
+        half = len(durations) // 2
+        trend = {"name": name, "points": points}
+        if half:
+            before, after = _median(durations[:half]), _median(durations[half:])
+            trend.update({"median_before_ms": before, "median_after_ms": after,
+                          "change": f"{(after - before) / before * 100:+.1f}%" if before else None})
+        return trend
+
+    def last_green_commit(self, name, suites=None):
+        """name 검사가 변경 없는 트리에서 마지막으로 통과한 커밋 (없으면 None)"""
+        sql = ("SELECT r.commit_sha FROM checks c JOIN runs r ON r.id = c.run_id "
+               f"WHERE c.kind = 'check' AND c.name = ? AND c.status IN ({','.join('?' * len(PASSED))}) "
+               "AND r.dirty = 0 AND r.commit_sha IS NOT NULL")
+        params = [name, *PASSED]
+        if suites:
+            sql += f" AND r.suite IN ({','.join('?' * len(suites))})"
+            params += list(suites)
+        row = self.db.execute(sql + " ORDER BY c.run_id DESC LIMIT 1", params).fetchone()
+        return row["commit_sha"] if row else None
+
+    def first_failing_commit(self, name):
+        """
+        마지막으로 통과한 실행 이후 처음 실패한 실행의 커밋 (git bisect 범위: last_pass..first_fail)
+        지금 통과 중이면 None
+        """
+        rows = self.db.execute(
+            "SELECT r.id, r.timestamp, r.commit_sha, r.dirty, c.status FROM checks c "
+            "JOIN runs r ON r.id = c.run_id WHERE c.name = ? AND c.status != 'skipped' "
+            "ORDER BY c.run_id DESC", (name,)).fetchall()
+        if not rows or rows[0]["status"] in PASSED:
+            return None
+        first_fail, last_pass = rows[0], None
+        for row in rows[1:]:
+            if row["status"] in PASSED:
+                last_pass = row
+                break
+            first_fail = row
+        return {
+            "name": name,
+            "first_fail": {k: first_fail[k] for k in ("id", "timestamp", "commit_sha", "dirty")},
+            "last_pass": {k: last_pass[k] for k in ("id", "timestamp", "commit_sha")} if last_pass else None,
+        }
+
+
+def _median(values):
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def _import_legacy_metrics(history, report_path):
+    """저장소가 생기기 전 보고서 파일에 있던 MCP 지표를 한 번만 옮겨 옴"""
+    try:
+        with open(report_path, "r", encoding="utf-8") as f:
+            metrics = json.load(f).get("mcp_metrics")
+    except (OSError, ValueError, AttributeError):
+        return
+    if isinstance(metrics, dict):
+        history.record_mcp(metrics, imported_from=str(report_path))
+
+
+def save_report(suite, report, report_path, **env):
+    """
+    실행을 기록하고 보고서 뷰를 다시 씀
+    저장소를 열 수 없으면 (디스크 잠금 등) 보고서만 직접 씀
+    """
+    try:
+        with RunHistory() as history:
+            if history.latest_run((MCP_SUITE,)) is None:
+                _import_legacy_metrics(history, report_path)
+            history.record(suite, report, **env)
+            return history.write_view(report_path)
+    except sqlite3.Error as e:
+        print(f"⚠️  Run history unavailable ({e}), writing report directly")
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the local test run history")
+    parser.add_argument("--db", default=str(DEFAULT_DB))
+    sub = parser.add_subparsers(dest="command", required=True)
+    flaky = sub.add_parser("flaky", help="checks that both passed and failed in recent runs")
+    flaky.add_argument("--window", type=int, default=20)
+    flaky.add_argument("--suite")
+    trend = sub.add_parser("trend", help="duration trend of one check or test")
+    trend.add_argument("name")
+    trend.add_argument("--limit", type=int, default=20)
+    first = sub.add_parser("first-fail", help="first failing commit of a check or test")
+    first.add_argument("name")
+    export = sub.add_parser("export", help="rewrite a JSON report from the store")
+    export.add_argument("report", choices=sorted(REPORT_SUITES))
+    args = parser.parse_args()
+
+    with RunHistory(args.db) as history:
+        if args.command == "flaky":
+            rows = history.flaky_checks(args.window, args.suite)
+            if not rows:
+                print("No flaky checks")
+            for row in rows:
+                print(f"  {row['kind']:<6}{row['name']:<40} {row['passed']:>3} passed {row['failed']:>3} failed "
+                      f"{row['flips']:>3} flips  same-commit: {row['same_commit']}")
+        elif args.command == "trend":
+            data = history.duration_trend(args.name, args.limit)
+            for point in data["points"]:
+                print(f"  #{point['id']:<5} {point['timestamp']}  {(point['commit_sha'] or '-')[:10]}  "
+                      f"{point['duration_ms']:>9.1f} ms  {point['status']}")
+            if "change" in data:
+                print(f"  median {data['median_before_ms']:.1f} -> {data['median_after_ms']:.1f} ms ({data['change']})")
+        elif args.command == "first-fail":
+            data = history.first_failing_commit(args.name)
+            if data is None:
+                print(f"{args.name}: passing (or no history)")
+                return 0
+            fail, good = data["first_fail"], data["last_pass"]
+            print(f"{args.name}: first failed in run #{fail['id']} at {fail['commit_sha']}"
+                  f"{' (dirty tree)' if fail['dirty'] else ''} ({fail['timestamp']})")
+            if good:
+                print(f"  last passed in run #{good['id']} at {good['commit_sha']} "
+                      f"-> git bisect start {(fail['commit_sha'] or '')[:10]} {(good['commit_sha'] or '')[:10]}")
+        else:
+            history.write_view(args.report)
+            print(f"💾 {args.report} rewritten from {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
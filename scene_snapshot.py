@@ -0,0 +1,318 @@
+"""
+Scene Hierarchy Snapshot Cache
+씬 계층 구조 스냅샷을 디스크에 저장하고 실행 간 변경분만 다시 조회
+
+- .unity 파일의 mtime/해시가 그대로면 에디터 조회 없이 캐시를 반환
+- 파일이 바뀌었으면 .unity YAML에서 루트 오브젝트별 서브트리 해시를 계산해
+  해시가 달라진 루트만 다시 순회하고 나머지는 캐시를 재사용
+- 각 노드는 (자신 + 자식) 내용 해시를 가지며, 이전 스냅샷과의 구조 차이를 출력
+
+    cache = SceneSnapshotCache()
+    snapshot, diff = await cache.refresh(client, "Assets/Scenes/Gameplay.unity", probes)
+    print_diff(diff)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from mcp_batch import child_path, get_game_object, walk_hierarchy
+from mcp_readiness import load_scene
+
+DEFAULT_CACHE_DIR = Path(".mcp_cache") / "scenes"
+SNAPSHOT_VERSION = 1
+
+# 에디터 세션마다 바뀌는 값은 노드 해시에서 제외
+VOLATILE_KEYS = frozenset({"instanceId", "instanceID", "InstanceId"})
+
+DOC_HEADER = re.compile(r"^--- !u!(\d+) &(-?\d+)")
+GAME_OBJECT_REF = re.compile(r"^\s*m_GameObject: \{fileID: (-?\d+)")
+FATHER_REF = re.compile(r"^\s*m_Father: \{fileID: (-?\d+)")
+NAME_FIELD = re.compile(r"^\s*m_Name: ?(.*)$")
+CHILD_REF = re.compile(r"^\s*- \{fileID: (-?\d+)\}")
+
+CLASS_GAME_OBJECT = "1"
+TRANSFORM_CLASSES = frozenset({"4", "224"})  # Transform, RectTransform
+
+
+def sha1(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def file_sha1(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def unity_root_hashes(scene_file):
+    """
+    .unity 파일을 한 번 읽어 {루트 오브젝트 이름: 서브트리 해시} 반환
+
+    GameObject 문서와 그 컴포넌트 문서(m_GameObject로 연결)를 묶어 오브젝트 해시를 만들고,
+    Transform의 m_Father/m_Children으로 트리를 구성한다. 어느 오브젝트에도 속하지 않는
+    문서(렌더 설정, 프리팹 인스턴스 등)는 "" 키로 묶는다.
+    """
+    docs = {}        # fileID -> (class_id, text)
+    owner = {}       # 컴포넌트 fileID -> GameObject fileID
+    names = {}       # GameObject fileID -> name
+    father = {}      # Transform fileID -> 부모 Transform fileID
+    transform_of = {}  # Transform fileID -> GameObject fileID
+    children = {}    # Transform fileID -> [자식 Transform fileID]
+
+    current = None
+    lines = []
+
+    def flush():
+        if current is None:
+            return
+        class_id, file_id = current
+        docs[file_id] = (class_id, "".join(lines))
+        in_children = False
+        for line in lines:
+            if class_id == CLASS_GAME_OBJECT:
+                m = NAME_FIELD.match(line)
+                if m and file_id not in names:
+                    names[file_id] = m.group(1).strip()
+                continue
+            m = GAME_OBJECT_REF.match(line)
+            if m:
+                owner[file_id] = m.group(1)
+                if class_id in TRANSFORM_CLASSES:
+                    transform_of[file_id] = m.group(1)
+                continue
+            if class_id in TRANSFORM_CLASSES:
+                if line.lstrip().startswith("m_Children:"):
+                    in_children = True
+                    children.setdefault(file_id, [])
+                    continue
+                if in_children:
+                    m = CHILD_REF.match(line)
+                    if m:
+                        children[file_id].append(m.group(1))
+                        continue
+                    in_children = False
+                m = FATHER_REF.match(line)
+                if m:
+                    father[file_id] = m.group(1)
+
+    with open(scene_file, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            m = DOC_HEADER.match(line)
+            if m:
+                flush()
+                current = (m.group(1), m.group(2))
+                lines = [line]
+            elif current is not None:
+                lines.append(line)
+    flush()
+
+    # 오브젝트별 텍스트 해시 (GameObject + 소속 컴포넌트)
+    own = {go: [docs[go][1]] for go, (class_id, _) in docs.items() if class_id == CLASS_GAME_OBJECT}
+    loose = []
+    for file_id, (class_id, text) in docs.items():
+        if class_id == CLASS_GAME_OBJECT:
+            continue
+        go = owner.get(file_id)
+        if go in own:
+            own[go].append(text)
+        else:
+            loose.append(text)
+
+    subtree_cache = {}
+
+    def subtree(transform_id, seen=()):
+        if transform_id in subtree_cache:
+            return subtree_cache[transform_id]
+        go = transform_of.get(transform_id)
+        h = hashlib.sha1()
+        for text in own.get(go, []):
+            h.update(text.encode("utf-8"))
+        for child in children.get(transform_id, []):
+            if child not in seen:
+                h.update(subtree(child, seen + (transform_id,)).encode("ascii"))
+        subtree_cache[transform_id] = h.hexdigest()
+        return subtree_cache[transform_id]
+
+    roots = {}
+    for transform_id, parent in father.items():
+        if parent != "0":
+            continue
+        name = names.get(transform_of.get(transform_id), "")
+        if not name or name in roots:
+            # 이름 없는/중복 루트는 경로로 구분할 수 없음 -> 분류 불가 묶음으로
+            loose.append(subtree(transform_id))
+            continue
+        roots[name] = subtree(transform_id)
+    roots[""] = sha1("".join(sorted(loose)).encode("utf-8"))
+    return roots
+
+
+def node_own_hash(data):
+    stable = {k: v for k, v in data.items() if k != "children" and k not in VOLATILE_KEYS}
+    return sha1(json.dumps(stable, sort_keys=True, default=str).encode("utf-8"))
+
+
+def build_nodes(responses):
+    """walk_hierarchy 결과 {path: response} -> {path: {"hash", "self_hash", "data", "children"}}"""
+    nodes = {}
+    for path, response in responses.items():
+        if not response or "result" not in response:
+            continue
+        data = response["result"]
+        nodes[path] = {
+            "self_hash": node_own_hash(data),
+            "data": {k: v for k, v in data.items() if k != "children"},
+            "children": [c.get("name") for c in data.get("children") or [] if c.get("name")],
+        }
+    compute_subtree_hashes(nodes)
+    return nodes
+
+
+def compute_subtree_hashes(nodes):
+    """자식부터 (자신 해시 + 자식 해시)로 서브트리 해시 계산"""
+    for path in sorted(nodes, key=lambda p: len(p.rstrip("/").split("/")), reverse=True):
+        node = nodes[path]
+        h = hashlib.sha1(node["self_hash"].encode("ascii"))
+        for name in node["children"]:
+            child = nodes.get(child_path(path, name))
+            if child is not None:
+                h.update(child["hash"].encode("ascii"))
+        node["hash"] = h.hexdigest()
+
+
+def diff_snapshots(old_nodes, new_nodes):
+    """구조 차이: [(kind, path)] (kind: added / removed / changed)"""
+    old_nodes = old_nodes or {}
+    diff = []
+    for path in sorted(new_nodes.keys() - old_nodes.keys()):
+        diff.append(("added", path))
+    for path in sorted(old_nodes.keys() - new_nodes.keys()):
+        diff.append(("removed", path))
+    for path in sorted(new_nodes.keys() & old_nodes.keys()):
+        if new_nodes[path]["self_hash"] != old_nodes[path]["self_hash"]:
+            diff.append(("changed", path))
+    return diff
+
+
+def print_diff(diff, limit=30):
+    if not diff:
+        print("    Hierarchy unchanged")
+        return
+    symbols = {"added": "+", "removed": "-", "changed": "~"}
+    counts = {kind: sum(1 for k, _ in diff if k == kind) for kind in symbols}
+    print(f"    Hierarchy diff: +{counts['added']} -{counts['removed']} ~{counts['changed']}")
+    for kind, path in diff[:limit]:
+        print(f"      {symbols[kind]} {path}")
+    if len(diff) > limit:
+        print(f"      ... and {len(diff) - limit} more")
+
+
+class SceneSnapshotCache:
+    def __init__(self, project_path="My project", cache_dir=DEFAULT_CACHE_DIR):
+        self.project_path = Path(project_path)
+        self.cache_dir = Path(cache_dir)
+        self.last_stats = {}
+
+    def _cache_file(self, scene_path):
+        key = sha1(scene_path.encode("utf-8"))[:16]
+        return self.cache_dir / f"{Path(scene_path).stem}-{key}.json"
+
+    def load(self, scene_path):
+        try:
+            with open(self._cache_file(scene_path), "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("scene_path") != scene_path:
+            return None
+        return snapshot
+
+    def save(self, snapshot):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        target = self._cache_file(snapshot["scene_path"])
+        tmp = target.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp, target)
+
+    def file_state(self, scene_path, previous=None):
+        """.unity 파일 상태 (mtime/size가 같으면 이전 해시 재사용). 파일이 없으면 None"""
+        scene_file = self.project_path / scene_path
+        try:
+            st = scene_file.stat()
+        except OSError:
+            return None
+        if previous and previous.get("mtime_ns") == st.st_mtime_ns and previous.get("size") == st.st_size:
+            return previous
+        return {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha1": file_sha1(scene_file),
+            "roots": unity_root_hashes(scene_file),
+        }
+
+    async def refresh(self, client, scene_path, probes, force=False):
+        """
+        스냅샷 갱신 후 (snapshot, diff) 반환
+        씬 파일이 그대로면 에디터에 아무 요청도 보내지 않는다.
+        """
+        old = None if force else self.load(scene_path)
+        old_state = old.get("file") if old else None
+        state = self.file_state(scene_path, old_state)
+
+        if old and state and old_state and state["sha1"] == old_state["sha1"]:
+            self.last_stats = {"scene": scene_path, "source": "cache", "fetched_roots": 0}
+            return old, []
+
+        await load_scene(client, scene_path, probes)
+        info, root = await asyncio.gather(
+            client.call("get_scene_info"),
+            get_game_object(client, "/"),
+        )
+        scene_info = info.get("result", {}).get("activeScene", {})
+        root_children = root.get("result", {}).get("children") or []
+        root_names = [c["name"] for c in root_children if c.get("name")]
+
+        reusable = set()
+        if old and state and old_state and old_state["roots"].get("") == state["roots"].get(""):
+            reusable = {
+                name for name in root_names
+                if name in state["roots"] and old_state["roots"].get(name) == state["roots"][name]
+            }
+
+        responses = {"/": root}
+        fetched = [name for name in root_names if name not in reusable]
+        for name in fetched:
+            responses.update(await walk_hierarchy(client, "/" + name))
+
+        nodes = build_nodes(responses)
+        for name in reusable:
+            prefix = "/" + name
+            for path, node in old["nodes"].items():
+                if path == prefix or path.startswith(prefix + "/"):
+                    nodes[path] = node
+        compute_subtree_hashes(nodes)
+
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "scene_path": scene_path,
+            "file": state,
+            "scene_info": scene_info,
+            "nodes": nodes,
+        }
+        # 파일이 없는 씬은 변경 여부를 알 수 없으므로 다음 실행에서 다시 조회
+        if state is not None:
+            self.save(snapshot)
+        self.last_stats = {
+            "scene": scene_path,
+            "source": "live",
+            "fetched_roots": len(fetched),
+            "reused_roots": len(reusable),
+        }
+        return snapshot, diff_snapshots(old["nodes"] if old else None, nodes)
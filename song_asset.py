@@ -0,0 +1,311 @@
+"""
+SongData Asset Reader
+Unity가 직렬화한 SongData ScriptableObject(.asset, YAML)에서 차트 정보를 읽음
+
+- 일반 YAML 로더 없이 SongData 레이아웃(Title, Artist, BPM, Duration, Sections, Notes)만 줄 단위로 해석
+- 노트마다 dict를 만들지 않고 NoteData 필드를 열(array)에 바로 채움
+  (HitTime/Duration: float32, LaneIndex: int8, Type: uint8 — C# float과 같은 정밀도)
+- 파싱 결과는 .test_cache/songs/<asset sha1>.chart 에 열 단위 바이너리로 저장하고,
+  같은 내용의 asset은 다음부터 파싱 없이 mmap으로 엶 (열은 복사 없는 memoryview)
+
+    chart = load_chart("My project/Assets/Resources/Songs/SimpleTest.asset")
+    print(chart.meta["title"], len(chart), chart.hit_time[0])
+
+    song = load_song(path)      # 기존 dict 형태 (notes: [(hit_time, lane, type, duration)])
+
+    for path in find_song_assets("My project"):
+        ...
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+
+from project_index import DEFAULT_CACHE_DIR, get_index
+
+SONG_DATA_SCRIPT = "Assets/Scripts/Data/SongData.cs"
+SONG_DATA_CLASS = "AIBeat.Data:SongData"
+
+# NoteType enum 순서
+TAP, LONG, SCRATCH = range(3)
+NOTE_TYPE_NAMES = ("Tap", "Long", "Scratch")
+
+DEFAULT_CHART_CACHE = DEFAULT_CACHE_DIR / "songs"
+CACHE_MAGIC = b"AIBC"
+CACHE_VERSION = 2
+# magic, version, 리틀 엔디언 여부, 노트 수, 메타데이터(JSON) 길이
+_HEADER = struct.Struct("<4sHHII")
+
+_SCALAR_FIELDS = {"Id": str, "Title": str, "Artist": str, "BPM": float, "Duration": float,
+                  "AudioUrl": str, "AudioClip": str, "Difficulty": int, "Genre": str, "Mood": str, "CreatorId": str}
+_NOTE_COLUMNS = {b"HitTime": 0, b"LaneIndex": 1, b"Type": 2, b"Duration": 3}
+_NOTE_CASTS = (float, int, int, float)
+_SECTION_FIELDS = ("Name", "StartTime", "EndTime", "DensityMultiplier")
+
+
+def _unquote(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        # Unity는 비ASCII 문자를 "\uD55C" 같은 이스케이프로 씀
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value[1:-1]
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'")
+    return value
+
+
+def _number(value, cast=float):
+    try:
+        return cast(value)
+    except ValueError:
+        try:
+            return cast(float(value))
+        except ValueError:
+            return cast(0)
+
+
+def _empty_meta():
+    return {"id": "", "title": "", "artist": "", "bpm": 0.0, "duration": 0.0, "audiourl": "", "audioclip": "",
+            "difficulty": 0, "genre": "", "mood": "", "creatorid": "", "sections": []}
+
+
+class Chart:
+    """
+    SongData 한 곡: meta(제목, BPM, 구간 등) + NoteData 열
+    hit_time/duration은 float32, lane은 int8, note_type은 uint8 열 (array 또는 mmap 위의 memoryview)
+    """
+
+    def __init__(self, meta, hit_time, lane, note_type, duration, path=None, cached=False):
+        self.meta = meta
+        self.hit_time = hit_time
+        self.lane = lane
+        self.note_type = note_type
+        self.duration = duration
+        self.path = path
+        self.cached = cached  # True면 캐시에서 mmap으로 연 것
+
+    def __len__(self):
+        return len(self.hit_time)
+
+    def notes(self):
+        """[(hit_time, lane, type, duration)] — load_song()의 notes 형태"""
+        return list(zip(self.hit_time, self.lane, self.note_type, self.duration))
+
+    def to_song(self):
+        song = dict(self.meta)
+        song["sections"] = [tuple(s) for s in self.meta["sections"]]
+        song["notes"] = self.notes()
+        song["path"] = str(self.path)
+        return song
+
+
+# ----------------------------------------------------------------------
+# 스트리밍 파서
+# ----------------------------------------------------------------------
+def _column(typecode, values, cast):
+    try:
+        return array(typecode, map(cast, values))
+    except ValueError:
+        return array(typecode, [_number(v, cast) for v in values])
+
+
+def parse_song(lines, path=None):
+    """
+    SongData YAML 줄(bytes) 순회 → Chart
+    Notes 목록은 필드별 값 목록에 모았다가 끝에서 한 번에 타입 배열로 변환한다.
+    (빠진 필드는 새 항목("  - ")을 만날 때 기본값 0으로 채움)
+    """
+    meta = _empty_meta()
+    raw = {key: [] for key in _NOTE_COLUMNS}
+    buckets = tuple(raw.values())
+    count = 0
+    section = None
+    list_name = None
+
+    def flush_section():
+        if section is not None:
+            meta["sections"].append((_unquote(section.get("Name", "")), _number(section.get("StartTime", "0")),
+                                     _number(section.get("EndTime", "0")),
+                                     _number(section.get("DensityMultiplier", "1"))))
+
+    for line in lines:
+        if list_name is not None:
+            if line.startswith(b"  - ") or line.startswith(b"    "):
+                key, _, value = line[4:].partition(b":")
+                if list_name == "Notes":
+                    if line[2] == 0x2D:  # "-" → 새 NoteData
+                        for bucket in buckets:
+                            del bucket[count:]
+                            if len(bucket) < count:
+                                bucket.append(b"0")
+                        count += 1
+                    bucket = raw.get(key)
+                    if bucket is not None and count:
+                        bucket.append(value)
+                else:
+                    if line[2] == 0x2D:
+                        flush_section()
+                        section = {}
+                    if section is not None:
+                        section[key.decode("utf-8", "replace")] = value.decode("utf-8", "replace").strip()
+                continue
+            if list_name == "Sections":
+                flush_section()
+            list_name, section = None, None
+        if not line.startswith(b"  ") or line[2:3] in (b" ", b"-"):
+            continue
+        key, sep, value = line[2:].partition(b":")
+        if not sep:
+            continue
+        key = key.decode("utf-8", "replace")
+        if key in ("Notes", "Sections"):
+            # "Sections: []" 는 빈 목록
+            list_name = key if value.strip() != b"[]" else None
+        elif key in _SCALAR_FIELDS:
+            cast = _SCALAR_FIELDS[key]
+            text = value.decode("utf-8", "replace")
+            meta[key.lower()] = _unquote(text) if cast is str else _number(text.strip(), cast)
+    if list_name == "Sections":
+        flush_section()
+    for bucket in buckets:
+        del bucket[count:]
+        bucket.extend([b"0"] * (count - len(bucket)))
+    columns = [_column(code, bucket, cast) for code, bucket, cast in zip("fbBf", buckets, _NOTE_CASTS)]
+    return Chart(meta, *columns, path=path)
+
+
+# ----------------------------------------------------------------------
+# 열 단위 바이너리 캐시
+# ----------------------------------------------------------------------
+def asset_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def write_chart_cache(chart, cache_file):
+    """헤더 + 메타데이터 JSON(4바이트 정렬) + hit_time, duration, lane, note_type 열"""
+    meta = json.dumps(chart.meta, ensure_ascii=False).encode("utf-8")
+    meta += b" " * (-(_HEADER.size + len(meta)) % 4)
+    cache_file = Path(cache_file)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, sys.byteorder == "little", len(chart), len(meta)))
+        f.write(meta)
+        for column in (chart.hit_time, chart.duration, chart.lane, chart.note_type):
+            f.write(column.tobytes() if isinstance(column, array) else bytes(column))
+    os.replace(tmp, cache_file)
+
+
+def open_chart_cache(cache_file, path=None):
+    """캐시 파일을 mmap으로 열어 Chart 반환 (형식이 다르거나 깨졌으면 None)"""
+    try:
+        with open(cache_file, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mapped) < _HEADER.size:
+        return None
+    magic, version, little, count, meta_len = _HEADER.unpack_from(mapped)
+    offset = _HEADER.size + meta_len
+    if (magic != CACHE_MAGIC or version != CACHE_VERSION or bool(little) != (sys.byteorder == "little")
+            or len(mapped) != offset + count * 10):
+        return None
+    try:
+        meta = json.loads(mapped[_HEADER.size:offset].decode("utf-8"))
+    except ValueError:
+        return None
+    view = memoryview(mapped)
+    hit_time = view[offset:offset + 4 * count].cast("f")
+    duration = view[offset + 4 * count:offset + 8 * count].cast("f")
+    lane = view[offset + 8 * count:offset + 9 * count].cast("b")
+    note_type = view[offset + 9 * count:offset + 10 * count]
+    return Chart(meta, hit_time, lane, note_type, duration, path=path, cached=True)
+
+
+def load_chart(path, cache_dir=DEFAULT_CHART_CACHE, use_cache=True):
+    """asset 내용 해시로 캐시를 찾고, 없으면 스트리밍 파싱 후 캐시에 저장"""
+    if not use_cache:
+        with open(path, "rb") as f:
+            return parse_song(f, path)
+    cache_file = Path(cache_dir) / f"{asset_hash(path)}.chart"
+    chart = open_chart_cache(cache_file, path)
+    if chart is not None:
+        return chart
+    with open(path, "rb") as f:
+        chart = parse_song(f, path)
+    try:
+        write_chart_cache(chart, cache_file)
+    except OSError:
+        pass
+    return chart
+
+
+def load_song(path, cache_dir=DEFAULT_CHART_CACHE, use_cache=True):
+    """
+    반환: {"title", "artist", "bpm", "duration", "difficulty", "sections": [(이름, 시작, 끝, 밀도)],
+           "notes": [(hit_time, lane, type, duration)]}
+    """
+    return load_chart(path, cache_dir, use_cache).to_song()
+
+
+def is_song_asset(text_head, guid=None):
+    return SONG_DATA_CLASS in text_head or (guid is not None and f"guid: {guid}" in text_head)
+
+
+def song_data_guid(project_path="My project"):
+    try:
+        meta = (Path(project_path) / (SONG_DATA_SCRIPT + ".meta")).read_text(encoding="utf-8")
+    except OSError:
+        return None
+    match = re.search(r"^guid:\s*(\w+)", meta, re.MULTILINE)
+    return match.group(1) if match else None
+
+
+def find_song_assets(project_path="My project"):
+    """프로젝트의 SongData .asset 경로 (m_Script가 SongData.cs인 것)"""
+    index = get_index(project_path)
+    guid = song_data_guid(project_path)
+    songs = []
+    for rel in index.files("Assets", ext=".asset"):
+        with open(index.path(rel), "r", encoding="utf-8", errors="replace") as f:
+            head = f.read(1024)
+        if is_song_asset(head, guid):
+            songs.append(index.path(rel))
+    return songs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load SongData assets (streaming parse + binary chart cache)")
+    parser.add_argument("assets", nargs="*", help="SongData .asset files (default: every SongData in the project)")
+    parser.add_argument("--project", default="My project")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CHART_CACHE))
+    parser.add_argument("--no-cache", action="store_true", help="always parse the YAML")
+    args = parser.parse_args()
+
+    assets = args.assets or [str(p) for p in find_song_assets(args.project)]
+    for path in assets:
+        started = time.perf_counter()
+        chart = load_chart(path, args.cache_dir, not args.no_cache)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"🎵 {chart.meta['title']} ({Path(path).name}): {len(chart)} notes, "
+              f"{len(chart.meta['sections'])} sections, BPM {chart.meta['bpm']:g} "
+              f"— {'mmap cache' if chart.cached else 'parsed'} in {elapsed:.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
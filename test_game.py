@@ -4,34 +4,59 @@ Unity Game Test Automation for A.I. BEAT
 Tests Unity rhythm game functionality
 """
 
+import argparse
 import os
 import sys
-import json
 import time
 from pathlib import Path
 
+from check_cache import CheckCache, ScopedResults, listing
+from check_scheduler import DEFAULT_WORKERS, CheckScheduler
+from csharp_index import get_symbol_index
+from judgement import JUDGEMENT_SOURCE, RESULT_NAMES, JudgementConfig, judge_one, score_one
+from project_index import get_index
+from run_history import save_report
+
 class UnityGameTester:
-    def __init__(self, project_path="My project"):
+    REQUIRED_DIRS = [
+        "Assets/Scripts",
+        "Assets/Scenes", 
+        "Assets/Prefabs",
+        "Assets/Resources",
+        "ProjectSettings"
+    ]
+
+    CRITICAL_SCRIPTS = [
+        "Core/GameManager.cs",
+        "Gameplay/GameplayController.cs",
+        "Gameplay/Note.cs",
+        "Gameplay/NoteSpawner.cs",
+        "Gameplay/JudgementSystem.cs",
+        "Gameplay/InputHandler.cs",
+        "Data/SongData.cs",
+        "Data/NoteData.cs"
+    ]
+
+    EDITOR_TESTS = "Assets/Scripts/Editor/AIBeatEditorTests.cs"
+
+    def __init__(self, project_path="My project", use_cache=True, max_workers=DEFAULT_WORKERS):
         self.project_path = Path(project_path)
-        self.test_results = []
+        self.index = get_index(self.project_path)
+        # 입력 파일이 그대로인 검사는 이전 결과 재사용
+        self.cache = CheckCache(self.index, enabled=use_cache)
+        self.symbols = get_symbol_index(self.project_path)
+        self.max_workers = max_workers
+        self.scheduler = None
+        self.test_results = ScopedResults()
     
     def check_unity_project_structure(self):
         """Check Unity project structure"""
         print("Checking Unity project structure...")
         
-        required_dirs = [
-            "Assets/Scripts",
-            "Assets/Scenes", 
-            "Assets/Prefabs",
-            "Assets/Resources",
-            "ProjectSettings"
-        ]
-        
         all_good = True
-        for dir_name in required_dirs:
-            dir_path = self.project_path / dir_name
-            if dir_path.exists():
-                file_count = len(list(dir_path.rglob("*")))
+        for dir_name in self.REQUIRED_DIRS:
+            if self.index.is_dir(dir_name):
+                file_count = self.index.count(dir_name)
                 print(f"  OK {dir_name} - {file_count} files")
             else:
                 print(f"  MISSING {dir_name}")
@@ -43,24 +68,11 @@ class UnityGameTester:
         """Check if Unity scripts are properly structured"""
         print("\nChecking script integrity...")
         
-        critical_scripts = [
-            "Core/GameManager.cs",
-            "Gameplay/GameplayController.cs",
-            "Gameplay/Note.cs",
-            "Gameplay/NoteSpawner.cs",
-            "Gameplay/JudgementSystem.cs",
-            "Gameplay/InputHandler.cs",
-            "Data/SongData.cs",
-            "Data/NoteData.cs"
-        ]
-        
-        scripts_path = self.project_path / "Assets" / "Scripts"
         missing = []
         available = []
         
-        for script in critical_scripts:
-            script_path = scripts_path / script
-            if script_path.exists():
+        for script in self.CRITICAL_SCRIPTS:
+            if self.index.exists(f"Assets/Scripts/{script}"):
                 available.append(script)
                 print(f"  OK {script}")
             else:
@@ -78,12 +90,8 @@ class UnityGameTester:
         """Analyze Unity test structure"""
         print("\nAnalyzing editor tests...")
         
-        test_file = self.project_path / "Assets" / "Scripts" / "Editor" / "AIBeatEditorTests.cs"
         try:
-            with open(test_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            test_methods = content.count("[Test]")
+            test_methods = len(self.symbols.test_methods(self.EDITOR_TESTS))
             print(f"  Found {test_methods} test methods")
             
             test_categories = [
@@ -92,8 +100,9 @@ class UnityGameTester:
                 "Scene", "Material", "Scripts"
             ]
             
+            counts = self.symbols.category_counts(self.EDITOR_TESTS, test_categories)
             for category in test_categories:
-                count = content.count(f"public void {category}")
+                count = counts[category]
                 if count > 0:
                     print(f"  {category}: {count} tests")
                     self.test_results.append({"category": category, "count": count})
@@ -109,31 +118,19 @@ class UnityGameTester:
         
         try:
             # Test judgement system
+            config = JudgementConfig.from_project(self.project_path)
             hit_time = 1.52
             note_time = 1.50
-            diff = abs(hit_time - note_time)
-            
-            if diff < 0.05:
-                judgement = "Perfect"
-            elif diff < 0.1:
-                judgement = "Great"
-            elif diff < 0.2:
-                judgement = "Good"
-            elif diff < 0.35:
-                judgement = "Bad"
-            else:
-                judgement = "Miss"
+            code, raw_diff = judge_one(hit_time, note_time, config=config)
+            judgement = RESULT_NAMES[code]
+            diff = abs(raw_diff)
             
             print(f"  Judgement: {judgement} (diff: {diff:.3f}s)")
             
             # Test scoring
-            base_score = 1000
+            # 이번 판정(Perfect)으로 콤보가 50이 된 경우 (CalculateScore)
             combo = 50
-            max_combo_bonus = 0.5
-            combo_for_max_bonus = 100
-            
-            combo_bonus = (combo / combo_for_max_bonus) * max_combo_bonus
-            total_score = base_score * (1 + combo_bonus)
+            total_score = score_one(code, combo, config)
             
             print(f"  Score: {total_score:.0f} points (combo: {combo})")
             
@@ -148,34 +145,36 @@ class UnityGameTester:
             print(f"  ERROR: {e}")
             return False
     
+    def _check(self, name, inputs, fn):
+        """캐시를 거쳐 검사를 실행하고 통과/실패 항목을 추가"""
+        ok = self.cache.run(name, inputs, fn, self.test_results)
+        self.test_results.append({"test": name, "status": "passed" if ok else "failed"})
+        return bool(ok)
+    
     def run_full_test_suite(self):
         """Run complete test suite"""
         print("Unity Game Test Suite for A.I. BEAT")
         print("=" * 60)
         
-        # Test 1: Project structure
-        if self.check_unity_project_structure():
-            self.test_results.append({"test": "project_structure", "status": "passed"})
-        else:
-            self.test_results.append({"test": "project_structure", "status": "failed"})
-        
-        # Test 2: Script integrity
-        if self.check_script_integrity():
-            self.test_results.append({"test": "script_integrity", "status": "passed"})
-        else:
-            self.test_results.append({"test": "script_integrity", "status": "failed"})
-        
-        # Test 3: Editor tests
-        if self.analyze_editor_tests():
-            self.test_results.append({"test": "editor_tests", "status": "passed"})
-        else:
-            self.test_results.append({"test": "editor_tests", "status": "failed"})
-        
-        # Test 4: Gameplay simulation
-        if self.run_gameplay_simulation():
-            self.test_results.append({"test": "gameplay_simulation", "status": "passed"})
-        else:
-            self.test_results.append({"test": "gameplay_simulation", "status": "failed"})
+        # 독립적인 검사는 병렬 실행, 에디터 테스트 분석은 스크립트 검사 통과 후 실행
+        scheduler = CheckScheduler(self.max_workers)
+        scheduler.add("project_structure", lambda: self._check(
+            "project_structure", [listing(d) for d in self.REQUIRED_DIRS],
+            self.check_unity_project_structure))
+        # 파일 존재만 확인
+        scheduler.add("script_integrity", lambda: self._check(
+            "script_integrity", [listing("Assets/Scripts")], self.check_script_integrity))
+        scheduler.add("editor_tests", lambda: self._check(
+            "editor_tests", [self.EDITOR_TESTS], self.analyze_editor_tests), deps=["script_integrity"])
+        scheduler.add("gameplay_simulation", lambda: self._check(
+            "gameplay_simulation", [JUDGEMENT_SOURCE], self.run_gameplay_simulation))
+
+        scheduler.run(self.test_results)
+        self.scheduler = scheduler
+        scheduler.print_summary()
+        
+        self.cache.save()
+        self.cache.print_summary()
         
         return self.generate_test_report()
     
@@ -208,10 +207,11 @@ class UnityGameTester:
                 "failed": failed
             }
         }
+        if self.scheduler is not None:
+            report["scheduler"] = self.scheduler.report()
         
         try:
-            with open("unity_test_report.json", "w") as f:
-                json.dump(report, f, indent=2)
+            save_report("test_game", report, "unity_test_report.json", workers=self.max_workers)
             print("\nReport saved to: unity_test_report.json")
         except Exception as e:
             print(f"Could not save report: {e}")
@@ -220,7 +220,12 @@ class UnityGameTester:
 
 def main():
     """Main function"""
-    tester = UnityGameTester()
+    parser = argparse.ArgumentParser(description="A.I. BEAT Unity game tests")
+    parser.add_argument("--no-cache", action="store_true", help="re-run every check")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="parallel check workers")
+    args = parser.parse_args()
+
+    tester = UnityGameTester(use_cache=not args.no_cache, max_workers=args.workers)
     report = tester.run_full_test_suite()
     
     success_rate = report['summary']['passed'] / report['summary']['total'] * 100
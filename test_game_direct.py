@@ -3,32 +3,63 @@ Unity Game Direct Test
 Unity MCP 없이 직접 게임 구조 테스트
 """
 
+import argparse
 import os
-import json
+import time
 from pathlib import Path
 
+from check_cache import CheckCache, ScopedResults, listing
+from check_scheduler import DEFAULT_WORKERS, CheckScheduler
+from csharp_index import get_symbol_index
+from judgement import JUDGEMENT_SOURCE, PERFECT, RESULT_NAMES, JudgementConfig, judge_one, score_one
+from note_chart import NOTE_SIZE, pack_note, unpack_note
+from project_index import get_index
+from run_history import save_report
+from song_asset import LONG
+
 class UnityGameTester:
-    def __init__(self, project_path="My project"):
+    REQUIRED_DIRS = [
+        "Assets/Scripts/Core",
+        "Assets/Scripts/Gameplay", 
+        "Assets/Scripts/Data",
+        "Assets/Scenes",
+        "Assets/Resources/Songs"
+    ]
+
+    CRITICAL_SCRIPTS = {
+        "Core/GameManager.cs": ["GameManager", "MonoBehaviour"],
+        "Gameplay/GameplayController.cs": ["GameplayController", "MonoBehaviour"],
+        "Gameplay/Note.cs": ["class Note", "MonoBehaviour"],
+        "Gameplay/NoteSpawner.cs": ["NoteSpawner", "MonoBehaviour"],
+        "Gameplay/JudgementSystem.cs": ["JudgementSystem", "MonoBehaviour"],
+        "Data/SongData.cs": ["SongData", "ScriptableObject"],
+        "Data/NoteData.cs": ["NoteData", "Serializable"],
+    }
+
+    SCENES = ["MainMenu.unity", "SongSelect.unity", "Gameplay.unity"]
+
+    def __init__(self, project_path="My project", use_cache=True, max_workers=DEFAULT_WORKERS):
         self.project_path = Path(project_path)
-        self.test_results = []
+        self.index = get_index(self.project_path)
+        # 입력 파일이 그대로인 검사는 이전 결과 재사용
+        self.cache = CheckCache(self.index, enabled=use_cache)
+        self.symbols = get_symbol_index(self.project_path)
+        self.max_workers = max_workers
+        self.scheduler = None
+        self.test_results = ScopedResults()
         
     def test_project_structure(self):
         """테스트 1: 프로젝트 구조"""
         print("\n📁 [테스트 1] 프로젝트 구조 확인")
         print("-" * 50)
         
-        required_dirs = [
-            "Assets/Scripts/Core",
-            "Assets/Scripts/Gameplay", 
-            "Assets/Scripts/Data",
-            "Assets/Scenes",
-            "Assets/Resources/Songs"
-        ]
-        
-        for dir_path in required_dirs:
-            full_path = self.project_path / dir_path
-            if full_path.exists():
-                files = list(full_path.glob("*.cs")) if "Scripts" in dir_path else list(full_path.glob("*"))
+        self.cache.run("project_structure", [listing(d) for d in self.REQUIRED_DIRS],
+                       self._check_dirs, self.test_results)
+
+    def _check_dirs(self):
+        for dir_path in self.REQUIRED_DIRS:
+            if self.index.is_dir(dir_path):
+                files = self.index.children(dir_path, ext=".cs" if "Scripts" in dir_path else None)
                 print(f"  ✅ {dir_path} - {len(files)} 파일")
                 self.test_results.append({"test": f"dir_{dir_path}", "status": "passed"})
             else:
@@ -40,62 +71,57 @@ class UnityGameTester:
         print("\n📜 [테스트 2] 핵심 스크립트 확인")
         print("-" * 50)
         
-        critical_scripts = {
-            "Core/GameManager.cs": ["GameManager", "MonoBehaviour"],
-            "Gameplay/GameplayController.cs": ["GameplayController", "MonoBehaviour"],
-            "Gameplay/Note.cs": ["class Note", "MonoBehaviour"],
-            "Gameplay/NoteSpawner.cs": ["NoteSpawner", "MonoBehaviour"],
-            "Gameplay/JudgementSystem.cs": ["JudgementSystem", "MonoBehaviour"],
-            "Data/SongData.cs": ["SongData", "ScriptableObject"],
-            "Data/NoteData.cs": ["NoteData", "Serializable"],
-        }
-        
-        scripts_path = self.project_path / "Assets/Scripts"
-        
-        for script, required_patterns in critical_scripts.items():
-            script_path = scripts_path / script
-            if script_path.exists():
-                try:
-                    with open(script_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    found_patterns = [p for p in required_patterns if p in content]
-                    if found_patterns:
-                        print(f"  ✅ {script} - {', '.join(found_patterns)}")
-                        self.test_results.append({"test": f"script_{script}", "status": "passed"})
-                    else:
-                        print(f"  ⚠️  {script} - 패턴 미발견")
-                        self.test_results.append({"test": f"script_{script}", "status": "warning"})
-                except Exception as e:
-                    print(f"  ❌ {script} - 읽기 오류: {e}")
-                    self.test_results.append({"test": f"script_{script}", "status": "failed"})
-            else:
-                print(f"  ❌ {script} - 파일 없음")
+        for script, required_patterns in self.CRITICAL_SCRIPTS.items():
+            # 상속 검사는 프로젝트 안의 중간 상위 클래스도 따라가므로 Scripts 전체가 입력
+            self.cache.run(f"script_{script}", ["Assets/Scripts"],
+                           lambda: self._check_script(script, required_patterns), self.test_results)
+
+    def _check_script(self, script, required_patterns):
+        script_path = f"Assets/Scripts/{script}"
+        if self.index.exists(script_path):
+            try:
+                # 선언된 타입/상위 타입/특성 기준 ("class Note"는 Note 클래스 선언)
+                found_patterns = [p for p in required_patterns if self.symbols.matches(script_path, p)]
+                if found_patterns:
+                    print(f"  ✅ {script} - {', '.join(found_patterns)}")
+                    self.test_results.append({"test": f"script_{script}", "status": "passed"})
+                else:
+                    print(f"  ⚠️  {script} - 패턴 미발견")
+                    self.test_results.append({"test": f"script_{script}", "status": "warning"})
+            except Exception as e:
+                print(f"  ❌ {script} - 읽기 오류: {e}")
                 self.test_results.append({"test": f"script_{script}", "status": "failed"})
+        else:
+            print(f"  ❌ {script} - 파일 없음")
+            self.test_results.append({"test": f"script_{script}", "status": "failed"})
     
     def test_scenes(self):
         """테스트 3: 씬 파일"""
         print("\n🎬 [테스트 3] 씬 구성 확인")
         print("-" * 50)
         
-        scenes = ["MainMenu.unity", "SongSelect.unity", "Gameplay.unity"]
-        scenes_path = self.project_path / "Assets/Scenes"
-        
-        for scene in scenes:
-            scene_path = scenes_path / scene
-            if scene_path.exists():
-                size = scene_path.stat().st_size / 1024  # KB
-                print(f"  ✅ {scene} - {size:.1f} KB")
-                self.test_results.append({"test": f"scene_{scene}", "status": "passed"})
-            else:
-                print(f"  ❌ {scene} - 없음")
-                self.test_results.append({"test": f"scene_{scene}", "status": "failed"})
+        for scene in self.SCENES:
+            self.cache.run(f"scene_{scene}", [f"Assets/Scenes/{scene}"],
+                           lambda: self._check_scene(scene), self.test_results)
+
+    def _check_scene(self, scene):
+        scene_path = f"Assets/Scenes/{scene}"
+        if self.index.exists(scene_path):
+            size = self.index.size(scene_path) / 1024  # KB
+            print(f"  ✅ {scene} - {size:.1f} KB")
+            self.test_results.append({"test": f"scene_{scene}", "status": "passed"})
+        else:
+            print(f"  ❌ {scene} - 없음")
+            self.test_results.append({"test": f"scene_{scene}", "status": "failed"})
     
     def test_game_logic(self):
         """테스트 4: 게임 로직 시뮬레이션"""
         print("\n🎮 [테스트 4] 게임 로직 시뮬레이션")
         print("-" * 50)
         
+        self.cache.run("game_logic", [JUDGEMENT_SOURCE], self._check_game_logic, self.test_results)
+
+    def _check_game_logic(self):
         # 판정 로직 테스트
         judgement_tests = [
             (0.02, "Perfect"),
@@ -105,18 +131,12 @@ class UnityGameTester:
             (0.50, "Miss")
         ]
         
+        # JudgementSystem.cs 의 판정 창/점수 설정을 그대로 사용
+        config = JudgementConfig.from_project(self.project_path)
         print("  판정 시스템 테스트:")
         for diff, expected in judgement_tests:
-            if diff < 0.05:
-                result = "Perfect"
-            elif diff < 0.1:
-                result = "Great"
-            elif diff < 0.2:
-                result = "Good"
-            elif diff < 0.35:
-                result = "Bad"
-            else:
-                result = "Miss"
+            code, _ = judge_one(diff, 0.0, config=config)
+            result = RESULT_NAMES[code]
             
             status = "✅" if result == expected else "❌"
             print(f"    {status} 차이 {diff:.2f}s → {result} (예상: {expected})")
@@ -124,54 +144,53 @@ class UnityGameTester:
         
         # 스코어 계산 테스트
         print("\n  스코어 시스템 테스트:")
-        base_score = 100
         combo = 50
-        combo_bonus = min(combo / 100 * 0.5, 0.5)
-        total = base_score * (1 + combo_bonus)
-        print(f"    ✅ 콤보 {combo}: {base_score} → {total:.0f}점 (+{combo_bonus*100:.0f}% 복합)")
+        total = score_one(PERFECT, combo, config)
+        combo_bonus = min(combo / config.combo_for_max_bonus, 1.0) * config.max_combo_bonus
+        print(f"    ✅ 콤보 {combo}: {config.base_score} → {total}점 (+{combo_bonus*100:.0f}% 복합)")
         self.test_results.append({"test": "scoring_system", "status": "passed"})
         
         # 노트 데이터 구조 테스트
         print("\n  노트 데이터 구조 테스트:")
-        note_data = {
-            "hitTime": 1.5,
-            "lane": 2,
-            "noteType": "Tap",
-            "duration": 0.0
-        }
-        print(f"    ✅ NoteData 생성: {note_data}")
-        self.test_results.append({"test": "note_data_structure", "status": "passed"})
+        # .notes 레코드 (HitTime f32, LaneIndex i8, Type u8, Duration f32) 왕복
+        note_data = (1.5, 2, LONG, 0.75)
+        record = pack_note(*note_data)
+        ok = len(record) == NOTE_SIZE and unpack_note(record) == note_data
+        status = "✅" if ok else "❌"
+        print(f"    {status} NoteData 레코드: {note_data} → {len(record)} bytes")
+        self.test_results.append({"test": "note_data_structure", "status": "passed" if ok else "failed"})
     
     def test_resources(self):
         """테스트 5: 리소스 확인"""
         print("\n🎵 [테스트 5] 리소스 확인")
         print("-" * 50)
         
+        inputs = ["Assets/StreamingAssets", listing("Assets/Resources/Fonts"), listing("Assets/Resources/Songs")]
+        self.cache.run("resources", inputs, self._check_resources, self.test_results)
+
+    def _check_resources(self):
         # 오디오 파일
-        audio_path = self.project_path / "Assets/StreamingAssets"
-        audio_files = list(audio_path.glob("*.mp3")) + list(audio_path.glob("*.wav"))
+        audio_files = self.index.children("Assets/StreamingAssets", ext=(".mp3", ".wav"))
         print(f"  오디오 파일: {len(audio_files)}개")
         for f in audio_files:
-            size = f.stat().st_size / (1024*1024)
-            print(f"    📁 {f.name} ({size:.1f} MB)")
+            size = self.index.size(f) / (1024*1024)
+            print(f"    📁 {Path(f).name} ({size:.1f} MB)")
         self.test_results.append({"test": "audio_resources", "status": "passed" if audio_files else "warning"})
         
         # 폰트
-        font_path = self.project_path / "Assets/Resources/Fonts"
-        if font_path.exists():
-            fonts = list(font_path.glob("*.ttf"))
+        if self.index.is_dir("Assets/Resources/Fonts"):
+            fonts = self.index.children("Assets/Resources/Fonts", ext=".ttf")
             print(f"  폰트 파일: {len(fonts)}개")
             for f in fonts:
-                print(f"    🔤 {f.name}")
+                print(f"    🔤 {Path(f).name}")
             self.test_results.append({"test": "font_resources", "status": "passed"})
         
         # SongData
-        songs_path = self.project_path / "Assets/Resources/Songs"
-        if songs_path.exists():
-            songs = list(songs_path.glob("*.asset"))
+        if self.index.is_dir("Assets/Resources/Songs"):
+            songs = self.index.children("Assets/Resources/Songs", ext=".asset")
             print(f"  곡 데이터: {len(songs)}개")
             for s in songs:
-                print(f"    🎼 {s.name}")
+                print(f"    🎼 {Path(s).name}")
             self.test_results.append({"test": "song_resources", "status": "passed"})
     
     def generate_report(self):
@@ -206,7 +225,7 @@ class UnityGameTester:
         # JSON 저장
         report = {
             "project": "A.I. BEAT",
-            "timestamp": "2026-02-10",
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
             "summary": {
                 "total": total,
                 "passed": passed,
@@ -216,9 +235,11 @@ class UnityGameTester:
             },
             "details": self.test_results
         }
+        if self.scheduler is not None:
+            report["scheduler"] = self.scheduler.report()
         
-        with open("game_test_report.json", "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        # 실행 기록에 추가하고 보고서는 그 뷰로 다시 씀 (MCP 지표 포함)
+        save_report("test_game_direct", report, "game_test_report.json", workers=self.max_workers)
         print(f"\n💾 보고서 저장됨: game_test_report.json")
     
     def run_all_tests(self):
@@ -226,13 +247,24 @@ class UnityGameTester:
         print("🚀 A.I. BEAT 게임 테스트 시작")
         print("="*60)
         
-        self.test_project_structure()
-        self.test_critical_scripts()
-        self.test_scenes()
-        self.test_game_logic()
-        self.test_resources()
+        # 서로 독립적인 검사이므로 병렬 실행 (출력/결과는 선언 순서대로)
+        self.scheduler = CheckScheduler(self.max_workers)
+        self.scheduler.add("project_structure", self.test_project_structure)
+        self.scheduler.add("critical_scripts", self.test_critical_scripts)
+        self.scheduler.add("scenes", self.test_scenes)
+        self.scheduler.add("game_logic", self.test_game_logic)
+        self.scheduler.add("resources", self.test_resources)
+        self.scheduler.run(self.test_results)
+        self.scheduler.print_summary()
+        self.cache.save()
+        self.cache.print_summary()
         self.generate_report()
 
 if __name__ == "__main__":
-    tester = UnityGameTester()
+    parser = argparse.ArgumentParser(description="A.I. BEAT 게임 직접 테스트")
+    parser.add_argument("--no-cache", action="store_true", help="모든 검사 다시 실행")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="병렬 검사 작업자 수")
+    args = parser.parse_args()
+
+    tester = UnityGameTester(use_cache=not args.no_cache, max_workers=args.workers)
     tester.run_all_tests()
\ No newline at end of file
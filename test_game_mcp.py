@@ -1,41 +1,12 @@
 import asyncio
-import json
-import sys
 
-try:
-    import websockets
-except ImportError:
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "websockets"])
-    import websockets
-
-class UnityMCPClient:
-    def __init__(self, uri="ws://localhost:8090/McpUnity"):
-        self.uri = uri
-        self.ws = None
-        self.request_id = 0
-    
-    async def connect(self):
-        self.ws = await websockets.connect(self.uri, close_timeout=5, max_size=1024*1024, ping_interval=None)
-        print("Connected to Unity MCP")
-    
-    async def close(self):
-        if self.ws:
-            await self.ws.close()
-    
-    async def call(self, method, params=None):
-        self.request_id += 1
-        request = {
-            "id": str(self.request_id),
-            "method": method,
-            "params": params or {}
-        }
-        await self.ws.send(json.dumps(request))
-        response = await asyncio.wait_for(self.ws.recv(), timeout=30)
-        return json.loads(response)
+from mcp_batch import get_game_objects
+from mcp_readiness import Readiness, load_scene
+from unity_mcp_client import UnityMCPClient
 
 async def test_game():
     client = UnityMCPClient()
+    probes = Readiness()
     await client.connect()
     
     print("\n" + "="*60)
@@ -44,14 +15,9 @@ async def test_game():
     
     # 1. Gameplay 씬 로드
     print("\n[1] Loading Gameplay scene...")
-    result = await client.call("load_scene", {
-        "scenePath": "Assets/Scenes/Gameplay.unity",
-        "loadMode": "Single"
-    })
+    result = await load_scene(client, "Assets/Scenes/Gameplay.unity", probes)
     print(f"    Result: {result.get('result', {}).get('success', False)}")
     
-    await asyncio.sleep(0.5)
-    
     # 2. 씬 계층 구조 분석
     print("\n[2] Analyzing Gameplay scene hierarchy...")
     result = await client.call("get_scene_info")
@@ -74,10 +40,10 @@ async def test_game():
         "Canvas"
     ]
     
+    # 모든 경로를 한 번에 동시 조회
+    results = await get_game_objects(client, [f"/{obj_name}" for obj_name in key_objects])
     for obj_name in key_objects:
-        result = await client.call("get_game_object", {
-            "objectPath": f"/{obj_name}"
-        })
+        result = results[f"/{obj_name}"]
         if "result" in result and result["result"].get("name"):
             obj = result["result"]
             active = obj.get("activeSelf", "?")
@@ -88,14 +54,9 @@ async def test_game():
     
     # 4. MainMenu 씬 테스트
     print("\n[4] Testing MainMenu scene...")
-    result = await client.call("load_scene", {
-        "scenePath": "Assets/Scenes/MainMenu.unity",
-        "loadMode": "Single"
-    })
+    result = await load_scene(client, "Assets/Scenes/MainMenu.unity", probes)
     print(f"    Loaded: {result.get('result', {}).get('success', False)}")
     
-    await asyncio.sleep(0.5)
-    
     result = await client.call("get_scene_info")
     if "result" in result:
         scene = result["result"].get("activeScene", {})
@@ -103,14 +64,9 @@ async def test_game():
     
     # 5. SongSelect 씬 테스트
     print("\n[5] Testing SongSelect scene...")
-    result = await client.call("load_scene", {
-        "scenePath": "Assets/Scenes/SongSelect.unity",
-        "loadMode": "Single"
-    })
+    result = await load_scene(client, "Assets/Scenes/SongSelect.unity", probes)
     print(f"    Loaded: {result.get('result', {}).get('success', False)}")
     
-    await asyncio.sleep(0.5)
-    
     result = await client.call("get_scene_info")
     if "result" in result:
         scene = result["result"].get("activeScene", {})
@@ -118,12 +74,15 @@ async def test_game():
     
     # 6. Gameplay 씬으로 복귀
     print("\n[6] Returning to Gameplay scene...")
-    result = await client.call("load_scene", {
-        "scenePath": "Assets/Scenes/Gameplay.unity",
-        "loadMode": "Single"
-    })
+    result = await load_scene(client, "Assets/Scenes/Gameplay.unity", probes)
     print(f"    Loaded: {result.get('result', {}).get('success', False)}")
     
+    probes.print_summary()
+    
+    # 메서드별 지연 시간 (p50/p95/p99) -> JSON 보고서에 기록
+    client.metrics.print_summary()
+    client.metrics.update_reports()
+    print("    MCP metrics saved to: game_test_report.json, unity_test_report.json")
     await client.close()
     
     print("\n" + "="*60)
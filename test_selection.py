@@ -0,0 +1,269 @@
+"""
+Impact-based EditMode Test Selection
+바뀐 파일에 영향받는 AIBeatEditorTests 카테고리만 골라 Unity -testFilter 로 실행
+
+카테고리는 테스트 메서드 이름의 접두어 (NoteData_..., BeatMapper_..., Scene_...).
+선택 기준은 C# 심볼 색인의 참조 그래프:
+- 파일 A가 파일 B에 선언된 타입을 참조하면 A -> B 의존
+- 바뀐 .cs 파일과 그 파일에 (간접) 의존하는 파일이 "영향받는 파일"
+- 테스트 메서드가 참조하는 타입이 영향받는 파일에 선언돼 있거나,
+  메서드가 로드하는 "Assets/..." 경로가 바뀌었으면 그 카테고리를 실행
+패키지/프로젝트 설정, asmdef, Scripts 밖의 C# 파일, 삭제된 스크립트, 테스트 파일 자체가
+바뀌면 영향 범위를 알 수 없으므로 전체 스위트를 실행한다.
+
+    selection = select_tests("My project")   # base: 마지막 통과 커밋 또는 upstream과의 merge-base
+    if selection["mode"] == "filtered":
+        command += ["-testFilter", selection["filter"]]
+"""
+
+import argparse
+import re
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+from csharp_index import SCRIPTS_ROOT, get_symbol_index
+from run_history import DEFAULT_DB, RunHistory
+
+EDITOR_TESTS = "Assets/Scripts/Editor/AIBeatEditorTests.cs"
+
+# 바뀌면 전체 스위트를 돌리는 프로젝트 공통 파일
+PROJECT_WIDE_FILES = ("Packages/manifest.json", "Packages/packages-lock.json", "Assets/csc.rsp", "Assets/mcs.rsp")
+PROJECT_WIDE_DIRS = ("ProjectSettings/", "Assets/Plugins/")
+PROJECT_WIDE_EXTS = (".asmdef", ".asmref", ".dll")
+
+# 마지막 통과 커밋을 찾을 검사/스위트 (run_history)
+EDITOR_TESTS_CHECK = "unity_editor_tests"
+EDITOR_TESTS_SUITES = ("test_unity_game",)
+# 통과 기록이 없을 때 merge-base를 구할 ref 후보
+UPSTREAM_REFS = ("@{upstream}", "origin/HEAD", "origin/main", "origin/master", "main", "master")
+
+
+def changed_files(project_path="My project", base="HEAD"):
+    """
+    base 이후 바뀐 파일 (커밋 + 작업 트리 + 추적 안 된 파일), 프로젝트 폴더 기준 경로
+    반환: (바뀐 파일 목록, 삭제된 파일 목록). git을 쓸 수 없으면 (None, None)
+    """
+    def git(*args):
+        result = subprocess.run(["git", "-C", str(project_path), *args],
+                                capture_output=True, text=True, timeout=30)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+        return [line for line in result.stdout.splitlines() if line]
+
+    try:
+        diff = git("diff", "--name-status", "--relative", "--no-renames", base, "--", ".")
+        untracked = git("ls-files", "--others", "--exclude-standard", ".")
+    except (OSError, RuntimeError, subprocess.TimeoutExpired):
+        return None, None
+
+    changed, deleted = set(untracked), set()
+    for line in diff:
+        status, _, path = line.partition("\t")
+        (deleted if status.startswith("D") else changed).add(path)
+    return sorted(changed), sorted(deleted)
+
+
+def default_base(project_path="My project", history_db=DEFAULT_DB):
+    """
+    변경 비교 기준 커밋: 에디터 테스트가 변경 없는 트리에서 마지막으로 통과한 커밋,
+    기록이 없으면 upstream 브랜치와의 merge-base. 둘 다 없으면 None (전체 스위트)
+    HEAD(또는 HEAD와 같은 merge-base)를 기준으로 하면 깨끗한 체크아웃에서는 항상 "바뀐 파일 없음"이 되므로 쓰지 않는다.
+    """
+    if history_db is not None and Path(history_db).exists():
+        try:
+            with RunHistory(history_db) as history:
+                commit = history.last_green_commit(EDITOR_TESTS_CHECK, EDITOR_TESTS_SUITES)
+        except sqlite3.Error:
+            commit = None
+        if commit:
+            return commit
+    def git(*args):
+        result = subprocess.run(["git", "-C", str(project_path), *args], capture_output=True, text=True, timeout=30)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    head = git("rev-parse", "HEAD")
+    for ref in UPSTREAM_REFS:
+        # upstream 브랜치 자체에 있으면 merge-base가 HEAD라 기준이 되지 못함
+        base = git("merge-base", "HEAD", ref)
+        if base and base != head:
+            return base
+    return None
+
+
+def _strip_meta(path):
+    return path[:-len(".meta")] if path.endswith(".meta") else path
+
+
+def _category(method_name):
+    return method_name.split("_", 1)[0]
+
+
+class TestSelector:
+    def __init__(self, symbols, test_file=EDITOR_TESTS):
+        self.symbols = symbols
+        self.test_file = test_file
+        self._dependents = None
+
+    # ------------------------------------------------------------------
+    # 참조 그래프
+    # ------------------------------------------------------------------
+    def declaring_files(self, type_name):
+        return {key for key, _ in self.symbols.types_by_name().get(type_name, [])}
+
+    def dependents(self):
+        """{파일: 그 파일에 선언된 타입을 참조하는 파일 집합}"""
+        if self._dependents is None:
+            graph = {key: set() for key in self.symbols.files}
+            for key in self.symbols.files:
+                for name in self.symbols.references(key):
+                    for declared_in in self.declaring_files(name):
+                        if declared_in != key:
+                            graph[declared_in].add(key)
+            self._dependents = graph
+        return self._dependents
+
+    def affected_files(self, changed_scripts):
+        """바뀐 스크립트와 그것에 (간접) 의존하는 스크립트 (root 기준 경로)"""
+        graph = self.dependents()
+        affected = set()
+        stack = [self.symbols._key(s) for s in changed_scripts]
+        while stack:
+            key = stack.pop()
+            if key in affected:
+                continue
+            affected.add(key)
+            stack.extend(graph.get(key, ()))
+        return affected
+
+    # ------------------------------------------------------------------
+    # 카테고리 매핑
+    # ------------------------------------------------------------------
+    def test_types(self):
+        """테스트 클래스 정보: (namespace, qualified 이름)"""
+        for t in self.symbols.declared_types(self.test_file):
+            if any(m in t["methods"] for m in self.symbols.test_methods(self.test_file)):
+                return t["namespace"], t["qualified"]
+        return "", ""
+
+    def categories(self):
+        """{카테고리: [테스트 메서드]}"""
+        grouped = {}
+        for method in self.symbols.test_methods(self.test_file):
+            grouped.setdefault(_category(method["name"]), []).append(method)
+        return grouped
+
+    def category_map(self, changed_scripts=(), changed_assets=()):
+        """영향받는 카테고리 -> 이유 목록"""
+        affected = self.affected_files(changed_scripts)
+        assets = {_strip_meta(a) for a in changed_assets}
+        selected = {}
+        for category, methods in self.categories().items():
+            reasons = set()
+            for method in methods:
+                for name in method["references"]:
+                    for declared_in in self.declaring_files(name) & affected:
+                        reasons.add(f"{SCRIPTS_ROOT}/{declared_in}")
+                for path in method["assets"]:
+                    if path in assets or any(path.startswith(a.rstrip("/") + "/") for a in assets):
+                        reasons.add(path)
+            if reasons:
+                selected[category] = sorted(reasons)
+        return selected
+
+    def full(self, reason):
+        categories = self.categories()
+        return {"mode": "full", "reason": reason, "categories": sorted(categories),
+                "tests": sum(len(m) for m in categories.values()), "filter": None}
+
+    def select(self, changed, deleted=()):
+        """
+        반환: {"mode": "full" | "filtered" | "none", "reason", "categories", "tests", "filter"}
+        """
+        if not self.symbols.symbols(self.test_file):
+            return self.full(f"{self.test_file} not indexed")
+        for path in list(changed) + list(deleted):
+            path = _strip_meta(path)
+            if (path in PROJECT_WIDE_FILES or path.startswith(PROJECT_WIDE_DIRS)
+                    or path.endswith(PROJECT_WIDE_EXTS)):
+                return self.full(f"project-wide file changed: {path}")
+            if path == self.test_file:
+                return self.full("test file changed")
+            if path.endswith(".cs") and not path.startswith(SCRIPTS_ROOT + "/"):
+                return self.full(f"script outside {SCRIPTS_ROOT} changed: {path}")
+        for path in deleted:
+            if path.endswith(".cs"):
+                return self.full(f"script deleted: {path}")
+
+        scripts = [p for p in changed if p.endswith(".cs") and self.symbols.symbols(p) is not None]
+        unindexed = [p for p in changed if p.endswith(".cs") and p not in scripts]
+        if unindexed:
+            return self.full(f"script not indexed: {unindexed[0]}")
+        assets = [p for p in list(changed) + list(deleted) if not p.endswith((".cs", ".cs.meta"))]
+
+        selected = self.category_map(scripts, assets)
+        if not selected:
+            return {"mode": "none", "reason": "no test depends on the changed files",
+                    "categories": [], "tests": 0, "filter": None}
+
+        namespace, class_name = self.test_types()
+        prefix = re.escape(f"{namespace}.{class_name}." if namespace else f"{class_name}.")
+        names = sorted(selected)
+        return {
+            "mode": "filtered",
+            "reason": f"{len(scripts)} script(s), {len(assets)} asset(s) changed",
+            "categories": names,
+            "because": selected,
+            "tests": sum(len(self.categories()[c]) for c in names),
+            "filter": f"^{prefix}({'|'.join(map(re.escape, names))})_",
+        }
+
+
+def select_tests(project_path="My project", base=None, changed=None, deleted=()):
+    """changed를 주지 않으면 git으로 base(기본: default_base()) 이후 바뀐 파일을 구함"""
+    symbols = get_symbol_index(project_path)
+    selector = TestSelector(symbols)
+    if changed is None:
+        try:
+            base = base or default_base(project_path)
+        except (OSError, subprocess.TimeoutExpired):
+            base = None
+        if base is None:
+            return selector.full("no base ref (no passing run recorded, no upstream branch)")
+        changed, deleted = changed_files(project_path, base)
+        if changed is None:
+            return selector.full("git diff unavailable")
+    selection = selector.select(changed, deleted)
+    selection["base"] = base
+    selection["changed"] = sorted(changed) + [f"{p} (deleted)" for p in sorted(deleted)]
+    return selection
+
+
+def print_selection(selection):
+    mode = selection["mode"]
+    icon = {"full": "🧪", "filtered": "🎯", "none": "⏭️ "}[mode]
+    base = f", base {selection['base'][:12]}" if selection.get("base") else ""
+    print(f"{icon} Test selection: {mode} ({selection['reason']}{base})")
+    if mode == "filtered":
+        for category in selection["categories"]:
+            print(f"  - {category}: {', '.join(selection['because'][category])}")
+        print(f"  filter: {selection['filter']}")
+    if mode != "none":
+        print(f"  {selection['tests']} tests in {len(selection['categories'])} categories")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Select EditMode tests affected by changed files")
+    parser.add_argument("files", nargs="*", help="changed files (project-relative); default: git diff")
+    parser.add_argument("--project", default="My project")
+    parser.add_argument("--base", help="git ref to diff against (default: last green commit or upstream merge-base)")
+    args = parser.parse_args()
+
+    selection = select_tests(args.project, args.base, changed=args.files or None)
+    print_selection(selection)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
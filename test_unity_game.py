@@ -4,19 +4,76 @@ Unity Game Test Automation Script for A.I. BEAT
 Tests Unity rhythm game functionality without requiring active Unity Editor
 """
 
+import argparse
 import os
 import sys
-import json
 import subprocess
 import time
 import platform
 from pathlib import Path
 
+from library_cache import LibraryCache, print_warm_start
+from nunit_results import print_summary as print_result_summary, summarize
+from check_cache import CheckCache, ScopedResults, listing, setting
+from chart_replay import replay_song
+from check_scheduler import DEFAULT_WORKERS, SKIPPED, CheckScheduler
+from csharp_index import get_symbol_index
+from judgement import JUDGEMENT_SOURCE, RESULT_NAMES, JudgementConfig, judge_one, score_one
+from project_index import get_index
+from run_history import save_report
+from song_asset import find_song_assets
+from test_selection import print_selection, select_tests
+from unity_log import print_log_summary, scan_log
+from unity_shards import ShardRunner, batchmode_command, print_outcome, run_batchmode
+
 class UnityGameTester:
-    def __init__(self, project_path="My project"):
+    REQUIRED_DIRS = [
+        "Assets/Scripts",
+        "Assets/Scenes", 
+        "Assets/Prefabs",
+        "Assets/Resources",
+        "ProjectSettings"
+    ]
+
+    CRITICAL_SCRIPTS = [
+        "Core/GameManager.cs",
+        "Gameplay/GameplayController.cs",
+        "Gameplay/Note.cs",
+        "Gameplay/NoteSpawner.cs",
+        "Gameplay/JudgementSystem.cs",
+        "Gameplay/InputHandler.cs",
+        "Data/SongData.cs",
+        "Data/NoteData.cs",
+        "Audio/BeatMapper.cs"
+    ]
+
+    EDITOR_TESTS = "Assets/Scripts/Editor/AIBeatEditorTests.cs"
+
+    def __init__(self, project_path="My project", use_cache=True, max_workers=DEFAULT_WORKERS,
+                 test_base=None, impact_selection=True, unity_path=None, shards=1,
+                 library_cache=True):
         self.project_path = Path(project_path)
-        self.unity_path = self.find_unity_executable()
-        self.test_results = []
+        self.index = get_index(self.project_path)
+        # 입력 파일이 그대로인 검사는 이전 결과 재사용
+        self.cache = CheckCache(self.index, enabled=use_cache)
+        # C# 구조 검사는 문자열 검색 대신 심볼 테이블 조회
+        self.symbols = get_symbol_index(self.project_path)
+        self.unity_path = unity_path or self.find_unity_executable()
+        self.max_workers = max_workers
+        # git diff 기준 ref (None: 마지막 통과 커밋 또는 upstream merge-base): 바뀐 파일에 영향받는 EditMode 테스트만 실행
+        self.test_base = test_base
+        self.impact_selection = impact_selection
+        self.test_selection = None
+        # 2 이상이면 프로젝트 복제본에서 EditMode 테스트를 나눠 병렬 실행
+        self.shards = shards
+        self.shard_outcome = None
+        # Library 스냅샷을 복원해 에셋 임포트 없이 시작 (웜 스타트)
+        self.library_cache = LibraryCache(self.project_path, self.unity_path) if library_cache else None
+        self.warm_start = None
+        self.editor_results = None
+        self.log_summary = None
+        self.scheduler = None
+        self.test_results = ScopedResults()
         
     def find_unity_executable(self):
         """Find Unity executable on Windows"""
@@ -43,30 +100,58 @@ class UnityGameTester:
             print("❌ Unity executable not found. Please install Unity or specify path.")
             return self.run_editor_scripts_tests()
             
-        test_command = [
-            str(self.unity_path),
-            "-projectPath", str(self.project_path.absolute()),
-            "-batchmode",
-            "-nographics",
-            "-runTests",
-            "-testPlatform", "EditMode",
-            "-testResults", "TestResults.xml",
-            "-logFile", "test_log.txt",
-            "-quit"
-        ]
+        results_file = self.project_path / "TestResults.xml"
+        log_file = self.project_path / "test_log.txt"
+        categories = test_filter = None
+
+        if self.impact_selection:
+            if self.test_selection is None:
+                self.test_selection = select_tests(self.project_path, self.test_base)
+            print_selection(self.test_selection)
+            if self.test_selection["mode"] == "none":
+                # 바뀐 파일에 의존하는 테스트가 없으면 Unity를 띄우지 않음 (통과가 아니라 건너뜀)
+                return SKIPPED
+            if self.test_selection["mode"] == "filtered":
+                categories = self.test_selection["categories"]
+                test_filter = self.test_selection["filter"]
+
+        # 이전 실행의 결과 파일을 이번 결과로 읽지 않도록 삭제
+        if results_file.exists():
+            results_file.unlink()
         
         try:
-            print("🔄 Running Unity editor tests...")
-            result = subprocess.run(test_command, capture_output=True, text=True, timeout=300)
+            if self.shards > 1:
+                # 프로젝트 복제본 여러 개에서 나눠 실행하고 결과를 results_file로 병합
+                print(f"🧩 Running Unity editor tests on {self.shards} shards...")
+                runner = ShardRunner(self.unity_path, self.project_path, self.shards,
+                                     library_cache=self.library_cache)
+                self.shard_outcome = runner.run(results_file, categories)
+                print_outcome(self.shard_outcome)
+                if any(shard.get("error") == "compile errors" for shard in self.shard_outcome["shards"]):
+                    return False
+                log_files = [Path(shard["log"]) for shard in self.shard_outcome["shards"]]
+            else:
+                if self.library_cache is not None:
+                    self.warm_start = self.library_cache.restore()
+                print("🔄 Running Unity editor tests...")
+                self.log_summary = run_batchmode(batchmode_command(
+                    self.unity_path, self.project_path, results_file, log_file, test_filter), log_file)
+                if self.warm_start is not None:
+                    self.library_cache.after_run(self.warm_start, self.log_summary["elapsed_s"],
+                                                 succeeded=results_file.exists())
+                    print_warm_start(self.warm_start)
+                if self.log_summary["aborted"] == "compile_error":
+                    print("❌ Compilation errors found (Unity stopped early):")
+                    print_log_summary(self.log_summary)
+                    return False
+                log_files = [log_file]
             
             # Check test results
-            results_file = self.project_path / "TestResults.xml"
             if results_file.exists():
-                self.parse_test_results(results_file)
-                return True
+                return self.parse_test_results(results_file)
             else:
                 print("⚠️  No test results file generated")
-                return self.check_compilation_errors()
+                return self.check_compilation_errors(log_files)
                 
         except subprocess.TimeoutExpired:
             print("⏰ Unity test process timed out")
@@ -75,18 +160,29 @@ class UnityGameTester:
             print(f"❌ Error running Unity tests: {e}")
             return False
             
+    def parse_test_results(self, results_file):
+        """TestResults.xml을 스트리밍으로 읽어 테스트별 결과를 test_results에 추가"""
+        rows = []
+        self.editor_results = summarize(results_file, top=10, on_case=lambda case: rows.append({
+            "test": case["fullname"],
+            "status": case["outcome"],
+            "duration_ms": round(case["duration"] * 1000, 1),
+            **({"message": case["message"]} if case["outcome"] == "failed" else {}),
+        }))
+        self.test_results.extend(rows)
+        print_result_summary(self.editor_results)
+        return self.editor_results["failed"] == 0 and self.editor_results["total"] > 0
+
     def run_editor_scripts_tests(self):
         """Run script compilation tests without Unity"""
         print("🔍 Testing Unity C# scripts compilation...")
         
-        scripts_path = self.project_path / "Assets" / "Scripts"
-        if not scripts_path.exists():
+        if not self.index.is_dir("Assets/Scripts"):
             print("❌ Scripts directory not found")
             return False
             
         # Check for compilation errors in Unity scripts
-        editor_tests_path = scripts_path / "Editor" / "AIBeatEditorTests.cs"
-        if editor_tests_path.exists():
+        if self.index.exists(self.EDITOR_TESTS):
             print("✅ Editor tests found")
             return self.analyze_test_structure()
         else:
@@ -97,13 +193,9 @@ class UnityGameTester:
         """Analyze Unity test structure"""
         print("📋 Analyzing test structure...")
         
-        test_file = self.project_path / "Assets" / "Scripts" / "Editor" / "AIBeatEditorTests.cs"
         try:
-            with open(test_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Count test methods
-            test_methods = content.count("[Test]")
+            # Count test methods ([Test]/[TestCase]/[UnityTest])
+            test_methods = len(self.symbols.test_methods(self.EDITOR_TESTS))
             print(f"✅ Found {test_methods} test methods")
             
             # Check different test categories
@@ -119,8 +211,9 @@ class UnityGameTester:
             ]
             
             print("🔍 Test coverage:")
+            counts = self.symbols.category_counts(self.EDITOR_TESTS, test_categories)
             for category in test_categories:
-                count = content.count(f"public void {category}")
+                count = counts[category]
                 if count > 0:
                     print(f"  ✅ {category}: {count} tests")
                     self.test_results.append({
@@ -138,36 +231,20 @@ class UnityGameTester:
         """Check if Unity scripts are properly structured"""
         print("🔍 Checking script integrity...")
         
-        critical_scripts = [
-            "Core/GameManager.cs",
-            "Gameplay/GameplayController.cs",
-            "Gameplay/Note.cs",
-            "Gameplay/NoteSpawner.cs",
-            "Gameplay/JudgementSystem.cs",
-            "Gameplay/InputHandler.cs",
-            "Data/SongData.cs",
-            "Data/NoteData.cs",
-            "Audio/BeatMapper.cs"
-        ]
-        
-        scripts_path = self.project_path / "Assets" / "Scripts"
         missing = []
         available = []
         
-        for script in critical_scripts:
-            script_path = scripts_path / script
-            if script_path.exists():
+        for script in self.CRITICAL_SCRIPTS:
+            script_path = f"Assets/Scripts/{script}"
+            if self.index.exists(script_path):
                 available.append(script)
-                # Check for MonoBehaviour inheritance
-                try:
-                    with open(script_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if ": MonoBehaviour" in content:
-                            print(f"  ✅ {script} - MonoBehaviour found")
-                        else:
-                            print(f"  ⚠️  {script} - No MonoBehaviour found")
-                except:
+                # Check for MonoBehaviour inheritance (direct or via project base classes)
+                if self.symbols.symbols(script_path) is None:
                     print(f"  ⚠️  {script} - Could not read")
+                elif self.symbols.inherits(script_path, "MonoBehaviour"):
+                    print(f"  ✅ {script} - MonoBehaviour found")
+                else:
+                    print(f"  ⚠️  {script} - No MonoBehaviour found")
             else:
                 missing.append(script)
                 print(f"  ❌ {script} - Missing")
@@ -180,20 +257,17 @@ class UnityGameTester:
         
         return len(missing) == 0
         
-    def check_compilation_errors(self):
+    def check_compilation_errors(self, log_files=None):
         """Check for common compilation errors"""
         print("🔍 Checking for compilation errors...")
         
-        log_file = self.project_path / "test_log.txt"
-        if log_file.exists():
+        log_files = [f for f in (log_files or [self.project_path / "test_log.txt"]) if f.exists()]
+        if log_files:
             try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
+                # 로그 전체를 읽지 않고 줄 단위로 분류 (수백 MB Editor 로그 대비)
                 errors = []
-                for line in content.split('\n'):
-                    if "error CS" in line or "compilation error" in line:
-                        errors.append(line.strip())
+                for log_file in log_files:
+                    errors += scan_log(log_file)["compile_errors"]
                         
                 if errors:
                     print("❌ Compilation errors found:")
@@ -203,7 +277,7 @@ class UnityGameTester:
                 else:
                     print("✅ No compilation errors detected")
                     return True
-            except:
+            except OSError:
                 pass
                 
         print("⚠️  Could not check compilation errors")
@@ -213,19 +287,10 @@ class UnityGameTester:
         """Check Unity project structure"""
         print("📁 Checking Unity project structure...")
         
-        required_dirs = [
-            "Assets/Scripts",
-            "Assets/Scenes", 
-            "Assets/Prefabs",
-            "Assets/Resources",
-            "ProjectSettings"
-        ]
-        
         all_good = True
-        for dir_name in required_dirs:
-            dir_path = self.project_path / dir_name
-            if dir_path.exists():
-                file_count = len(list(dir_path.rglob("*")))
+        for dir_name in self.REQUIRED_DIRS:
+            if self.index.is_dir(dir_name):
+                file_count = self.index.count(dir_name)
                 print(f"  ✅ {dir_name} - {file_count} files")
             else:
                 print(f"  ❌ {dir_name} - Missing")
@@ -238,8 +303,7 @@ class UnityGameTester:
         ]
         
         for file_path in critical_files:
-            full_path = self.project_path / file_path
-            if full_path.exists():
+            if self.index.exists(file_path):
                 print(f"  ✅ {file_path}")
             else:
                 print(f"  ❌ {file_path}")
@@ -255,38 +319,13 @@ class UnityGameTester:
         
         # Test data structures
         try:
-            # Simulate note data creation
-            note_data = {
-                "hitTime": 1.5,
-                "lane": 2,
-                "noteType": "Tap"
-            }
-            
-            # Simulate song data
-            song_data = {
-                "title": "Test Song",
-                "bpm": 120.0,
-                "duration": 60.0,
-                "difficulty": 3,
-                "notes": [note_data] * 10
-            }
-            
             # Test judgement calculations
+            config = JudgementConfig.from_project(self.project_path)
             hit_time = 1.52
             note_time = 1.50
-            diff = abs(hit_time - note_time)
-            
-            # Perfect: < 0.05s, Great: < 0.1s, Good: < 0.2s, Bad: < 0.35s
-            if diff < 0.05:
-                judgement = "Perfect"
-            elif diff < 0.1:
-                judgement = "Great"
-            elif diff < 0.2:
-                judgement = "Good"
-            elif diff < 0.35:
-                judgement = "Bad"
-            else:
-                judgement = "Miss"
+            code, raw_diff = judge_one(hit_time, note_time, config=config)
+            judgement = RESULT_NAMES[code]
+            diff = abs(raw_diff)
                 
             simulation_results.append({
                 "test": "judgement_calculation",
@@ -297,13 +336,9 @@ class UnityGameTester:
             print(f"  ✅ Judgement calculation: {judgement} (diff: {diff:.3f}s)")
             
             # Test scoring system
-            base_score = 1000
+            # 이번 판정(Perfect)으로 콤보가 50이 된 경우 (CalculateScore)
             combo = 50
-            max_combo_bonus = 0.5
-            combo_for_max_bonus = 100
-            
-            combo_bonus = (combo / combo_for_max_bonus) * max_combo_bonus
-            total_score = base_score * (1 + combo_bonus)
+            total_score = score_one(code, combo, config)
             
             simulation_results.append({
                 "test": "scoring_system",
@@ -313,6 +348,20 @@ class UnityGameTester:
             
             print(f"  ✅ Scoring system: {total_score:.0f} points (combo: {combo})")
             
+            # 차트 전체 리플레이: 차트대로 치면 Miss 없이 S+ 여야 함
+            for song_path in find_song_assets(self.project_path):
+                outcome = replay_song(song_path, config=config)
+                result = outcome["result"]
+                ok = result["MissCount"] == 0 and result["Rank"] == "S+"
+                simulation_results.append({
+                    "test": f"chart_replay_{song_path.stem}",
+                    "score": result["Score"],
+                    "rank": result["Rank"],
+                    "status": "passed" if ok else "failed"
+                })
+                print(f"  {'✅' if ok else '❌'} Chart replay {song_path.name}: {result['Score']} points, "
+                      f"rank {result['Rank']}, {result['MissCount']} misses")
+            
         except Exception as e:
             print(f"❌ Gameplay simulation failed: {e}")
             return False
@@ -332,22 +381,41 @@ class UnityGameTester:
             "test_results": self.test_results,
             "summary": {}
         }
+        if self.scheduler is not None:
+            report["scheduler"] = self.scheduler.report()
+        if self.test_selection is not None:
+            report["test_selection"] = self.test_selection
+        if self.shard_outcome is not None:
+            report["shards"] = self.shard_outcome
+        if self.warm_start is not None:
+            report["library_cache"] = self.warm_start
+        if self.log_summary is not None:
+            report["unity_log"] = self.log_summary
+        if self.editor_results is not None:
+            # 실패 메시지, 가장 느린 테스트, 카테고리별 시간
+            report["editor_tests"] = self.editor_results
         
         # Calculate summary
         passed = 0
         failed = 0
+        skipped = 0
         for result in self.test_results:
             if isinstance(result, dict):
                 if result.get("status") in ["passed", "covered"]:
                     passed += 1
+                elif result.get("status") == "skipped":
+                    # [Ignore]/Inconclusive 테스트는 성공률 계산에서 제외
+                    skipped += 1
                 else:
                     failed += 1
+        counted = len(self.test_results) - skipped
                     
         report["summary"] = {
             "total_tests": len(self.test_results),
             "passed": passed,
             "failed": failed,
-            "success_rate": f"{(passed/len(self.test_results)*100):.1f}%" if self.test_results else "0%"
+            "skipped": skipped,
+            "success_rate": f"{(passed/counted*100):.1f}%" if counted else "0%"
         }
         
         print(f"📋 Total Tests: {report['summary']['total_tests']}")
@@ -355,52 +423,88 @@ class UnityGameTester:
         print(f"❌ Failed: {report['summary']['failed']}")
         print(f"📈 Success Rate: {report['summary']['success_rate']}")
         
-        # Save report
+        # Save report: 실행 기록에 추가하고 보고서는 그 뷰로 다시 씀 (MCP 지표 포함)
         try:
-            with open("unity_test_report.json", "w", encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            save_report("test_unity_game", report, "unity_test_report.json",
+                        workers=self.max_workers, shards=self.shards, unity=self.unity_path)
             print(f"💾 Report saved to: unity_test_report.json")
         except Exception as e:
             print(f"⚠️  Could not save report: {e}")
             
         return report
         
+    def _skip_editor_tests(self):
+        print_selection(self.test_selection)
+        self.test_results.append({"test": "unity_editor_tests", "status": "skipped"})
+        return SKIPPED
+
+    def _check(self, name, inputs, fn, cache_failures=True):
+        """캐시를 거쳐 검사를 실행하고 통과/실패 항목을 추가"""
+        ok = self.cache.run(name, inputs, fn, self.test_results, cache_failures=cache_failures)
+        status = "skipped" if ok is SKIPPED else "passed" if ok else "failed"
+        self.test_results.append({"test": name, "status": status})
+        return ok if ok is SKIPPED else bool(ok)
+
     def run_full_test_suite(self):
         """Run complete test suite"""
         print("🚀 Starting Unity Game Full Test Suite...")
         print("="*60)
         
-        # Test 1: Project structure
-        if self.check_unity_project_structure():
-            self.test_results.append({"test": "project_structure", "status": "passed"})
-        else:
-            self.test_results.append({"test": "project_structure", "status": "failed"})
-            
-        # Test 2: Script integrity
-        if self.run_editor_scripts_tests():
-            self.test_results.append({"test": "script_integrity", "status": "passed"})
-        else:
-            self.test_results.append({"test": "script_integrity", "status": "failed"})
-            
-        # Test 3: Gameplay simulation
-        if self.run_gameplay_simulation():
-            self.test_results.append({"test": "gameplay_simulation", "status": "passed"})
-        else:
-            self.test_results.append({"test": "gameplay_simulation", "status": "failed"})
-            
+        # 독립적인 검사는 병렬 실행, Unity 에디터 테스트는 스크립트 검사 통과 후 실행
+        scheduler = CheckScheduler(self.max_workers)
+        scheduler.add("project_structure", lambda: self._check(
+            "project_structure", [listing(d) for d in self.REQUIRED_DIRS],
+            self.check_unity_project_structure))
+        scheduler.add("script_integrity", lambda: self._check(
+            # 상속 검사는 프로젝트 안의 중간 상위 클래스도 따라가므로 Scripts 전체가 입력
+            "script_integrity", ["Assets/Scripts"],
+            self.run_editor_scripts_tests))
+        scheduler.add("gameplay_simulation", lambda: self._check(
+            "gameplay_simulation", [JUDGEMENT_SOURCE, "Assets/Resources/Songs"], self.run_gameplay_simulation))
+
         # Try Unity-specific tests if available
         if self.unity_path:
-            if self.run_editor_tests():
-                self.test_results.append({"test": "unity_editor_tests", "status": "passed"})
+            if self.impact_selection:
+                self.test_selection = select_tests(self.project_path, self.test_base)
+            mode = self.test_selection["mode"] if self.test_selection else "full"
+            if mode == "none":
+                # 실행하지 않은 결과는 캐시하지 않음 (다음 실행/--all-tests가 재사용하면 안 됨)
+                scheduler.add("unity_editor_tests", self._skip_editor_tests, deps=["script_integrity"])
             else:
-                self.test_results.append({"test": "unity_editor_tests", "status": "failed"})
-                
+                # 실패는 캐시하지 않음 (타임아웃 등 일시적 원인일 수 있음)
+                # 선택 모드/필터도 입력: 일부만 돌린 통과를 전체 실행에서 재사용하지 않음
+                selection = setting("test_selection", [mode, self.test_selection and self.test_selection["filter"]])
+                scheduler.add("unity_editor_tests", lambda: self._check(
+                    "unity_editor_tests", ["Assets", "Packages/manifest.json", "ProjectSettings", selection],
+                    self.run_editor_tests, cache_failures=False), deps=["script_integrity"])
+
+        scheduler.run(self.test_results)
+        self.scheduler = scheduler
+        scheduler.print_summary()
+
+        self.cache.save()
+        self.cache.print_summary()
+
         # Generate final report
         return self.generate_test_report()
 
 def main():
     """Main test execution"""
-    tester = UnityGameTester()
+    parser = argparse.ArgumentParser(description="A.I. BEAT Unity game tests")
+    parser.add_argument("--no-cache", action="store_true", help="re-run every check")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="parallel check workers")
+    parser.add_argument("--base", help="git ref for impact-based test selection "
+                        "(default: last green commit or upstream merge-base)")
+    parser.add_argument("--all-tests", action="store_true", help="always run the full EditMode suite")
+    parser.add_argument("--unity", help="Unity executable (default: newest Unity Hub editor; fake_unity.py for dry runs)")
+    parser.add_argument("--shards", type=int, default=1, help="parallel batchmode processes (project clones)")
+    parser.add_argument("--no-library-cache", action="store_true", help="do not restore/snapshot the Library folder")
+    args = parser.parse_args()
+
+    tester = UnityGameTester(use_cache=not args.no_cache, max_workers=args.workers,
+                             test_base=args.base, impact_selection=not args.all_tests,
+                             unity_path=args.unity, shards=args.shards,
+                             library_cache=not args.no_library_cache)
     report = tester.run_full_test_suite()
     
     # Determine exit code
@@ -417,4 +521,3 @@ def main():
 
 if __name__ == "__main__":
     sys.exit(main())
-}
\ No newline at end of file
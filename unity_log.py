@@ -0,0 +1,199 @@
+"""
+Unity Batchmode Log Follower
+batchmode 실행 중에 -logFile 을 tail 하면서 줄 단위로 분류하고, 치명적인 컴파일 오류가
+보이면 Unity가 타임아웃까지 멈춰 있기 전에 프로세스를 종료
+
+- 분류: compile_error / exception / test_progress / results_saved
+- 메모리 일정: 파일 오프셋부터 청크 단위로 읽고, 분류별 최근 줄만 deque로 보관,
+  비정상적으로 긴 한 줄은 잘라서 처리 (수백 MB Editor 로그도 같은 메모리)
+- 로그 파일이 아직 없거나 잘려서(truncate) 다시 쓰여도 따라감
+
+    outcome = run_with_log(command, "My project/test_log.txt", timeout=300)
+    if outcome["aborted"]:
+        print(outcome["compile_errors"])
+
+    python unity_log.py "My project/test_log.txt"      # 이미 끝난 로그 분류
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+CHUNK_SIZE = 64 * 1024
+MAX_LINE = 8 * 1024
+KEEP_LINES = 50
+POLL_INTERVAL = 0.2
+# 첫 컴파일 오류 뒤 나머지 오류 줄을 모으기 위해 기다리는 시간
+COMPILE_ERROR_GRACE = 1.0
+
+PATTERNS = (
+    ("compile_error", re.compile(r"error CS\d{4}|Scripts have compiler errors|compilation error", re.IGNORECASE)),
+    ("exception", re.compile(r"^\s*(?:[\w.]+Exception|Unhandled exception)\b")),
+    ("results_saved", re.compile(r"Saving results to:|Test run completed")),
+    ("test_progress", re.compile(r"^\[\d+/\d+\]|Running \d+ \w+ tests|^Test (?:Started|Finished)|^Executing tests")),
+)
+
+
+def classify(line):
+    for kind, pattern in PATTERNS:
+        if pattern.search(line):
+            return kind
+    return None
+
+
+class LogFollower:
+    def __init__(self, path, keep=KEEP_LINES):
+        self.path = Path(path)
+        self.offset = 0
+        self.partial = b""
+        self.lines = 0
+        self.bytes = 0
+        self.counts = {kind: 0 for kind, _ in PATTERNS}
+        self.recent = {kind: deque(maxlen=keep) for kind, _ in PATTERNS}
+        self.last_progress = None
+        self.first_compile_error = None  # time.monotonic()
+
+    def poll(self, final=False):
+        """새로 쓰인 부분을 읽어 분류. final이면 줄바꿈 없는 마지막 줄도 처리"""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, 2)
+                size = f.tell()
+                if size < self.offset:
+                    # 로그가 새로 시작됨 (같은 경로에 다시 쓰기)
+                    self.offset, self.partial = 0, b""
+                f.seek(self.offset)
+                while True:
+                    chunk = f.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    self.offset += len(chunk)
+                    self.bytes += len(chunk)
+                    self._feed(chunk)
+        except FileNotFoundError:
+            pass
+        if final and self.partial:
+            self._line(self.partial)
+            self.partial = b""
+
+    def _feed(self, chunk):
+        data = self.partial + chunk
+        *complete, self.partial = data.split(b"\n")
+        for raw in complete:
+            self._line(raw)
+        if len(self.partial) > MAX_LINE:
+            # 줄바꿈 없이 계속 이어지는 출력은 앞부분만 분류
+            self._line(self.partial[:MAX_LINE])
+            self.partial = b""
+
+    def _line(self, raw):
+        self.lines += 1
+        line = raw[:MAX_LINE].decode("utf-8", errors="replace").rstrip("\r")
+        kind = classify(line)
+        if kind is None:
+            return
+        self.counts[kind] += 1
+        self.recent[kind].append(line.strip())
+        if kind == "test_progress":
+            self.last_progress = line.strip()
+        elif kind == "compile_error" and self.first_compile_error is None:
+            self.first_compile_error = time.monotonic()
+
+    @property
+    def fatal(self):
+        """컴파일 오류 후 유예 시간이 지났으면 True"""
+        return (self.first_compile_error is not None
+                and time.monotonic() - self.first_compile_error >= COMPILE_ERROR_GRACE)
+
+    def summary(self):
+        return {
+            "lines": self.lines,
+            "bytes": self.bytes,
+            "counts": dict(self.counts),
+            "compile_errors": list(self.recent["compile_error"]),
+            "exceptions": list(self.recent["exception"])[-5:],
+            "last_progress": self.last_progress,
+        }
+
+
+def run_with_log(command, log_file, timeout, abort_on_compile_error=True, stop_event=None, poll=POLL_INTERVAL):
+    """
+    command를 실행하면서 log_file을 따라 읽음
+    - 컴파일 오류가 보이면 (abort_on_compile_error) 프로세스 종료
+    - stop_event가 설정되면 (다른 샤드가 컴파일 오류로 중단 등) 프로세스 종료
+    - timeout을 넘기면 프로세스를 종료하고 subprocess.TimeoutExpired
+    반환: {"returncode", "aborted", "elapsed_s", 로그 요약...}
+    """
+    log_file = Path(log_file)
+    if log_file.exists():
+        log_file.unlink()
+    follower = LogFollower(log_file)
+    started = time.monotonic()
+    aborted = None
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                process.wait(timeout=poll)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            follower.poll()
+            if abort_on_compile_error and follower.fatal:
+                aborted = "compile_error"
+            elif stop_event is not None and stop_event.is_set():
+                aborted = "cancelled"
+            elif time.monotonic() - started > timeout:
+                process.kill()
+                process.wait()
+                raise subprocess.TimeoutExpired(command, timeout)
+            if aborted:
+                process.kill()
+                process.wait()
+                break
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+    follower.poll(final=True)
+    return {
+        "returncode": process.returncode,
+        "aborted": aborted,
+        "elapsed_s": round(time.monotonic() - started, 2),
+        **follower.summary(),
+    }
+
+
+def scan_log(path):
+    """끝난 로그 파일을 한 번 훑어 요약 (파일 전체를 메모리에 올리지 않음)"""
+    follower = LogFollower(path)
+    follower.poll(final=True)
+    return follower.summary()
+
+
+def print_log_summary(summary, limit=5):
+    counts = summary["counts"]
+    print(f"  📜 Log: {summary['lines']} lines, {counts['compile_error']} compile errors, "
+          f"{counts['exception']} exceptions, {counts['test_progress']} progress lines")
+    for line in summary["compile_errors"][:limit]:
+        print(f"    {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify a Unity Editor/batchmode log")
+    parser.add_argument("log", nargs="?", default="My project/test_log.txt")
+    args = parser.parse_args()
+
+    summary = scan_log(args.log)
+    print_log_summary(summary, limit=20)
+    for line in summary["exceptions"]:
+        print(f"    {line}")
+    return 1 if summary["counts"]["compile_error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
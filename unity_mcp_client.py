@@ -0,0 +1,202 @@
+"""
+Unity MCP WebSocket Client
+여러 스크립트에서 공유하는 비동기 MCP 클라이언트
+
+하나의 소켓으로 여러 요청을 동시에 보내고, 응답은 `id`로 매칭한다.
+
+    async with UnityMCPClient() as client:
+        info, root = await asyncio.gather(
+            client.call("get_scene_info"),
+            client.call("get_game_object", {"objectPath": "/"}),
+        )
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+try:
+    import websockets
+except ImportError:
+    import subprocess
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "websockets"])
+    import websockets
+
+from mcp_discovery import cached_ws_uri
+from mcp_metrics import MCPMetrics
+
+# 설치돼 있으면 더 빠른 JSON 디코더 사용 (큰 씬 덤프 응답)
+try:
+    import orjson
+
+    JSON_BACKEND = "orjson"
+
+    def json_loads(data):
+        return orjson.loads(data)
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    JSON_BACKEND = "json"
+    json_loads = json.loads
+    json_dumps = json.dumps
+
+DEFAULT_URI = "ws://localhost:8090/McpUnity"
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_IN_FLIGHT = 16
+
+
+class UnityMCPClient:
+    def __init__(self, uri=None, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 timeout=DEFAULT_TIMEOUT, verbose=True, compression="deflate", max_size=None,
+                 metrics=None):
+        # URI를 지정하지 않으면 mcp_discovery가 캐시한 엔드포인트 사용
+        self.uri = uri or cached_ws_uri(DEFAULT_URI)
+        self.metrics = metrics if metrics is not None else MCPMetrics()
+        # compression: permessage-deflate 협상 (None이면 비압축)
+        # max_size: 수신 메시지 크기 제한 (None이면 무제한 - 전체 씬 덤프용)
+        self.compression = compression
+        self.max_size = max_size
+        self.ws = None
+        self.request_id = 0
+        self.timeout = timeout
+        self.verbose = verbose
+        self.max_in_flight = max_in_flight
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._pending = {}
+        self._reader = None
+        self._closed_error = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def connected(self):
+        return self.ws is not None and self._reader is not None and not self._reader.done()
+
+    async def connect(self):
+        """연결 (기존 연결이 있으면 정리 후 재연결)"""
+        await self._teardown()
+        self.ws = await websockets.connect(
+            self.uri,
+            close_timeout=5,
+            max_size=self.max_size,
+            compression=self.compression,
+            ping_interval=None,
+        )
+        self._closed_error = None
+        self._reader = asyncio.create_task(self._read_loop())
+        if self.verbose:
+            print("Connected to Unity MCP")
+
+    async def close(self):
+        await self._teardown()
+
+    async def wait_closed(self):
+        """연결이 끊길 때까지 대기 후 끊긴 원인(예외)을 반환"""
+        reader = self._reader
+        if reader is not None:
+            await asyncio.wait([reader])
+        return self._closed_error
+
+    async def _teardown(self):
+        ws, self.ws = self.ws, None
+        if ws is not None:
+            try:
+                await ws.close()
+            except Exception:
+                pass
+        reader, self._reader = self._reader, None
+        if reader is not None:
+            reader.cancel()
+            try:
+                await reader
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._fail_pending(ConnectionError("Unity MCP client closed"))
+
+    def _fail_pending(self, error):
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def _read_loop(self):
+        """수신 루프: 응답을 id로 대기 중인 요청에 전달"""
+        ws = self.ws
+        try:
+            while True:
+                self._dispatch(await self._receive(ws))
+        except websockets.ConnectionClosed as e:
+            self._closed_error = e
+        except Exception as e:
+            self._closed_error = e
+        self._fail_pending(self._closed_error)
+
+    @staticmethod
+    async def _receive(ws):
+        """
+        메시지 1개 수신. 조각(fragment)으로 나뉜 큰 메시지는 bytes 조각을 모아 한 번에 합치고,
+        텍스트 디코딩 없이 bytes 그대로 JSON 디코더에 넘긴다.
+        """
+        if not hasattr(ws, "recv_streaming"):
+            # legacy websockets API
+            return await ws.recv()
+        chunks = [chunk async for chunk in ws.recv_streaming(decode=False)]
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+    def _dispatch(self, frame):
+        try:
+            response = json_loads(frame)
+        except ValueError:
+            return
+        if not isinstance(response, dict):
+            return
+        future = self._pending.pop(str(response.get("id")), None)
+        # 알 수 없는 id (늦게 도착한 응답, 알림 등)는 무시
+        if future is not None and not future.done():
+            future.set_result((response, len(frame)))
+
+    async def call(self, method, params=None, timeout=None):
+        """요청 전송 후 같은 id의 응답을 반환"""
+        async with self._slots:
+            if not self.connected:
+                raise self._closed_error or ConnectionError("Unity MCP client is not connected")
+
+            self.request_id += 1
+            request_id = str(self.request_id)
+            request = {
+                "id": request_id,
+                "method": method,
+                "params": params or {}
+            }
+            payload = json_dumps(request)
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = future
+            started = time.perf_counter()
+            try:
+                await self.ws.send(payload)
+                response, size = await asyncio.wait_for(future, timeout=timeout or self.timeout)
+            except asyncio.TimeoutError:
+                self.metrics.record_timeout(method, len(payload))
+                raise
+            except (ConnectionError, websockets.ConnectionClosed):
+                self.metrics.record_disconnect(method, len(payload))
+                raise
+            finally:
+                self._pending.pop(request_id, None)
+            self.metrics.record_call(method, time.perf_counter() - started, len(payload), size,
+                                     error="error" in response)
+            return response
+
+    async def call_many(self, calls, return_exceptions=False):
+        """(method, params) 목록을 동시에 호출하고 순서대로 결과 반환"""
+        return await asyncio.gather(
+            *(self.call(method, params) for method, params in calls),
+            return_exceptions=return_exceptions,
+        )
@@ -0,0 +1,332 @@
+"""
+Sharded Unity Batchmode Test Runner
+Unity는 프로젝트 폴더 하나에 에디터 하나만 띄울 수 있으므로, 가벼운 프로젝트 복제본을
+여러 개 만들어 EditMode 테스트를 N개의 batchmode 프로세스로 나눠 실행
+
+- 복제본: Assets는 하드 링크 (다른 파일 시스템이면 복사), Packages/ProjectSettings는 복사,
+  Library는 샤드마다 따로 (복제본을 지우지 않으므로 다음 실행부터는 임포트가 따뜻함)
+- 샤드 분배: 테스트 카테고리(메서드 이름 접두어) 단위로, 테스트 수가 비슷하도록 나눔
+- 각 샤드의 TestResults.xml 을 하나의 NUnit test-run 으로 합침
+
+    runner = ShardRunner("fake_unity.py", "My project", shards=3)
+    outcome = runner.run(output="My project/TestResults.xml")
+
+    python unity_shards.py --unity fake_unity.py --shards 3
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from csharp_index import get_symbol_index
+from library_cache import LibraryCache
+from project_index import DEFAULT_CACHE_DIR, get_index
+from test_selection import TestSelector
+from unity_log import run_with_log
+
+DEFAULT_CLONE_ROOT = DEFAULT_CACHE_DIR / "unity_shards"
+DEFAULT_TIMEOUT = 300
+# Assets는 하드 링크 (Unity는 에셋을 임시 파일 + 이름 바꾸기로 저장하므로 원본이 바뀌지 않음),
+# Packages/ProjectSettings는 배치 실행 중에도 제자리에서 다시 쓸 수 있으므로 복사
+LINKED_DIRS = ("Assets",)
+COPIED_DIRS = ("Packages", "ProjectSettings")
+COUNT_ATTRIBUTES = ("testcasecount", "total", "passed", "failed", "inconclusive", "skipped", "asserts")
+
+
+def unity_command(unity_path):
+    """Unity 실행 명령 앞부분 (가짜 Unity인 .py 스크립트는 현재 파이썬으로 실행)"""
+    unity_path = str(unity_path)
+    return [sys.executable, unity_path] if unity_path.endswith(".py") else [unity_path]
+
+
+def batchmode_command(unity_path, project_path, results_file, log_file, test_filter=None):
+    command = unity_command(unity_path) + [
+        "-projectPath", str(Path(project_path).absolute()),
+        "-batchmode",
+        "-nographics",
+        "-runTests",
+        "-testPlatform", "EditMode",
+        "-testResults", str(Path(results_file).absolute()),
+        "-logFile", str(Path(log_file).absolute()),
+    ]
+    if test_filter:
+        command += ["-testFilter", test_filter]
+    # -runTests는 끝나면 스스로 종료하지만 기존 실행과 같게 -quit 유지
+    return command + ["-quit"]
+
+
+def run_batchmode(command, log_file, timeout=DEFAULT_TIMEOUT, stop_event=None):
+    """
+    batchmode 실행 (로그를 따라 읽다가 컴파일 오류면 즉시 종료)
+    반환: unity_log.run_with_log 결과 (타임아웃이면 subprocess.TimeoutExpired)
+    """
+    return run_with_log(command, log_file, timeout, stop_event=stop_event)
+
+
+# ----------------------------------------------------------------------
+# 프로젝트 복제본
+# ----------------------------------------------------------------------
+def _same_file(src_stat, dst_stat, linked):
+    if linked:
+        return src_stat.st_ino == dst_stat.st_ino and src_stat.st_dev == dst_stat.st_dev
+    return src_stat.st_size == dst_stat.st_size and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+
+
+def _clone_files(root):
+    """복제본 폴더의 기존 파일 (상대 경로)"""
+    found = set()
+    for top in LINKED_DIRS + COPIED_DIRS:
+        for dirpath, _, filenames in os.walk(root / top):
+            rel_dir = Path(dirpath).relative_to(root).as_posix()
+            found.update(f"{rel_dir}/{name}" for name in filenames)
+    return found
+
+
+def sync_clone(index, clone_path):
+    """
+    복제본을 원본 프로젝트와 맞춤 (바뀐 파일만 다시 링크/복사, 없어진 파일 삭제)
+    반환: {"linked", "copied", "unchanged", "removed"}
+    """
+    clone_path = Path(clone_path)
+    stats = {"linked": 0, "copied": 0, "unchanged": 0, "removed": 0}
+    wanted = set()
+    can_link = True
+    for top in LINKED_DIRS + COPIED_DIRS:
+        linked = top in LINKED_DIRS
+        for rel in index.files(top):
+            wanted.add(rel)
+            src = index.path(rel)
+            dst = clone_path / rel
+            try:
+                src_stat = src.stat()
+                dst_stat = dst.stat()
+                if _same_file(src_stat, dst_stat, linked and can_link):
+                    stats["unchanged"] += 1
+                    continue
+                dst.unlink()
+            except FileNotFoundError:
+                dst.parent.mkdir(parents=True, exist_ok=True)
+            if linked and can_link:
+                try:
+                    os.link(src, dst)
+                    stats["linked"] += 1
+                    continue
+                except OSError:
+                    # 다른 볼륨/하드 링크 미지원: 이후로는 복사
+                    can_link = False
+            shutil.copy2(src, dst)
+            stats["copied"] += 1
+
+    for rel in _clone_files(clone_path) - wanted:
+        (clone_path / rel).unlink()
+        stats["removed"] += 1
+    return stats
+
+
+# ----------------------------------------------------------------------
+# 샤드 분배 / 결과 병합
+# ----------------------------------------------------------------------
+def plan_shards(weights, shards):
+    """{카테고리: 가중치}를 가중치 합이 비슷한 shards개 묶음으로 (큰 것부터 가장 가벼운 샤드에)"""
+    buckets = [[] for _ in range(max(1, min(shards, len(weights))))]
+    loads = [0.0] * len(buckets)
+    for category in sorted(weights, key=lambda c: (-weights[c], c)):
+        i = loads.index(min(loads))
+        buckets[i].append(category)
+        loads[i] += weights[category]
+    return [sorted(b) for b in buckets if b]
+
+
+def category_filter(prefix, categories):
+    return f"^{re.escape(prefix)}({'|'.join(map(re.escape, categories))})_"
+
+
+def merge_results(result_files, output):
+    """
+    샤드별 NUnit test-run 을 하나로 합침 (개수는 더하고, 시간은 가장 긴 샤드 기준)
+    반환: 합친 test-run 요소의 속성
+    """
+    merged = ET.Element("test-run", {"id": "2"})
+    totals = {name: 0 for name in COUNT_ATTRIBUTES}
+    starts, ends, durations, failed = [], [], [], False
+    for path in result_files:
+        run = ET.parse(path).getroot()
+        for name in COUNT_ATTRIBUTES:
+            totals[name] += int(run.get(name, 0))
+        failed = failed or run.get("result", "").startswith("Failed")
+        durations.append(float(run.get("duration", 0)))
+        if run.get("start-time"):
+            starts.append(run.get("start-time"))
+        if run.get("end-time"):
+            ends.append(run.get("end-time"))
+        for key in ("engine-version", "clr-version"):
+            if run.get(key):
+                merged.set(key, run.get(key))
+        merged.extend(list(run))
+
+    merged.set("result", "Failed" if failed else "Passed")
+    for name, value in totals.items():
+        merged.set(name, str(value))
+    merged.set("start-time", min(starts) if starts else "")
+    merged.set("end-time", max(ends) if ends else "")
+    merged.set("duration", f"{max(durations, default=0.0):.6f}")
+    merged.set("shards", str(len(result_files)))
+
+    output = Path(output)
+    tmp = output.with_name(output.name + ".tmp")
+    ET.ElementTree(merged).write(tmp, encoding="utf-8", xml_declaration=True)
+    os.replace(tmp, output)
+    return dict(merged.attrib)
+
+
+class ShardRunner:
+    def __init__(self, unity_path, project_path="My project", shards=2,
+                 clone_root=DEFAULT_CLONE_ROOT, timeout=DEFAULT_TIMEOUT, library_cache=None):
+        self.unity_path = unity_path
+        self.project_path = Path(project_path)
+        self.shards = max(1, int(shards))
+        self.clone_root = Path(clone_root)
+        self.timeout = timeout
+        # LibraryCache: 샤드 복제본의 Library를 스냅샷에서 복원 (웜 스타트)
+        self.library_cache = library_cache
+        self.index = get_index(self.project_path)
+        self.selector = TestSelector(get_symbol_index(self.project_path))
+
+    def clone_path(self, shard):
+        return self.clone_root / f"shard-{shard}"
+
+    def prepare(self, count):
+        """샤드 복제본 count개를 원본과 맞추고 Library 복원 (샤드끼리 병렬)"""
+        def prepare_one(i):
+            stats = sync_clone(self.index, self.clone_path(i))
+            if self.library_cache is not None:
+                stats["library"] = self.library_cache.restore(self.clone_path(i))
+            return stats
+
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            return list(pool.map(prepare_one, range(count)))
+
+    def plan(self, categories=None):
+        """categories: 실행할 카테고리 (None이면 전체) -> [[카테고리...] 샤드별]"""
+        grouped = self.selector.categories()
+        if categories is not None:
+            grouped = {c: m for c, m in grouped.items() if c in categories}
+        return plan_shards({c: len(m) for c, m in grouped.items()}, self.shards)
+
+    def _run_shard(self, shard, categories, prefix, stop_event):
+        clone = self.clone_path(shard)
+        results_file = clone / "TestResults.xml"
+        log_file = clone / "test_log.txt"
+        if results_file.exists():
+            results_file.unlink()
+        command = batchmode_command(self.unity_path, clone, results_file, log_file,
+                                    category_filter(prefix, categories))
+        started = time.perf_counter()
+        info = {"shard": shard, "categories": categories, "tests": sum(
+            len(self.selector.categories()[c]) for c in categories), "log": str(log_file)}
+        try:
+            outcome = run_batchmode(command, log_file, self.timeout, stop_event)
+            info["returncode"] = outcome.pop("returncode")
+            info["log_summary"] = outcome
+            if outcome["aborted"]:
+                info["error"] = "compile errors" if outcome["aborted"] == "compile_error" else outcome["aborted"]
+            if outcome["aborted"] == "compile_error":
+                # 모든 샤드가 같은 스크립트를 컴파일하므로 나머지 샤드도 중단
+                stop_event.set()
+        except subprocess.TimeoutExpired:
+            info["returncode"] = None
+            info["error"] = f"timed out after {self.timeout}s"
+        info["elapsed_s"] = round(time.perf_counter() - started, 2)
+        info["results"] = str(results_file) if results_file.exists() else None
+        return info
+
+    def run(self, output, categories=None):
+        """
+        샤드를 병렬 실행하고 결과를 output 한 파일로 병합
+        반환: {"shards": [...], "clone_sync": [...], "merged": {...} | None, "wall_s"}
+        """
+        started = time.perf_counter()
+        plan = self.plan(categories)
+        if not plan:
+            return {"shards": [], "clone_sync": [], "merged": None, "wall_s": 0.0}
+        sync = self.prepare(len(plan))
+        namespace, class_name = self.selector.test_types()
+        prefix = f"{namespace}.{class_name}." if namespace else f"{class_name}."
+
+        stop_event = threading.Event()
+        with ThreadPoolExecutor(max_workers=len(plan)) as pool:
+            shards = list(pool.map(lambda item: self._run_shard(item[0], item[1], prefix, stop_event),
+                                   enumerate(plan)))
+
+        if self.library_cache is not None:
+            for shard, stats in zip(shards, sync):
+                shard["library"] = self.library_cache.after_run(
+                    stats.pop("library"), shard["elapsed_s"], self.clone_path(shard["shard"]),
+                    succeeded=shard["results"] is not None)
+
+        result_files = [s["results"] for s in shards if s["results"]]
+        merged = merge_results(result_files, output) if result_files else None
+        if merged is not None and len(result_files) < len(shards):
+            # 결과를 못 낸 샤드가 있으면 전체 실행은 실패
+            merged["result"] = "Failed"
+        return {
+            "shards": shards,
+            "clone_sync": sync,
+            "merged": merged,
+            "wall_s": round(time.perf_counter() - started, 2),
+        }
+
+
+def print_outcome(outcome):
+    for shard in outcome["shards"]:
+        status = shard.get("error") or f"exit {shard['returncode']}"
+        print(f"  shard {shard['shard']}: {shard['tests']:>3} tests "
+              f"[{', '.join(shard['categories'])}] {shard['elapsed_s']:.1f}s ({status})")
+        library = shard.get("library")
+        if library and "saved_s" in library:
+            print(f"    Library {library['status']}: saved {library['saved_s']:.1f}s vs cold start")
+        elif library:
+            print(f"    Library {library['status']}" + (" (snapshot saved)" if "snapshot" in library else ""))
+        if shard.get("error") == "compile errors":
+            for line in shard["log_summary"]["compile_errors"][:5]:
+                print(f"    {line}")
+    merged = outcome["merged"]
+    if merged:
+        print(f"  merged: {merged['total']} tests, {merged['passed']} passed, {merged['failed']} failed "
+              f"in {outcome['wall_s']:.1f}s wall")
+    else:
+        print("  ⚠️  no shard produced TestResults.xml")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run EditMode tests in parallel Unity project clones")
+    parser.add_argument("--unity", required=True, help="Unity executable (or fake_unity.py)")
+    parser.add_argument("--project", default="My project")
+    parser.add_argument("--shards", type=int, default=2)
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT, help="seconds per shard")
+    parser.add_argument("--clone-root", default=str(DEFAULT_CLONE_ROOT))
+    parser.add_argument("--output", help="merged results (default: <project>/TestResults.xml)")
+    parser.add_argument("--no-library-cache", action="store_true", help="do not restore/snapshot Library")
+    args = parser.parse_args()
+
+    library_cache = None if args.no_library_cache else LibraryCache(args.project, args.unity)
+    runner = ShardRunner(args.unity, args.project, args.shards, args.clone_root, args.timeout, library_cache)
+    output = args.output or runner.project_path / "TestResults.xml"
+    print(f"🧩 Running EditMode tests on {args.shards} shards...")
+    outcome = runner.run(output)
+    print_outcome(outcome)
+    if outcome["merged"] is None:
+        return 2
+    return 1 if outcome["merged"]["result"] == "Failed" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
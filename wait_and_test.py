@@ -1,15 +1,20 @@
-import time
+import asyncio
 import subprocess
 import sys
 
-print("20초 대기 중... Unity 에디터가 완전히 로드되도록 기다립니다.")
-for i in range(20, 0, -1):
-    print(f"남은 시간: {i}초", end='\r')
-    time.sleep(1)
+from mcp_readiness import Readiness, port_open
+
+print("Unity 에디터의 MCP 포트(8090)가 열릴 때까지 대기 중... (최대 60초)")
+probes = Readiness(max_interval=0.5)
+try:
+    asyncio.run(probes.wait_until(port_open("localhost", 8090), timeout=60))
+    print(f"포트 열림: {probes.total_wait:.2f}초 대기")
+except asyncio.TimeoutError as e:
+    print(f"대기 시간 초과: {e}")
 print("\n테스트 시작!")
 
 # test_mcp_all.py 실행
 result = subprocess.run([sys.executable, 'test_mcp_all.py'], capture_output=True, text=True)
 print(result.stdout)
 if result.stderr:
-    print("오류:", result.stderr)
\ No newline at end of file
+    print("오류:", result.stderr)